@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Scripts de benchmark dos algoritmos de busca
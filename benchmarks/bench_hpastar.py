@@ -0,0 +1,85 @@
+# bench_hpastar.py
+# Latência e subotimalidade do HPA* contra o A* plano em um labirinto grande.
+#
+# Uso: python -m benchmarks.bench_hpastar [--size 1000] [--queries 20] [--cluster 32] [--density 0.25]
+#
+# O A* plano em Python puro leva segundos por consulta em 5000x5000, então o
+# padrão é 1000x1000; use --size 5000 para medir o caso que motivou o HPA*.
+import argparse
+import statistics
+import time
+
+from benchmarks.bench_solver import random_pairs
+from benchmarks.harness import percentile
+from maze_generator import generate_maze
+from search.astar import astar
+from search.heuristics import manhattan
+from search.hpastar import DEFAULT_CLUSTER_SIZE, HPAStar
+
+
+def latency_line(name: str, samples) -> str:
+    return (f"{name:<24} mediana {statistics.median(samples) * 1000:9.1f} ms"
+            f"   p95 {percentile(samples, 95) * 1000:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HPA* vs A* em um labirinto grande.")
+    parser.add_argument('--size', type=int, default=1000, help="lado do labirinto (padrão: 1000)")
+    parser.add_argument('--queries', type=int, default=20, help="consultas aleatórias (padrão: 20)")
+    parser.add_argument('--cluster', type=int, default=DEFAULT_CLUSTER_SIZE,
+                        help=f"lado do cluster (padrão: {DEFAULT_CLUSTER_SIZE})")
+    parser.add_argument('--density', type=float, default=0.25, help="fração de paredes (padrão: 0.25)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    grid = generate_maze(args.size, density=args.density, seed=args.seed)
+    pairs = random_pairs(grid, args.queries, seed=args.seed)
+    print(f"Grid {args.size}x{args.size}, densidade {args.density}, {args.queries} consultas, "
+          f"clusters de {args.cluster}")
+
+    t0 = time.perf_counter()
+    planner = HPAStar(grid, cluster_size=args.cluster)
+    print(f"Entradas entre clusters:  {time.perf_counter() - t0:8.3f}s  "
+          f"({planner.cluster_count} clusters, {planner.node_count} nós abstratos)")
+
+    # Primeira passada: os clusters tocados calculam suas distâncias internas.
+    cold = []
+    for start, goal in pairs:
+        cold.append(planner.solve(start, goal).time)
+    warm, hpa_results = [], []
+    for start, goal in pairs:
+        result = planner.solve(start, goal)
+        warm.append(result.time)
+        hpa_results.append(result)
+
+    flat, ratios = [], []
+    for (start, goal), hpa in zip(pairs, hpa_results):
+        result = astar(grid, start, goal, manhattan)
+        flat.append(result.time)
+        if result.found != hpa.found:
+            raise AssertionError(f"HPA* e A* discordam sobre {start} -> {goal}")
+        if result.found and result.path_cost:
+            ratios.append(hpa.path_cost / result.path_cost)
+
+    print(latency_line("A* plano", flat))
+    print(latency_line("HPA* (clusters frios)", cold))
+    print(latency_line("HPA* (clusters prontos)", warm))
+    if ratios:
+        print(f"Subotimalidade (custo HPA* / A*): média {statistics.mean(ratios):.4f}   "
+              f"máx {max(ratios):.4f}   ótimos {sum(r == 1.0 for r in ratios)}/{len(ratios)}")
+
+    # Edição: só o cluster da célula tem bordas e distâncias refeitas.
+    start, goal = pairs[0]
+    path = hpa_results[0].path
+    if len(path) > 2:
+        cell = path[len(path) // 2]
+        t0 = time.perf_counter()
+        planner.update_cells({cell: True})
+        invalidate = time.perf_counter() - t0
+        replanned = planner.solve(start, goal)
+        print(f"Parede em {cell}: invalidação {invalidate * 1000:.2f} ms, "
+              f"nova consulta {replanned.time * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# bench_neighbors.py
+# Compara expansões por segundo: get_neighbors (antes) vs índice CSR (depois).
+#
+# Uso: python -m benchmarks.bench_neighbors [tamanho] [densidade]
+import random
+import sys
+import time
+from collections import deque
+
+from search.astar import astar
+from search.bfs import bfs
+from search.heuristics import manhattan
+from utils.adjacency import build_neighbor_index, neighbor_index
+from utils.grid import Grid
+from utils.search import get_neighbors
+
+
+def random_grid(size: int, density: float, seed: int = 42) -> Grid:
+    """Grid quadrado com paredes aleatórias; início e objetivo nos cantos."""
+    rng = random.Random(seed)
+    grid = Grid(size, size)
+    for i in range(size * size):
+        if rng.random() < density:
+            grid.cells[i] = 1
+    for r, c in ((0, 0), (0, 1), (1, 0), (size - 1, size - 1), (size - 1, size - 2), (size - 2, size - 1)):
+        grid.cells[r * size + c] = 0  # Libera início, objetivo e seus vizinhos
+    grid.start, grid.goal = (0, 0), (size - 1, size - 1)
+    return grid
+
+
+def legacy_bfs_expansions(grid: Grid, start) -> int:
+    """Inundação BFS no estilo antigo: tuplas, set de visitados e get_neighbors."""
+    queue = deque([start])
+    visited = {start}
+    expanded = 0
+    while queue:
+        current = queue.popleft()
+        expanded += 1
+        for neighbor in get_neighbors(current, grid):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(neighbor)
+    return expanded
+
+
+def csr_bfs_expansions(grid: Grid, start) -> int:
+    """Mesma inundação BFS percorrendo os arrays do índice CSR."""
+    index = neighbor_index(grid)
+    offsets, targets = index.offsets, index.targets
+    start_id = grid.index(start)
+    queue = deque([start_id])
+    visited = bytearray(grid.rows * grid.cols)
+    visited[start_id] = 1
+    expanded = 0
+    while queue:
+        current = queue.popleft()
+        expanded += 1
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                queue.append(neighbor)
+    return expanded
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    value = func(*args)
+    return value, time.perf_counter() - t0
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    density = float(sys.argv[2]) if len(sys.argv) > 2 else 0.25
+    grid = random_grid(size, density)
+    print(f"Grid {size}x{size}, densidade {density:.0%}")
+
+    for diagonal in (False, True):
+        index, t_build = timed(build_neighbor_index, grid, diagonal)
+        label = "8 direções" if diagonal else "4 direções"
+        print(f"Índice CSR ({label}): {t_build:.3f}s, {len(index.targets)} arestas, "
+              f"{index.nbytes / 1e6:.1f} MB")
+
+    neighbor_index(grid)  # Aquece o cache do grid
+    for name, func in (("get_neighbors (antes)", legacy_bfs_expansions),
+                       ("índice CSR (depois)", csr_bfs_expansions)):
+        expanded, elapsed = timed(func, grid, grid.start)
+        print(f"{name:<24} {expanded:>10} expansões  {expanded / elapsed:>12,.0f} exp/s")
+
+    for name, func, args in (("bfs()", bfs, ()),
+                             ("astar() manhattan", astar, (manhattan,))):
+        result, elapsed = timed(func, grid, grid.start, grid.goal, *args)
+        print(f"{name:<24} {result.nodes_visited:>10} expansões  "
+              f"{result.nodes_visited / elapsed:>12,.0f} exp/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# bench_server.py
+# Gerador de carga para server.py: vazão e percentis de latência com vários clientes simultâneos.
+#
+# Uso: python server.py &   (em outro terminal)
+#      python -m benchmarks.bench_server [--clients 16] [--requests 100] [--maze 9] [--algorithm astar]
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.bench_solver import random_pairs
+from benchmarks.harness import percentile
+from maze import MAZES
+from server import DEFAULT_PORT
+from utils.grid import as_grid
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  message: Dict[str, Any]) -> Dict[str, Any]:
+    """Envia um pedido e espera a resposta (um pedido por vez na conexão)."""
+    writer.write(json.dumps(message).encode('utf-8') + b'\n')
+    await writer.drain()
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Servidor fechou a conexão.")
+    return json.loads(line)
+
+
+async def client(host: str, port: int, queries: List[Dict[str, Any]],
+                 latencies: List[float]) -> int:
+    """Cliente em laço fechado: manda o próximo pedido assim que recebe a resposta."""
+    reader, writer = await asyncio.open_connection(host, port)
+    errors = 0
+    try:
+        for message in queries:
+            t0 = time.perf_counter()
+            response = await request(reader, writer, message)
+            latencies.append(time.perf_counter() - t0)
+            if not response.get('ok'):
+                errors += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return errors
+
+
+def build_queries(info: Dict[str, Any], maze: str, count: int, seed: int,
+                  algorithm: str, heuristic: str) -> List[Dict[str, Any]]:
+    """Pares aleatórios entre células livres se o labirinto é um dos padrão; senão início -> objetivo."""
+    if maze.isdigit() and int(maze) in MAZES:
+        pairs = random_pairs(as_grid(MAZES[int(maze)]), count, seed)
+    else:
+        pairs = [(tuple(info['start']), tuple(info['goal']))] * count
+    return [{'id': i, 'maze': maze, 'start': list(start), 'goal': list(goal),
+             'algorithm': algorithm, 'heuristic': heuristic}
+            for i, (start, goal) in enumerate(pairs)]
+
+
+async def run_load(args) -> Tuple[List[float], int, float, Dict[str, Any]]:
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    mazes = (await request(reader, writer, {'op': 'mazes'}))['mazes']
+    if args.maze not in mazes:
+        raise SystemExit(f"Labirinto {args.maze!r} não está no servidor (disponíveis: {', '.join(mazes)}).")
+    before = await request(reader, writer, {'op': 'stats'})
+
+    per_client = [build_queries(mazes[args.maze], args.maze, args.requests, args.seed + i,
+                                args.algorithm, args.heuristic)
+                  for i in range(args.clients)]
+    latencies: List[float] = []
+    t0 = time.perf_counter()
+    errors = await asyncio.gather(*(client(args.host, args.port, queries, latencies)
+                                    for queries in per_client))
+    elapsed = time.perf_counter() - t0
+
+    after = await request(reader, writer, {'op': 'stats'})
+    writer.close()
+    await writer.wait_closed()
+    batches = after['batches'] - before['batches']
+    requests = after['requests'] - before['requests']
+    stats = {'batches': batches, 'mean_batch': requests / batches if batches else 0.0}
+    return latencies, sum(errors), elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga no serviço de caminhos (server.py).")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--clients', type=int, default=16, help="conexões simultâneas (padrão: 16)")
+    parser.add_argument('--requests', type=int, default=100, help="pedidos por cliente (padrão: 100)")
+    parser.add_argument('--maze', default='9', help="nome do labirinto no servidor (padrão: 9)")
+    parser.add_argument('--algorithm', default='astar')
+    parser.add_argument('--heuristic', default='manhattan')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    latencies, errors, elapsed, stats = asyncio.run(run_load(args))
+    total = len(latencies)
+    print(f"{args.clients} clientes x {args.requests} pedidos ({args.algorithm}, {args.heuristic}) "
+          f"no labirinto {args.maze}")
+    print(f"Vazão:      {total / elapsed:10.1f} pedidos/s  ({total} em {elapsed:.2f}s, {errors} erros)")
+    print(f"Latência:   média {statistics.mean(latencies) * 1000:.2f} ms   "
+          f"p50 {percentile(latencies, 50) * 1000:.2f} ms   "
+          f"p95 {percentile(latencies, 95) * 1000:.2f} ms   "
+          f"p99 {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"Lotes:      {stats['batches']} (média de {stats['mean_batch']:.1f} pedidos por lote)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# bench_solver.py
+# Vazão (consultas/s) de muitas consultas no mesmo labirinto: chamadas isoladas vs Solver.
+#
+# Uso: python -m benchmarks.bench_solver [tamanho] [consultas] [algoritmo]
+import random
+import sys
+import time
+
+from benchmarks.bench_neighbors import random_grid
+from search.astar import astar
+from search.bfs import bfs
+from search.heuristics import manhattan
+from search.solver import Solver
+
+
+def random_pairs(grid, count: int, seed: int = 7):
+    """Pares (início, objetivo) aleatórios entre células livres."""
+    rng = random.Random(seed)
+    free = [grid.position(i) for i in range(grid.rows * grid.cols) if grid.cells[i] != 1]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    algorithm = sys.argv[3] if len(sys.argv) > 3 else 'astar'
+    grid = random_grid(size, 0.25)
+    maze_list = grid.to_list()
+    pairs = random_pairs(grid, count)
+    print(f"Grid {size}x{size}, {count} consultas, algoritmo {algorithm}")
+
+    def isolated():
+        # Como antes: cada chamada recebe a lista de listas e refaz todo o preparo.
+        for start, goal in pairs:
+            if algorithm == 'bfs':
+                bfs(maze_list, start, goal)
+            else:
+                astar(maze_list, start, goal, manhattan)
+
+    def batched():
+        solver = Solver(grid)
+        for _ in solver.solve_many(pairs, algorithm=algorithm, heuristic='manhattan'):
+            pass
+
+    for name, func in (("chamadas isoladas", isolated), ("Solver.solve_many", batched)):
+        t0 = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - t0
+        print(f"{name:<20} {elapsed:8.3f}s  {count / elapsed:10.1f} consultas/s")
+
+
+if __name__ == '__main__':
+    main()
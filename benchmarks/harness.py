@@ -0,0 +1,142 @@
+# harness.py
+# Benchmark estatístico dos experimentos: aquecimento, repetições e GC controlado.
+#
+# Uso: python -m benchmarks.harness [--warmup 2] [--repeat 15] [--maze 9] [--keep-gc]
+import argparse
+import csv
+import gc
+import json
+import statistics
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from maze import MAZES
+from run_experiments import experiment_matrix, run_single_experiment
+from utils.grid import MazeLike, as_grid
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Percentil q (0-100) com interpolação linear entre as amostras ordenadas."""
+    ordered = sorted(samples)
+    pos = (len(ordered) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """min, mediana, p95 e desvio padrão das amostras de tempo."""
+    return {
+        'time_min_s': min(samples),
+        'time_median_s': statistics.median(samples),
+        'time_p95_s': percentile(samples, 95),
+        'time_std_s': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def measure(run: Callable[[], Dict[str, Any]], warmup: int = 2, repeat: int = 15,
+            disable_gc: bool = True) -> Dict[str, Any]:
+    """
+    Executa run() warmup vezes descartando o resultado e depois repeat vezes medindo.
+
+    run() devolve uma linha de run_single_experiment; o tempo de cada amostra é
+    o time_s medido pelo próprio algoritmo. Com disable_gc o coletor é
+    executado antes das repetições e desligado durante elas, para que uma
+    coleta não caia no meio de uma amostra.
+
+    Returns:
+        a última linha de run() acrescida das estatísticas de tempo e de
+        expansions_per_s (nodes_visited / mediana)
+    """
+    for _ in range(warmup):
+        run()
+
+    gc_was_enabled = gc.isenabled()
+    if disable_gc:
+        gc.collect()
+        gc.disable()
+    try:
+        samples, row = [], {}
+        for _ in range(repeat):
+            row = run()
+            samples.append(row['time_s'])
+    finally:
+        if disable_gc and gc_was_enabled:
+            gc.enable()
+
+    stats = summarize(samples)
+    median = stats['time_median_s']
+    row = dict(row)
+    row.pop('time_s')
+    row.update(stats)
+    row['repeats'] = repeat
+    row['expansions_per_s'] = row['nodes_visited'] / median if median > 0 else None
+    return row
+
+
+def benchmark_maze(maze_id: int, maze: Optional[MazeLike] = None, allow_diagonal: bool = False,
+                   warmup: int = 2, repeat: int = 15, disable_gc: bool = True) -> List[Dict[str, Any]]:
+    """Mede cada par (algoritmo, heurística) de experiment_matrix() em um labirinto."""
+    if maze is None:
+        maze = MAZES[maze_id]
+    # Converte uma vez: o aquecimento já preenche o cache de vizinhos do Grid.
+    grid = as_grid(maze)
+    rows = []
+    for algorithm, heuristic in experiment_matrix():
+        rows.append(measure(
+            lambda: run_single_experiment(maze_id, grid, algorithm, heuristic, allow_diagonal),
+            warmup, repeat, disable_gc))
+    return rows
+
+
+def run_benchmarks(maze_ids: Iterable[int], allow_diagonal: bool = False, warmup: int = 2,
+                   repeat: int = 15, disable_gc: bool = True) -> List[Dict[str, Any]]:
+    all_rows = []
+    for maze_id in maze_ids:
+        print(f"Medindo Labirinto {maze_id} ({warmup} aquecimentos, {repeat} repetições)...")
+        all_rows.extend(benchmark_maze(maze_id, None, allow_diagonal, warmup, repeat, disable_gc))
+    return all_rows
+
+
+def save_benchmark(rows: List[Dict[str, Any]], basename: str = 'results/all_algorithms_benchmark'):
+    """Grava as linhas em <basename>.csv e <basename>.json."""
+    if not rows:
+        print("Nenhum resultado para salvar.")
+        return
+    with open(basename + '.csv', 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(basename + '.json', 'w', encoding='utf-8') as jsonfile:
+        json.dump(rows, jsonfile, indent=2, ensure_ascii=False)
+    print(f"Resultados salvos em '{basename}.csv' e '{basename}.json'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark com aquecimento e repetições.")
+    parser.add_argument('--warmup', type=int, default=2, help="execuções descartadas (padrão: 2)")
+    parser.add_argument('--repeat', type=int, default=15, help="execuções medidas (padrão: 15)")
+    parser.add_argument('--maze', type=int, action='append',
+                        help="ID do labirinto (pode repetir; padrão: todos)")
+    parser.add_argument('--diagonal', action='store_true', help="permite movimentos diagonais")
+    parser.add_argument('--keep-gc', action='store_true', help="não desliga o GC durante as medições")
+    parser.add_argument('--output', default='results/all_algorithms_benchmark',
+                        help="prefixo dos arquivos .csv e .json")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat deve ser >= 1")
+
+    rows = run_benchmarks(args.maze or list(MAZES), args.diagonal, args.warmup,
+                          args.repeat, not args.keep_gc)
+    save_benchmark(rows, args.output)
+
+    print(f"\n{'Lab.':<5} {'Algoritmo':<10} {'Heurística':<12} {'Mín (s)':<12} {'Mediana (s)':<12} "
+          f"{'p95 (s)':<12} {'Desvio (s)':<12} {'Expansões/s':<12}")
+    for r in rows:
+        eps = f"{r['expansions_per_s']:.0f}" if r['expansions_per_s'] else '-'
+        print(f"{r['maze_id']:<5} {r['algorithm']:<10} {r['heuristic']:<12} "
+              f"{r['time_min_s']:<12.6f} {r['time_median_s']:<12.6f} {r['time_p95_s']:<12.6f} "
+              f"{r['time_std_s']:<12.6f} {eps:<12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,8 @@
 # Definição dos 9 labirintos usados nos experimentos.
 from typing import List, Tuple, Union
 
+from utils.grid import Grid, MazeLike
+
 Position = Tuple[int, int]  # (linha, coluna)
 Cell = Union[str, int]  # Célula pode ser 'S', 'G', 0 (livre) ou 1 (parede)
 
@@ -104,8 +106,14 @@ def find_symbol(maze: List[List[Cell]], symbol: str) -> Position:
     raise ValueError(f"Símbolo {symbol!r} não encontrado no labirinto.")
 
 
-def get_start_and_goal(maze: List[List[Cell]]) -> tuple[Position, Position]:
+def get_start_and_goal(maze: MazeLike) -> tuple[Position, Position]:
     """Retorna a posição inicial (S) e final (G)."""
+    if isinstance(maze, Grid):
+        if maze.start is None:
+            raise ValueError("Símbolo 'S' não encontrado no labirinto.")
+        if maze.goal is None:
+            raise ValueError("Símbolo 'G' não encontrado no labirinto.")
+        return maze.start, maze.goal
     start = find_symbol(maze, "S")
     goal = find_symbol(maze, "G")
     return start, goal
@@ -0,0 +1,419 @@
+# maze_canvas.py
+# Desenho incremental do labirinto no Canvas: só as células alteradas são repintadas.
+#
+# Dois renderizadores com a mesma interface (set/paint/flush/labels/cell_at):
+#   CellCanvas  - um retângulo por célula (com contorno); bom até ~50x50
+#   PixelCanvas - a janela visível desenhada em um tk.PhotoImage, com zoom e
+#                 deslocamento; aguenta labirintos de 1000x1000
+# As células são descritas por tipo (índice na paleta), não por cor.
+import time
+import tkinter as tk
+from abc import ABC, abstractmethod
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Sem numpy o PixelCanvas monta as linhas em Python puro
+    np = None
+
+# Tipos de célula = índices na paleta; a partir de FIRST_EXTRA, cores livres (ex.: uma por algoritmo)
+EMPTY, WALL, VISITED, PATH, START, GOAL = range(6)
+FIRST_EXTRA = 6
+_UNKNOWN = 255  # Tipo ainda não desenhado
+
+DEFAULT_MAX_FPS = 30.0
+Label = Tuple[str, str, tuple]  # (texto, cor, fonte)
+
+
+class _CellLayer(ABC):
+    """
+    Estado comum: tipo desenhado por célula, mudanças pendentes e limite de quadros por segundo.
+
+    Cada renderizador implementa _apply (desenha as mudanças pendentes) e
+    _center (ponto do canvas onde vai o rótulo de uma célula).
+    """
+
+    def __init__(self, canvas, palette: Sequence[str], max_fps: float):
+        self.canvas = canvas
+        self.palette = list(palette)
+        self.frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.rows = 0
+        self.cols = 0
+        self._kinds = bytearray()  # Tipo desenhado por id de célula
+        self._pending: Dict[int, int] = {}  # Tipos agendados para o próximo quadro
+        self._labels: Dict[int, Label] = {}
+        self._last_flush = 0.0
+        self.frames = 0
+        self.updates = 0
+
+    def set(self, cell: int, kind: int):
+        """Agenda o tipo de uma célula (por id) para o próximo quadro."""
+        self._pending[cell] = kind
+
+    def paint(self, kinds: Sequence[int]):
+        """Agenda o tipo de todas as células (um por id); só os diferentes serão aplicados."""
+        current = self._kinds
+        pending = self._pending
+        pending.clear()
+        for cell, kind in enumerate(kinds):
+            if current[cell] != kind:
+                pending[cell] = kind
+
+    def flush(self) -> int:
+        """Aplica as mudanças agendadas; devolve quantas células mudaram de fato."""
+        self._last_flush = time.perf_counter()
+        changed = self._apply()
+        self._pending.clear()
+        if changed:
+            self.frames += 1
+            self.updates += changed
+        return changed
+
+    def flush_if_due(self) -> bool:
+        """Aplica as mudanças agendadas se já passou um intervalo de quadro desde o último."""
+        if time.perf_counter() - self._last_flush < self.frame_interval:
+            return False
+        self.flush()
+        return True
+
+    def labels(self, marks: Mapping[int, Label]):
+        """Textos sobre células ({id: (texto, cor, fonte)}, ex.: 'S' e 'G'); recria só se mudaram."""
+        marks = dict(marks)
+        if marks == self._labels:
+            return
+        self.canvas.delete('label')
+        for cell, (text, color, font) in marks.items():
+            center = self._center(cell)
+            if center is not None:
+                self.canvas.create_text(*center, text=text, fill=color, font=font, tags='label')
+        self._labels = marks
+
+    @abstractmethod
+    def _apply(self) -> int:
+        """Desenha as mudanças em _pending; devolve quantas células mudaram de fato."""
+
+    @abstractmethod
+    def _center(self, cell: int) -> Optional[Tuple[int, int]]:
+        """Centro da célula no canvas, ou None se ela não estiver visível."""
+
+
+class CellCanvas(_CellLayer):
+    """
+    Um retângulo por célula, criado uma vez e guardado em uma tabela id -> item.
+
+    Em vez de apagar e recriar o canvas a cada quadro, as mudanças são
+    agendadas com set() ou paint() e aplicadas por flush() como itemconfig
+    apenas nas células cujo tipo mudou. Várias mudanças entre dois quadros
+    viram um único quadro; flush_if_due() limita a taxa a max_fps.
+
+    Os itens só são recriados quando a geometria (linhas, colunas, tamanho
+    ou deslocamento das células) muda, ou depois de clear().
+    """
+
+    def __init__(self, canvas, palette: Sequence[str], outline: str = '#95A5A6',
+                 max_fps: float = DEFAULT_MAX_FPS):
+        super().__init__(canvas, palette, max_fps)
+        self.outline = outline
+        self.cell_size = 0
+        self.offset: Tuple[int, int] = (0, 0)
+        self._items = []  # Item do canvas por id de célula
+
+    def layout(self, rows: int, cols: int, cell_size: int, offset_x: int = 0, offset_y: int = 0) -> bool:
+        """Garante os itens para essa geometria; devolve True se precisou recriá-los."""
+        geometry = (rows, cols, cell_size, (offset_x, offset_y))
+        if self._items and geometry == (self.rows, self.cols, self.cell_size, self.offset):
+            return False
+        self.clear()
+        self.rows, self.cols, self.cell_size, self.offset = geometry
+        create = self.canvas.create_rectangle
+        outline = self.outline
+        items = self._items
+        for row in range(rows):
+            y1 = offset_y + row * cell_size
+            y2 = y1 + cell_size
+            for col in range(cols):
+                x1 = offset_x + col * cell_size
+                items.append(create(x1, y1, x1 + cell_size, y2, fill='', outline=outline,
+                                    width=1, tags='cell'))
+        self._kinds = bytearray([_UNKNOWN]) * (rows * cols)
+        return True
+
+    def clear(self):
+        """
+        Apaga tudo do canvas (inclusive desenhos de outros modos) e esquece os itens.
+
+        A última geometria continua valendo para cell_at().
+        """
+        self.canvas.delete("all")
+        self._items = []
+        self._kinds = bytearray()
+        self._pending.clear()
+        self._labels = {}
+
+    def cell_at(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """(linha, coluna) sob o ponto (x, y) do canvas, ou None fora do labirinto."""
+        if not self.cell_size:
+            return None
+        col = (x - self.offset[0]) // self.cell_size
+        row = (y - self.offset[1]) // self.cell_size
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def _apply(self) -> int:
+        if not self._items:
+            return 0
+        itemconfig = self.canvas.itemconfigure
+        items, current, palette = self._items, self._kinds, self.palette
+        changed = 0
+        for cell, kind in self._pending.items():
+            if current[cell] != kind:
+                itemconfig(items[cell], fill=palette[kind])
+                current[cell] = kind
+                changed += 1
+        return changed
+
+    def _center(self, cell: int) -> Optional[Tuple[int, int]]:
+        row, col = divmod(cell, self.cols)
+        size, (ox, oy) = self.cell_size, self.offset
+        return ox + col * size + size // 2, oy + row * size + size // 2
+
+
+class PixelCanvas(_CellLayer):
+    """
+    A parte visível do labirinto desenhada pixel a pixel em um tk.PhotoImage.
+
+    Cada célula exibida ocupa px x px pixels (zoom >= 1) ou cada pixel
+    mostra uma a cada step células (zoom < 1). Um redesenho completo é uma
+    chamada put() por linha de células, com a linha de cores montada de uma
+    vez (numpy, se disponível) e replicada verticalmente pelo próprio Tk; uma
+    célula alterada é um put() de um retângulo de cor única. O custo fica
+    proporcional à janela visível, não ao labirinto inteiro.
+
+    zoom_at() e pan_to() mudam a janela; depois delas o próximo flush()
+    redesenha a janela toda.
+    """
+
+    ZOOMS = (0.125, 0.25, 0.5, 1, 2, 3, 4, 6, 8, 12, 16, 24, 32)
+    FULL_REDRAW_FRACTION = 0.25  # Acima dessa fração de células alteradas, redesenha tudo
+
+    def __init__(self, canvas, palette: Sequence[str], max_fps: float = DEFAULT_MAX_FPS):
+        super().__init__(canvas, palette, max_fps)
+        self.width = 0
+        self.height = 0
+        self.zoom = 1
+        self.row0 = 0  # Primeira célula visível
+        self.col0 = 0
+        self.offset: Tuple[int, int] = (0, 0)  # Posição da imagem no canvas
+        self._image: Optional[tk.PhotoImage] = None
+        self._full = True  # Próximo flush redesenha a janela toda
+        self._drag: Optional[Tuple[int, int]] = None
+        self._hex = np.array(self.palette, dtype=object) if np is not None else None
+
+    # --- Geometria ----------------------------------------------------------
+    @property
+    def px(self) -> int:
+        """Pixels por célula exibida."""
+        return max(1, int(self.zoom))
+
+    @property
+    def step(self) -> int:
+        """Células por pixel exibido (> 1 só com zoom < 1)."""
+        return max(1, round(1 / self.zoom))
+
+    def _shown(self) -> Tuple[int, int]:
+        """(linhas, colunas) exibidas na janela atual."""
+        px, step = self.px, self.step
+        drows = min(-(-(self.rows - self.row0) // step), -(-self.height // px))
+        dcols = min(-(-(self.cols - self.col0) // step), -(-self.width // px))
+        return max(0, drows), max(0, dcols)
+
+    def layout(self, rows: int, cols: int, width: int, height: int) -> bool:
+        """
+        Ajusta ao labirinto e ao tamanho do canvas; devolve True se a janela mudou.
+
+        Um labirinto de outras dimensões recomeça com o zoom que cabe inteiro
+        no canvas; só o canvas mudar de tamanho mantém zoom e posição.
+        """
+        if (rows, cols, width, height) == (self.rows, self.cols, self.width, self.height) and self._kinds:
+            return False
+        if (rows, cols) != (self.rows, self.cols) or not self._kinds:
+            self.rows, self.cols = rows, cols
+            self._kinds = bytearray([_UNKNOWN]) * (rows * cols)
+            self._pending.clear()
+            self.row0 = self.col0 = 0
+            self.width, self.height = width, height
+            self.zoom = self.fit_zoom()
+        self.width, self.height = width, height
+        self._clamp()
+        self._invalidate()
+        return True
+
+    def fit_zoom(self) -> float:
+        """Maior zoom em que o labirinto inteiro cabe no canvas."""
+        fitting = [z for z in self.ZOOMS
+                   if -(-self.cols // max(1, round(1 / z))) * max(1, int(z)) <= self.width
+                   and -(-self.rows // max(1, round(1 / z))) * max(1, int(z)) <= self.height]
+        return fitting[-1] if fitting else self.ZOOMS[0]
+
+    def _clamp(self):
+        px, step = self.px, self.step
+        self.row0 = max(0, min(self.row0, self.rows - (self.height // px) * step))
+        self.col0 = max(0, min(self.col0, self.cols - (self.width // px) * step))
+        self.row0 -= self.row0 % step
+        self.col0 -= self.col0 % step
+
+    def _invalidate(self):
+        self._full = True
+        self._labels = {}
+        self.canvas.delete('label')
+
+    def clear(self):
+        """Apaga tudo do canvas; o próximo flush redesenha a janela inteira."""
+        self.canvas.delete("all")
+        self._image = None
+        self._pending.clear()
+        self._labels = {}
+        self._full = True
+
+    def cell_at(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """(linha, coluna) sob o ponto (x, y) do canvas, ou None fora do labirinto."""
+        if not self.rows:
+            return None
+        px, step = self.px, self.step
+        col = self.col0 + (x - self.offset[0]) // px * step
+        row = self.row0 + (y - self.offset[1]) // px * step
+        drows, dcols = self._shown()
+        if (self.row0 <= row < self.row0 + drows * step and self.col0 <= col < self.col0 + dcols * step
+                and row < self.rows and col < self.cols):
+            return row, col
+        return None
+
+    def _center(self, cell: int) -> Optional[Tuple[int, int]]:
+        row, col = divmod(cell, self.cols)
+        px, step = self.px, self.step
+        drows, dcols = self._shown()
+        dr, dc = (row - self.row0) // step, (col - self.col0) // step
+        if not (0 <= dr < drows and 0 <= dc < dcols):
+            return None
+        return self.offset[0] + dc * px + px // 2, self.offset[1] + dr * px + px // 2
+
+    # --- Zoom e deslocamento ------------------------------------------------
+    def zoom_at(self, x: int, y: int, direction: int) -> bool:
+        """Aproxima (direction > 0) ou afasta mantendo sob (x, y) a mesma célula; True se mudou."""
+        i = self.ZOOMS.index(self.zoom) if self.zoom in self.ZOOMS else self.ZOOMS.index(1)
+        i = max(0, min(len(self.ZOOMS) - 1, i + (1 if direction > 0 else -1)))
+        if self.ZOOMS[i] == self.zoom:
+            return False
+        anchor = self.cell_at(x, y) or (self.row0, self.col0)
+        self.zoom = self.ZOOMS[i]
+        px, step = self.px, self.step
+        # Deslocamento da imagem recalculado em _render(); aqui vale a origem sem centralização
+        self.row0 = anchor[0] - y // px * step
+        self.col0 = anchor[1] - x // px * step
+        self._clamp()
+        self._invalidate()
+        return True
+
+    def pan_to(self, row0: int, col0: int) -> bool:
+        """Põe a célula (row0, col0) no canto superior esquerdo (limitado às bordas); True se mudou."""
+        before = (self.row0, self.col0)
+        self.row0, self.col0 = row0, col0
+        self._clamp()
+        if (self.row0, self.col0) == before:
+            return False
+        self._invalidate()
+        return True
+
+    def start_drag(self, x: int, y: int):
+        self._drag = (x, y)
+
+    def drag_to(self, x: int, y: int) -> bool:
+        """Arrasta a janela com o mouse, em passos de células inteiras; True se mudou."""
+        if self._drag is None:
+            self._drag = (x, y)
+            return False
+        px, step = self.px, self.step
+        dc, dr = (self._drag[0] - x) // px, (self._drag[1] - y) // px
+        if not dc and not dr:
+            return False
+        self._drag = (self._drag[0] - dc * px, self._drag[1] - dr * px)
+        return self.pan_to(self.row0 + dr * step, self.col0 + dc * step)
+
+    # --- Desenho ------------------------------------------------------------
+    def paint(self, kinds: Sequence[int]):
+        """Agenda o tipo de todas as células; poucas diferenças viram put() por célula, muitas um redesenho."""
+        if np is None:
+            super().paint(kinds)
+        else:
+            new = np.frombuffer(kinds, dtype=np.uint8) if isinstance(kinds, (bytes, bytearray)) \
+                else np.asarray(kinds, dtype=np.uint8)
+            current = np.frombuffer(self._kinds, dtype=np.uint8)
+            changed = np.flatnonzero(new != current)
+            self._pending.clear()
+            if len(changed) > self.FULL_REDRAW_FRACTION * len(current):
+                self._kinds[:] = new.tobytes()
+                self._full = True
+            else:
+                self._pending.update(zip(changed.tolist(), new[changed].tolist()))
+
+    def _apply(self) -> int:
+        if not self.rows:
+            return 0
+        if self._image is None:
+            self._full = True
+        kinds = self._kinds
+        if self._full or len(self._pending) > self.FULL_REDRAW_FRACTION * len(kinds):
+            for cell, kind in self._pending.items():
+                kinds[cell] = kind
+            return self._render()
+        put, palette = self._image.put, self.palette
+        px, step = self.px, self.step
+        drows, dcols = self._shown()
+        changed = 0
+        for cell, kind in self._pending.items():
+            if kinds[cell] == kind:
+                continue
+            kinds[cell] = kind
+            changed += 1
+            row, col = divmod(cell, self.cols)
+            dr, dc = row - self.row0, col - self.col0
+            if dr % step or dc % step:
+                continue  # Célula não amostrada com zoom < 1
+            dr //= step
+            dc //= step
+            if 0 <= dr < drows and 0 <= dc < dcols:
+                put(palette[kind], to=(dc * px, dr * px, dc * px + px, dr * px + px))
+        return changed
+
+    def _row_colors(self, row: int, dcols: int):
+        """Cores de uma linha de células exibida, já repetidas px vezes na horizontal."""
+        start = row * self.cols + self.col0
+        cells = self._kinds[start:start + dcols * self.step:self.step]
+        if self._hex is not None:
+            colors = self._hex[np.frombuffer(cells, dtype=np.uint8)]
+            if self.px > 1:
+                colors = np.repeat(colors, self.px)
+            return colors
+        palette, px = self.palette, self.px
+        return [palette[k] for k in cells for _ in range(px)]
+
+    def _render(self) -> int:
+        """Redesenha a janela visível inteira; devolve o número de células exibidas."""
+        self._full = False
+        drows, dcols = self._shown()
+        px, step = self.px, self.step
+        width, height = dcols * px, drows * px
+        offset = (max(0, (self.width - width) // 2), max(0, (self.height - height) // 2))
+        if self._image is None or (self._image.width(), self._image.height()) != (width, height) \
+                or offset != self.offset:
+            self.canvas.delete('pixels')
+            self._image = tk.PhotoImage(width=max(1, width), height=max(1, height))
+            self.offset = offset
+            self.canvas.create_image(offset[0], offset[1], anchor='nw', image=self._image, tags='pixels')
+            self.canvas.tag_lower('pixels')
+        put = self._image.put
+        for dr in range(drows):
+            row = self.row0 + dr * step
+            put('{' + ' '.join(self._row_colors(row, dcols)) + '}', to=(0, dr * px, width, dr * px + px))
+        return drows * dcols
@@ -0,0 +1,171 @@
+# maze_generator.py
+# Gerador de labirintos aleatórios com semente, densidade controlada e início/objetivo sempre conectados.
+import random
+from typing import Dict, Optional, Tuple
+
+from search.wavefront import np
+from utils.adjacency import STRAIGHT_MOVES
+from utils.grid import Grid, OPEN, WALL
+
+Position = Tuple[int, int]
+
+
+def _wall_table(density: float) -> bytes:
+    """Tabela para bytes.translate: byte aleatório < limiar vira parede."""
+    threshold = round(min(max(density, 0.0), 1.0) * 256)
+    return bytes(WALL if b < threshold else OPEN for b in range(256))
+
+
+def _carve_link_numpy(grid: Grid, start: Position, goal: Position, rng: random.Random):
+    """
+    _carve_link com as camadas expandidas por máscaras numpy, uma frente de onda por iteração.
+
+    A camada 0 é a inundação da região de start, que para assim que alcança
+    goal (e então nada é aberto). As paredes vizinhas de cada frente já saem
+    marcadas como a próxima camada, então nenhuma frente precisa ser
+    guardada. Por célula há só a direção de chegada (int8) sobre o próprio
+    buffer do grid; nenhum índice de vizinhos.
+    """
+    rows, cols = grid.rows, grid.cols
+    n = rows * cols
+    cells = grid.cells
+    walls = np.frombuffer(cells, dtype=np.uint8)  # Visão sem cópia do buffer
+    came = np.zeros(n, dtype=np.int8)  # 0 = não visitada; k+1 = índice em STRAIGHT_MOVES do movimento do pai
+    order = list(enumerate(STRAIGHT_MOVES))
+    rng.shuffle(order)  # Ordem sorteada: varia o elo entre empates
+
+    def step(frontier):
+        """Vizinhos não visitados da fronteira, já marcados: (livres, paredes)."""
+        frontier_col = frontier % cols
+        free, blocked = [], []
+        for k, (dr, dc) in order:
+            if dr == -1:
+                src = frontier[frontier >= cols]
+            elif dr == 1:
+                src = frontier[frontier < n - cols]
+            elif dc == -1:
+                src = frontier[frontier_col != 0]
+            else:
+                src = frontier[frontier_col != cols - 1]
+            nb = src + (dr * cols + dc)
+            nb = nb[came[nb] == 0]
+            came[nb] = k + 1
+            is_wall = walls[nb] == WALL
+            free.append(nb[~is_wall])
+            blocked.append(nb[is_wall])
+        return np.concatenate(free), np.concatenate(blocked)
+
+    source, target = grid.index(start), grid.index(goal)
+    came[source] = len(STRAIGHT_MOVES) + 1  # Marca a origem como visitada
+    frontier = np.array([source], dtype=np.int64)
+    while True:
+        next_layer = []
+        while frontier.size and not came[target]:  # Inunda as livres sem abrir mais paredes
+            frontier, blocked = step(frontier)
+            next_layer.append(blocked)
+        if came[target]:
+            break
+        frontier = np.concatenate(next_layer)
+    del walls  # Libera o buffer exportado antes de editar as células
+    directions = memoryview(came)  # Leitura escalar rápida, sem cópia
+    current = target
+    while current != source:
+        cells[current] = OPEN
+        dr, dc = STRAIGHT_MOVES[directions[current] - 1]
+        current -= dr * cols + dc
+
+
+def _carve_link(grid: Grid, start: Position, goal: Position, rng: random.Random):
+    """
+    Liga a componente de start à de goal abrindo o menor número possível de paredes.
+
+    Busca 0-1 em camadas: a camada k inunda as células livres alcançáveis
+    abrindo k paredes e junta as paredes vizinhas na camada k+1. O elo segue
+    as regiões livres que já existem e só fura as paredes entre elas, então
+    o caminho não é forçado a ter o tamanho da distância de Manhattan. A
+    ordem das direções é sorteada por labirinto para variar o elo entre
+    empates. Guarda só a direção de chegada de cada célula (1 byte por célula).
+    """
+    cells, rows, cols = grid.cells, grid.rows, grid.cols
+    steps = [(-cols, 1), (cols, 2), (-1, 3), (1, 4)]  # (deslocamento, código da direção)
+    rng.shuffle(steps)
+    back = {1: cols, 2: -cols, 3: 1, 4: -1}  # Código -> deslocamento de volta ao pai
+    source, target = grid.index(start), grid.index(goal)
+    came = bytearray(rows * cols)  # 0 = não visitada
+    came[source] = 5
+    layer = [source]
+    while came[target] == 0:
+        following = []
+        stack = layer
+        while stack:
+            current = stack.pop()
+            c = current % cols
+            for delta, code in steps:
+                nb = current + delta
+                if nb < 0 or nb >= len(cells) or (delta == -1 and c == 0) or (delta == 1 and c == cols - 1):
+                    continue
+                if came[nb]:
+                    continue
+                came[nb] = code
+                (following if cells[nb] == WALL else stack).append(nb)
+        layer = following
+    current = target
+    while current != source:
+        cells[current] = OPEN
+        current += back[came[current]]
+
+
+def generate_maze(rows: int,
+                  cols: Optional[int] = None,
+                  density: float = 0.25,
+                  seed: Optional[int] = None,
+                  start: Optional[Position] = None,
+                  goal: Optional[Position] = None) -> Grid:
+    """
+    Gera um labirinto aleatório em que o objetivo é sempre alcançável.
+
+    O ruído é produzido de uma vez: rows*cols bytes aleatórios passam por
+    bytes.translate, que os converte em parede/livre pelo limiar da densidade
+    sem laço em Python. A conectividade é garantida sem tentativas repetidas:
+    a região do início é inundada (com numpy, uma frente de onda por
+    iteração) e, se não contém o objetivo, a mesma busca continua abrindo o
+    menor número de paredes que leva até ele. Nenhum índice de vizinhos é
+    montado.
+
+    Args:
+        rows: número de linhas
+        cols: número de colunas (padrão: igual a rows)
+        density: fração aproximada de paredes, entre 0 e 1
+        seed: semente; a mesma semente gera o mesmo labirinto
+        start: início (padrão: canto superior esquerdo)
+        goal: objetivo (padrão: canto inferior direito)
+
+    Returns:
+        Grid com start e goal definidos
+    """
+    if cols is None:
+        cols = rows
+    if rows < 1 or cols < 1:
+        raise ValueError(f"Dimensões inválidas: {rows}x{cols}.")
+    start = start if start is not None else (0, 0)
+    goal = goal if goal is not None else (rows - 1, cols - 1)
+
+    rng = random.Random(seed)
+    cells = bytearray(rng.randbytes(rows * cols).translate(_wall_table(density)))
+    grid = Grid(rows, cols, cells, start, goal)
+    for pos in (start, goal):
+        if not grid.in_bounds(pos):
+            raise ValueError(f"Posição {pos} fora do labirinto {rows}x{cols}.")
+    cells[grid.index(start)] = cells[grid.index(goal)] = OPEN
+    if np is not None:
+        _carve_link_numpy(grid, start, goal, rng)
+    else:
+        _carve_link(grid, start, goal, rng)
+    return grid
+
+
+def generate_corpus(count: int, size: int, density: float = 0.25,
+                    seed: int = 0) -> Dict[int, Grid]:
+    """Gera count labirintos size x size, com IDs 1..count e sementes seed+ID."""
+    return {maze_id: generate_maze(size, size, density, seed + maze_id)
+            for maze_id in range(1, count + 1)}
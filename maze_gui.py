@@ -5,16 +5,70 @@ Professional interface for creating, editing, and solving mazes with multiple se
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
+import multiprocessing
+import os
+import queue
 import threading
 import time
 import csv
 from typing import List, Tuple, Optional
 from maze import get_start_and_goal
+from maze_canvas import (CellCanvas, PixelCanvas, EMPTY, WALL, VISITED, PATH, START, GOAL,
+                         FIRST_EXTRA)
+from maze_generator import generate_maze
+from utils.mazefile import load_maze, save_maze
 from search.dfs import dfs
 from search.bfs import bfs
 from search.greedy_search_optimized import greedy_search
 from search.astar import astar
+from search.bidirectional import bidirectional_bfs, bidirectional_astar
+from search.lpastar import LPAStar
 from search.heuristics import HEURISTICS
+from search.solver import Solver
+from utils.components import component_index
+from utils.grid import Grid
+from utils.limits import STOP_CANCELLED, STOP_MAX_EXPANSIONS, STOP_TIMEOUT, SearchLimits
+from utils.result_cache import ResultCache, grid_fingerprint, query_key
+from utils.shared_grids import attach_grids, release_grids, share_grids, worker_grid
+from utils.trace import EXPAND, TraceStream
+
+
+MAX_MAZE_SIZE = 1000
+CELL_CANVAS_LIMIT = 50  # Acima disso (linhas ou colunas) o labirinto é desenhado em pixels, com zoom
+
+# Comparação: (nome exibido, algoritmo do Solver, heurística)
+COMPARISON_ALGORITHMS = [
+    ("BFS", 'bfs', 'manhattan'),
+    ("DFS", 'dfs', 'manhattan'),
+    ("Guloso (Manhattan)", 'greedy', 'manhattan'),
+    ("Guloso (Euclidiana)", 'greedy', 'euclidean'),
+    ("Guloso (Chebyshev)", 'greedy', 'chebyshev'),
+    ("A* (Manhattan)", 'astar', 'manhattan'),
+    ("A* (Euclidiana)", 'astar', 'euclidean'),
+    ("A* (Chebyshev)", 'astar', 'chebyshev'),
+    ("BFS Bidirecional", 'bibfs', 'manhattan'),
+    ("A* Bidirecional (Manhattan)", 'biastar', 'manhattan'),
+    ("A* Bidirecional (Euclidiana)", 'biastar', 'euclidean'),
+    ("A* Bidirecional (Chebyshev)", 'biastar', 'chebyshev'),
+]
+COMPARISON_KEY = 'comparison'  # Nome do labirinto na memória compartilhada dos processos
+COMPARISON_POLL_MS = 20
+
+STOP_LABELS = {
+    STOP_CANCELLED: "interrompida pelo usuário",
+    STOP_TIMEOUT: "prazo esgotado",
+    STOP_MAX_EXPANSIONS: "limite de expansões atingido",
+}
+
+
+def _compare_worker(algo_name, algorithm, heuristic, start, goal):
+    """
+    Roda um algoritmo da comparação em um processo do pool.
+    
+    O labirinto foi anexado uma vez pelo inicializador (attach_grids); a
+    tarefa só leva o nome do algoritmo e as posições.
+    """
+    return algo_name, Solver(worker_grid(COMPARISON_KEY)).solve(start, goal, algorithm, heuristic)
 
 
 class MazeGUI:
@@ -31,18 +85,27 @@ class MazeGUI:
         self.start_pos = None
         self.goal_pos = None
         self.current_result = None
+        self.trace_visited = set()  # Células expandidas na última busca (do rastro)
         self.cell_size = 30
         self.is_solving = False
         self.is_animating = False
         self.animation_speed = 50  # ms
         self.stop_event = threading.Event()
         
+        # LPA*: planejador mantido entre edições e células editadas desde o último replanejamento
+        self.lpa_planner = None
+        self.lpa_source = None  # Grid que o planejador acompanha
+        self.lpa_pending = set()
+        
         self.edit_mode = tk.StringVar(value="wall")  # wall, start, goal, empty
         self.drawing = False
         
         # Para comparação de múltiplos algoritmos
         self.all_results = {}  # Armazena resultados de todos os algoritmos
+        self.result_cache = ResultCache(max_entries=256)  # Comparações repetidas no mesmo labirinto
         self.comparison_mode = False  # Modo de visualização comparativa
+        self.comparison = None  # Estado da comparação em andamento (pool, resultados, pendentes)
+        self.comparison_queue = queue.Queue()  # (nome, resultado) vindos dos processos
         
         # Modern color scheme
         self.COLORS = {
@@ -59,7 +122,7 @@ class MazeGUI:
             'highlight': '#e63946'       # Accent color
         }
         
-        # Cores para comparação de algoritmos (8 cores distintas)
+        # Cores para comparação de algoritmos (12 cores distintas)
         self.ALGORITHM_COLORS = [
             '#FF6B6B',  # Vermelho
             '#4ECDC4',  # Turquesa
@@ -69,8 +132,16 @@ class MazeGUI:
             '#A78BFA',  # Roxo
             '#F472B6',  # Rosa
             '#FB923C',  # Laranja
+            '#60A5FA',  # Azul
+            '#C084FC',  # Lilás
+            '#F87171',  # Salmão
+            '#A3E635',  # Lima
         ]
         
+        # Paleta dos renderizadores: um índice por tipo de célula (maze_canvas), depois as cores dos algoritmos
+        self.PALETTE = ([self.COLORS[key] for key in ('empty', 'wall', 'visited', 'path', 'start', 'goal')]
+                        + self.ALGORITHM_COLORS)
+        
         self._setup_style()
         
         self._create_widgets()
@@ -168,6 +239,8 @@ class MazeGUI:
             ("Médio (15x15)", "15"),
             ("Grande (20x20)", "20"),
             ("Extra Grande (30x30)", "30"),
+            ("Enorme (200x200)", "200"),
+            ("Gigante (1000x1000)", "1000"),
         ]
         
         for text, value in sizes:
@@ -245,6 +318,11 @@ class MazeGUI:
             ("[A*] A-Estrela - Heurística Manhattan", "astar_manhattan"),
             ("[A*] A-Estrela - Heurística Euclidiana", "astar_euclidean"),
             ("[A*] A-Estrela - Heurística Chebyshev", "astar_chebyshev"),
+            ("[BiBFS] Busca em Largura Bidirecional", "bibfs"),
+            ("[BiA*] A-Estrela Bidirecional - Manhattan", "biastar_manhattan"),
+            ("[BiA*] A-Estrela Bidirecional - Euclidiana", "biastar_euclidean"),
+            ("[BiA*] A-Estrela Bidirecional - Chebyshev", "biastar_chebyshev"),
+            ("[LPA*] A-Estrela Incremental - Manhattan", "lpastar_manhattan"),
         ]
         
         for text, value in algorithms:
@@ -309,9 +387,14 @@ class MazeGUI:
     
     def _create_file_section(self, parent):
         """Create file operations section."""
-        frame = ttk.LabelFrame(parent, text="Exportar Resultados", padding=10)
+        frame = ttk.LabelFrame(parent, text="Arquivos e Resultados", padding=10)
         frame.pack(fill=tk.X, padx=10, pady=(0, 10))
         
+        ttk.Button(frame, text="Abrir Labirinto (.maze)",
+                  command=self._open_maze_file).pack(fill=tk.X, pady=2)
+        ttk.Button(frame, text="Salvar Labirinto (.maze)",
+                  command=self._save_maze_file).pack(fill=tk.X, pady=2)
+        
         self.export_button = ttk.Button(frame, text="Exportar Resultados (CSV)", 
                                        command=self._export_results,
                                        state=tk.DISABLED)
@@ -344,10 +427,20 @@ class MazeGUI:
         self.canvas = tk.Canvas(canvas_frame, bg=self.COLORS['empty'], 
                                highlightthickness=2, highlightbackground=self.COLORS['bg'])
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # Renderizadores: itens por célula até 50x50, pixels com zoom acima disso
+        self.cell_canvas = CellCanvas(self.canvas, self.PALETTE)
+        self.pixel_canvas = PixelCanvas(self.canvas, self.PALETTE)
+        self.cells = self.cell_canvas
         
         self.canvas.bind("<Button-1>", self._on_canvas_click)
         self.canvas.bind("<B1-Motion>", self._on_canvas_drag)
         self.canvas.bind("<ButtonRelease-1>", self._on_canvas_release)
+        # Zoom (roda do mouse) e deslocamento (botão direito) no modo de pixels
+        self.canvas.bind("<MouseWheel>", self._on_canvas_zoom)
+        self.canvas.bind("<Button-4>", self._on_canvas_zoom)
+        self.canvas.bind("<Button-5>", self._on_canvas_zoom)
+        self.canvas.bind("<Button-3>", self._on_pan_start)
+        self.canvas.bind("<B3-Motion>", self._on_pan_drag)
         
         self.root.bind("<Configure>", self._on_resize)
         
@@ -378,8 +471,8 @@ class MazeGUI:
         if size_choice == "custom":
             try:
                 size = int(self.custom_size_entry.get())
-                if size < 5 or size > 50:
-                    messagebox.showerror("Erro", "Tamanho deve estar entre 5 e 50.")
+                if size < 5 or size > MAX_MAZE_SIZE:
+                    messagebox.showerror("Erro", f"Tamanho deve estar entre 5 e {MAX_MAZE_SIZE}.")
                     return None
                 return size
             except ValueError:
@@ -390,16 +483,17 @@ class MazeGUI:
     
     def _create_default_maze(self):
         size = 15
-        self.maze_grid = [[0 for _ in range(size)] for _ in range(size)]
+        self.maze_grid = Grid(size, size)
         self.start_pos = (0, 0)
         self.goal_pos = (size - 1, size - 1)
         
         for i in range(3, 12):
-            self.maze_grid[i][7] = 1
+            self.maze_grid.set_wall((i, 7))
         for i in range(3, 10):
-            self.maze_grid[5][i] = 1
+            self.maze_grid.set_wall((5, i))
         
         self.current_result = None
+        self.trace_visited = set()
         self._draw_maze()
         self._clear_results()
     
@@ -414,90 +508,15 @@ class MazeGUI:
         
         density = self.density_var.get()
         
-        import random
-        from collections import deque
-        
-        max_attempts = 100
-        for attempt in range(max_attempts):
-            self.maze_grid = [[0 for _ in range(size)] for _ in range(size)]
-            
-            for i in range(size):
-                for j in range(size):
-                    if random.random() < density:
-                        self.maze_grid[i][j] = 1
-            
-            self.start_pos = (0, 0)
-            self.goal_pos = (size - 1, size - 1)
-            self.maze_grid[0][0] = 0
-            self.maze_grid[size-1][size-1] = 0
-            
-            if self._has_path(self.start_pos, self.goal_pos):
-                break
-
-            if attempt == max_attempts - 1:
-                self._create_guaranteed_path()
+        self.maze_grid = generate_maze(size, size, density)
+        self.start_pos = self.maze_grid.start
+        self.goal_pos = self.maze_grid.goal
         
         self.current_result = None
+        self.trace_visited = set()
         self._draw_maze()
         self._clear_results()
     
-    def _has_path(self, start, goal):
-
-        from collections import deque
-        
-        rows = len(self.maze_grid)
-        cols = len(self.maze_grid[0])
-        
-        queue = deque([start])
-        visited = {start}
-        
-        while queue:
-            r, c = queue.popleft()
-            
-            if (r, c) == goal:
-                return True
-            
-            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nr, nc = r + dr, c + dc
-                
-                if (0 <= nr < rows and 0 <= nc < cols and 
-                    (nr, nc) not in visited and self.maze_grid[nr][nc] == 0):
-                    visited.add((nr, nc))
-                    queue.append((nr, nc))
-        
-        return False
-    
-    def _create_guaranteed_path(self):
-        import random
-        
-        rows = len(self.maze_grid)
-        cols = len(self.maze_grid[0])
-        
-        r, c = self.start_pos
-        goal_r, goal_c = self.goal_pos
-
-        while c < goal_c:
-            self.maze_grid[r][c] = 0
-            c += 1
-
-            if random.random() < 0.3 and r < goal_r:
-                r += 1
-            elif random.random() < 0.3 and r > 0:
-                r -= 1
-            r = max(0, min(rows - 1, r))
-        
-
-        while r < goal_r:
-            self.maze_grid[r][c] = 0
-            r += 1
-        
-        while r > goal_r:
-            self.maze_grid[r][c] = 0
-            r -= 1
-        
-
-        self.maze_grid[goal_r][goal_c] = 0
-    
     def _clear_maze(self):
 
         if self.is_solving:
@@ -508,10 +527,11 @@ class MazeGUI:
         if size is None:
             size = 15
         
-        self.maze_grid = [[0 for _ in range(size)] for _ in range(size)]
+        self.maze_grid = Grid(size, size)
         self.start_pos = (0, 0)
         self.goal_pos = (size - 1, size - 1)
         self.current_result = None
+        self.trace_visited = set()
         self._draw_maze()
         self._clear_results()
     
@@ -538,43 +558,31 @@ class MazeGUI:
         if not self.maze_grid:
             return
         
-
-        self.canvas.update_idletasks()
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        
-        rows = len(self.maze_grid)
-        cols = len(self.maze_grid[0])
-        
-        cell_size_w = max(10, (canvas_width - 20) // cols)
-        cell_size_h = max(10, (canvas_height - 20) // rows)
-        cell_size = min(cell_size_w, cell_size_h)
-        
-        total_width = cols * cell_size
-        total_height = rows * cell_size
-        offset_x = (canvas_width - total_width) // 2
-        offset_y = (canvas_height - total_height) // 2
-        
-        col = (x - offset_x) // cell_size
-        row = (y - offset_y) // cell_size
-        
-        if 0 <= row < rows and 0 <= col < cols:
+        pos = self.cells.cell_at(x, y)  # Geometria do último desenho (inclui zoom e deslocamento)
+        if pos is not None:
+            row, col = pos
             mode = self.edit_mode.get()
             
             if mode == "wall":
                 if (row, col) != self.start_pos and (row, col) != self.goal_pos:
                     self.maze_grid[row][col] = 1
+                    self.lpa_pending.add((row, col))
             elif mode == "empty":
                 if (row, col) != self.start_pos and (row, col) != self.goal_pos:
                     self.maze_grid[row][col] = 0
+                    self.lpa_pending.add((row, col))
             elif mode == "start":
                 self.maze_grid[self.start_pos[0]][self.start_pos[1]] = 0
+                self.lpa_pending.update((self.start_pos, (row, col)))
                 self.start_pos = (row, col)
                 self.maze_grid[row][col] = 0
+                self.lpa_planner = None  # Novo início: o LPA* recomeça sobre o grid atual
             elif mode == "goal":
                 self.maze_grid[self.goal_pos[0]][self.goal_pos[1]] = 0
+                self.lpa_pending.update((self.goal_pos, (row, col)))
                 self.goal_pos = (row, col)
                 self.maze_grid[row][col] = 0
+                self.lpa_planner = None  # Novo objetivo: o LPA* recomeça sobre o grid atual
             
             self._draw_maze()
     
@@ -582,11 +590,58 @@ class MazeGUI:
         if event.widget == self.root and self.maze_grid:
             self._draw_maze()
     
+    def _on_canvas_zoom(self, event):
+        """Roda do mouse: aproxima ou afasta no modo de pixels."""
+        if self.cells is not self.pixel_canvas:
+            return
+        direction = 1 if event.num == 4 or event.delta > 0 else -1
+        if self.pixel_canvas.zoom_at(event.x, event.y, direction):
+            self._draw_maze()
+    
+    def _on_pan_start(self, event):
+        if self.cells is self.pixel_canvas:
+            self.pixel_canvas.start_drag(event.x, event.y)
+    
+    def _on_pan_drag(self, event):
+        """Botão direito arrastado: desloca a janela visível no modo de pixels."""
+        if self.cells is self.pixel_canvas and self.pixel_canvas.drag_to(event.x, event.y):
+            self._draw_maze()
+    
+    def _clear_canvas(self):
+        """Apaga o canvas e avisa os dois renderizadores (ambos desenham nele)."""
+        self.cell_canvas.clear()
+        self.pixel_canvas.clear()
+    
+    def _select_renderer(self, rows, cols, width, height):
+        """Escolhe o renderizador pelo tamanho do labirinto e ajusta sua geometria ao canvas."""
+        cells = self.pixel_canvas if max(rows, cols) > CELL_CANVAS_LIMIT else self.cell_canvas
+        if cells is not self.cells:
+            self._clear_canvas()
+            self.cells = cells
+        if cells is self.pixel_canvas:
+            cells.layout(rows, cols, width, height)
+            self.cell_size = cells.px
+        else:
+            cell_size_w = max(10, (width - 20) // cols)
+            cell_size_h = max(10, (height - 20) // rows)
+            self.cell_size = min(cell_size_w, cell_size_h)
+            
+            total_width = cols * self.cell_size
+            total_height = rows * self.cell_size
+            offset_x = (width - total_width) // 2
+            offset_y = (height - total_height) // 2
+            cells.layout(rows, cols, self.cell_size, offset_x, offset_y)
+        return cells
+    
     def _draw_maze(self, path_to_draw=None, visited_to_draw=None):
-        """Draw the maze on canvas with current state."""
-        self.canvas.delete("all")
+        """
+        Draw the maze on canvas with current state.
         
+        Aqui só se calcula o tipo de cada célula; o renderizador (CellCanvas
+        ou PixelCanvas) repinta as que mudaram desde o último desenho.
+        """
         if not self.maze_grid:
+            self._clear_canvas()
             return
         
         # Se estamos em modo de comparação, usar o método específico
@@ -605,62 +660,41 @@ class MazeGUI:
         if canvas_width <= 1 or canvas_height <= 1:
             return
         
-        rows = len(self.maze_grid)
-        cols = len(self.maze_grid[0])
-        
-        cell_size_w = max(10, (canvas_width - 20) // cols)
-        cell_size_h = max(10, (canvas_height - 20) // rows)
-        self.cell_size = min(cell_size_w, cell_size_h)
-        
-        total_width = cols * self.cell_size
-        total_height = rows * self.cell_size
-        offset_x = (canvas_width - total_width) // 2
-        offset_y = (canvas_height - total_height) // 2
+        grid = self.maze_grid
+        rows, cols = grid.rows, grid.cols
+        cells = self._select_renderer(rows, cols, canvas_width, canvas_height)
         
         path_set = set(path_to_draw) if path_to_draw else set()
-        visited_set = set(visited_to_draw) if visited_to_draw else set()
+        visited_set = visited_to_draw if visited_to_draw else set()  # Só consultas de pertinência
         
         if self.current_result and not path_to_draw and not visited_to_draw:
             if self.current_result.found:
                 path_set = set(self.current_result.path)
-            if hasattr(self.current_result, 'visited_nodes'):
-                visited_set = self.current_result.visited_nodes
-        
-        for row in range(rows):
-            for col in range(cols):
-                x1 = offset_x + col * self.cell_size
-                y1 = offset_y + row * self.cell_size
-                x2 = x1 + self.cell_size
-                y2 = y1 + self.cell_size
-                
-                pos = (row, col)
-                
-                color = self.COLORS['empty']
-                
-                if self.maze_grid[row][col] == 1:
-                    color = self.COLORS['wall']
-                elif pos in visited_set:
-                    color = self.COLORS['visited']
-                
-                if pos in path_set and pos != self.start_pos and pos != self.goal_pos:
-                    color = self.COLORS['path']
-                
-                if pos == self.start_pos:
-                    color = self.COLORS['start']
-                elif pos == self.goal_pos:
-                    color = self.COLORS['goal']
-                
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, 
-                                            outline='#95A5A6', width=1)
-                
-                if pos == self.start_pos and self.cell_size > 15:
-                    self.canvas.create_text((x1+x2)//2, (y1+y2)//2, 
-                                          text="S", fill="white", 
-                                          font=('Arial', max(8, self.cell_size//2), 'bold'))
-                elif pos == self.goal_pos and self.cell_size > 15:
-                    self.canvas.create_text((x1+x2)//2, (y1+y2)//2, 
-                                          text="G", fill="white", 
-                                          font=('Arial', max(8, self.cell_size//2), 'bold'))
+            visited_set = self.trace_visited
+        
+        # Tipo por id de célula: os bytes do grid já são EMPTY (0) e WALL (1)
+        kinds = bytearray(grid.cells)
+        for r, c in visited_set:
+            if kinds[r * cols + c] != WALL:
+                kinds[r * cols + c] = VISITED
+        for r, c in path_set:
+            kinds[r * cols + c] = PATH
+        marks = self._mark_endpoints(kinds, cols)
+        
+        cells.paint(kinds)
+        cells.flush()
+        cells.labels(marks)
+    
+    def _mark_endpoints(self, kinds, cols):
+        """Marca início e objetivo em kinds e devolve os rótulos S/G (se as células forem grandes o bastante)."""
+        marks = {}
+        font = ('Arial', max(8, self.cell_size // 2), 'bold')
+        for pos, kind, text in ((self.start_pos, START, "S"), (self.goal_pos, GOAL, "G")):
+            if pos is not None:
+                kinds[pos[0] * cols + pos[1]] = kind
+                if self.cell_size > 15:
+                    marks[pos[0] * cols + pos[1]] = (text, "white", font)
+        return marks
     
     def _update_stats(self):
         """Update maze statistics display."""
@@ -668,11 +702,18 @@ class MazeGUI:
             rows = len(self.maze_grid)
             cols = len(self.maze_grid[0])
             total_cells = rows * cols
-            wall_cells = sum(row.count(1) for row in self.maze_grid)
+            wall_cells = self.maze_grid.wall_count()
             empty_cells = total_cells - wall_cells
             density = (wall_cells / total_cells) * 100
             
             stats = f"Tamanho: {rows}x{cols} | Células: {total_cells} | Paredes: {wall_cells} ({density:.1f}%) | Vazias: {empty_cells}"
+            
+            # Regiões conexas (índice em cache no grid até a próxima edição)
+            if self.start_pos is not None and self.goal_pos is not None:
+                components = component_index(self.maze_grid)
+                linked = components.connected(self.maze_grid.index(self.start_pos),
+                                              self.maze_grid.index(self.goal_pos))
+                stats += f" | Regiões: {components.count} | {'Objetivo alcançável' if linked else 'Sem caminho até o objetivo'}"
             self.stats_label.config(text=stats)
     
     def _update_legend(self):
@@ -733,38 +774,69 @@ class MazeGUI:
         
         try:
 
-            maze = [[1 if cell == 1 else 0 for cell in row] for row in self.maze_grid]
-            maze[self.start_pos[0]][self.start_pos[1]] = 'S'
-            maze[self.goal_pos[0]][self.goal_pos[1]] = 'G'
+            maze = self.maze_grid.copy()
+            maze.start = self.start_pos
+            maze.goal = self.goal_pos
             
             algo_choice = self.algo_var.get()
+            start, goal = self.start_pos, self.goal_pos
             
-
+            # run(trace) executa a busca emitindo o rastro que a animação consome;
+            # limits deixa o botão Parar interromper a busca no meio
+            run = None
+            limits = SearchLimits(cancel=self.stop_event)
             if algo_choice == "bfs":
-                result = bfs(maze, self.start_pos, self.goal_pos)
+                run = lambda trace, limits=None: bfs(maze, start, goal, trace=trace, limits=limits)
                 algo_name = "BFS - Busca em Largura"
             elif algo_choice == "dfs":
-                result = dfs(maze, self.start_pos, self.goal_pos)
+                run = lambda trace, limits=None: dfs(maze, start, goal, trace=trace, limits=limits)
                 algo_name = "DFS - Busca em Profundidade"
             elif algo_choice.startswith("greedy_"):
                 heur_type = algo_choice.split("_")[1]
                 heur_func = HEURISTICS[heur_type]
-                result = greedy_search(maze, self.start_pos, self.goal_pos, heur_func)
+                run = lambda trace, limits=None: greedy_search(maze, start, goal, heur_func,
+                                                              trace=trace, limits=limits)
                 algo_name = f"Greedy - {heur_type.capitalize()}"
             elif algo_choice.startswith("astar_"):
                 heur_type = algo_choice.split("_")[1]
                 heur_func = HEURISTICS[heur_type]
-                result = astar(maze, self.start_pos, self.goal_pos, heur_func, allow_diagonal=False)
+                run = lambda trace, limits=None: astar(maze, start, goal, heur_func, allow_diagonal=False,
+                                                      trace=trace, limits=limits)
                 algo_name = f"A* - {heur_type.capitalize()}"
+            elif algo_choice == "bibfs":
+                run = lambda trace, limits=None: bidirectional_bfs(maze, start, goal,
+                                                                  trace=trace, limits=limits)
+                algo_name = "BFS Bidirecional"
+            elif algo_choice.startswith("biastar_"):
+                heur_type = algo_choice.split("_")[1]
+                heur_func = HEURISTICS[heur_type]
+                run = lambda trace, limits=None: bidirectional_astar(maze, start, goal, heur_func,
+                                                                    allow_diagonal=False,
+                                                                    trace=trace, limits=limits)
+                algo_name = f"A* Bidirecional - {heur_type.capitalize()}"
+            elif algo_choice.startswith("lpastar_"):
+                heur_type = algo_choice.split("_")[1]
+                result, algo_name = self._solve_incremental(heur_type, limits)
             else:
                 return
             
-            self.current_result = result
+            if run is not None:
+                # Métricas de uma execução sem rastro: com a animação, o tempo
+                # incluiria as esperas da busca pela fila do TraceStream.
+                result = run(None, limits)
+            
+            self.current_result = None
+            self.trace_visited = set()
             self._display_results(algo_name, result)
+            if result.stop_reason is not None:
+                return  # Interrompida pelo usuário antes do fim da busca
+            if run is not None and not self._animate_search(TraceStream(run), maze.cols):
+                return  # Interrompida pelo usuário
+            self.current_result = result
             
 
             if result.found and not self.stop_event.is_set():
-                self._animate_solution(result)
+                self._animate_path(result)
             else:
                 self._draw_maze()
             
@@ -779,28 +851,105 @@ class MazeGUI:
             self.solve_button.config(state=tk.NORMAL)
             self.stop_button.config(state=tk.DISABLED)
     
-    def _animate_solution(self, result):
-
+    def _solve_incremental(self, heur_type, limits=None):
+        """
+        Resolve com LPA*, reaproveitando o planejador se só paredes mudaram.
+        
+        Na primeira vez (ou após trocar labirinto, início, objetivo ou
+        heurística) o planejador é criado do zero; depois, apenas as células
+        editadas em _edit_cell são repassadas e a árvore é reparada. Se limits
+        interromper, a fila do planejador fica como estava e a próxima
+        solução continua o reparo.
+        """
+        heur_func = HEURISTICS[heur_type]
+        planner = self.lpa_planner
+        reuse = (planner is not None and self.lpa_source is self.maze_grid
+                 and planner.start == self.start_pos and planner.goal == self.goal_pos
+                 and planner.heuristic is heur_func)
+        
+        if reuse:
+            changes = {pos: self.maze_grid[pos[0]][pos[1]] == 1 for pos in self.lpa_pending}
+            result = planner.update_cells(changes, limits)
+            label = "replanejamento"
+        else:
+            planner = LPAStar(self.maze_grid.copy(), self.start_pos, self.goal_pos, heur_func)
+            result = planner.solve(limits)
+            label = "busca inicial"
+            self.lpa_planner = planner
+            self.lpa_source = self.maze_grid
+        self.lpa_pending.clear()
+        
+        full = astar(planner.grid, self.start_pos, self.goal_pos, heur_func, limits=limits)
+        algo_name = (f"LPA* - {heur_type.capitalize()}\n"
+                     f"{label}: {result.nodes_visited} expansões\n"
+                     f"A* do zero: {full.nodes_visited} expansões")
+        return result, algo_name
+    
+    def _animate_search(self, stream, cols):
+        """
+        Pinta cada expansão assim que a busca (em outra thread) a emite.
+        
+        O rastro chega por uma fila limitada (TraceStream): a busca nunca
+        fica mais de alguns blocos à frente da animação e nada é guardado
+        além do conjunto de células já pintadas. Cada expansão só agenda o
+        tipo da sua célula no renderizador; os quadros saem no máximo a
+        max_fps, juntando as expansões que chegaram entre eles. Devolve
+        False se o usuário interrompeu (a busca é cancelada junto).
+        """
         self.is_animating = True
-        
+        visited = self.trace_visited
+        keep = {self.maze_grid.index(self.start_pos), self.maze_grid.index(self.goal_pos)}
+        steps = self._steps_per_pause()
+        drawn = False
+        try:
+            for kind, cell in stream:
+                if self.stop_event.is_set():
+                    return False
+                if kind != EXPAND:
+                    continue
+                visited.add(divmod(cell, cols))
+                if not drawn:
+                    self._draw_maze(visited_to_draw=visited)  # Ajusta a geometria e pinta a base uma vez
+                    drawn = True
+                elif cell not in keep:
+                    self.cells.set(cell, VISITED)
+                if self.cells.flush_if_due():
+                    self.root.update()
+                if len(visited) % steps == 0:
+                    time.sleep(self.animation_speed / 1000.0)
+            self.cells.flush()
+        finally:
+            stream.close()
+        return not self.stop_event.is_set()
+    
+    def _steps_per_pause(self):
+        """
+        Expansões animadas entre duas pausas: 1 até 50x50 e proporcional à
+        área acima disso, para que explorar um labirinto grande leve na tela
+        o mesmo tempo que um de 50x50 na mesma velocidade.
+        """
+        return max(1, self.maze_grid.rows * self.maze_grid.cols // (CELL_CANVAS_LIMIT * CELL_CANVAS_LIMIT))
+    
+    def _animate_path(self, result):
 
-        visited_list = list(result.visited_nodes) if hasattr(result, 'visited_nodes') else []
+        self.is_animating = True
+        cols = self.maze_grid.cols
+        keep = {self.maze_grid.index(self.start_pos), self.maze_grid.index(self.goal_pos)}
+        steps = max(1, max(self.maze_grid.rows, cols) // CELL_CANVAS_LIMIT)
+        # Primeiro quadro completo (visitados + início); depois só as células do caminho
+        self._draw_maze(path_to_draw=result.path[:1], visited_to_draw=self.trace_visited)
         
-        for i, node in enumerate(visited_list):
+        for i, (r, c) in enumerate(result.path, 1):
             if self.stop_event.is_set():
                 break
-            self._draw_maze(visited_to_draw=visited_list[:i+1])
-            self.root.update()
-            time.sleep(self.animation_speed / 1000.0)
-
-        if result.found and not self.stop_event.is_set():
-            for i in range(len(result.path)):
-                if self.stop_event.is_set():
-                    break
-                self._draw_maze(path_to_draw=result.path[:i+1], 
-                               visited_to_draw=visited_list)
+            cell = r * cols + c
+            if cell not in keep:
+                self.cells.set(cell, PATH)
+            if self.cells.flush_if_due():
                 self.root.update()
+            if i % steps == 0:
                 time.sleep(self.animation_speed / 1000.0)
+        self.cells.flush()
         
 
         if not self.stop_event.is_set():
@@ -822,6 +971,7 @@ class MazeGUI:
             return
         
         self.current_result = None
+        self.trace_visited = set()
         self.all_results = {}
         self.comparison_mode = False
         self.export_button.config(state=tk.DISABLED)
@@ -849,11 +999,20 @@ class MazeGUI:
             if hasattr(result, 'max_frontier_size') and result.max_frontier_size:
                 text += f"Fronteira Máx: {result.max_frontier_size}\n"
             
+            if result.memory_bytes:
+                text += f"Memória: {result.memory_bytes / 1024:.1f} KiB\n"
+            
             if hasattr(result, 'path_cost') and result.path_cost is not None:
                 text += f"Custo do Caminho: {result.path_cost}\n"
             
             text += f"Tempo: {result.time:.6f}s\n"
             text += f"Tempo: {result.time*1000:.2f}ms\n"
+            text += self._stats_text(result.stats)
+        elif result.stop_reason is not None:
+            text += f"⏹ BUSCA INTERROMPIDA ({STOP_LABELS.get(result.stop_reason, result.stop_reason)})\n\n"
+            text += f"Nós Visitados até a parada: {result.nodes_visited}\n"
+            text += f"Tempo: {result.time:.6f}s\n"
+            text += self._stats_text(result.stats)
         else:
             text += "✗ SOLUÇÃO NÃO ENCONTRADA!\n\n"
             text += f"Nós Visitados: {result.nodes_visited}\n"
@@ -862,13 +1021,34 @@ class MazeGUI:
         self.results_text.insert(tk.END, text)
         self.results_text.config(state=tk.DISABLED)
     
+    @staticmethod
+    def _stats_text(stats):
+        """Contadores do laço (SearchStats); vizinhos e heurística só existem com um observador."""
+        if stats is None:
+            return ""
+        text = "\nContadores:\n"
+        text += f"Pushes/Pops: {stats.pushes} / {stats.pops}\n"
+        text += f"Pops Descartados: {stats.stale_pops}\n"
+        text += f"Reaberturas: {stats.reopened}\n"
+        if stats.neighbor_checks is not None:
+            text += f"Vizinhos Examinados: {stats.neighbor_checks}\n"
+        if stats.heuristic_calls is not None:
+            text += f"Heurística: {stats.heuristic_calls} chamadas, {stats.heuristic_time*1000:.3f}ms\n"
+        return text
+    
     def _clear_results(self):
         self.results_text.config(state=tk.NORMAL)
         self.results_text.delete(1.0, tk.END)
         self.results_text.config(state=tk.DISABLED)
     
     def _compare_all_algorithms(self):
-        """Executa todos os algoritmos e compara os resultados."""
+        """
+        Executa todos os algoritmos e compara os resultados.
+        
+        Cada algoritmo vai para um processo de um pool que recebe o
+        labirinto uma única vez, em memória compartilhada; as respostas
+        chegam por uma fila lida em root.after, sem bloquear o Tk.
+        """
         if self.is_solving:
             messagebox.showwarning("Aviso", "Uma solução já está em andamento.")
             return
@@ -883,49 +1063,112 @@ class MazeGUI:
         self.compare_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         
-        def run_comparison():
+        # Resultados em cache entram direto; só as faltas vão para o pool
+        self.all_results = {}
+        fingerprint = grid_fingerprint(self.maze_grid)
+        comparison = {'order': [name for name, _, _ in COMPARISON_ALGORITHMS], 'keys': {},
+                      'results': {}, 'pending': 0, 'pool': None, 'blocks': []}
+        misses = []
+        for algo_name, algorithm, heuristic in COMPARISON_ALGORITHMS:
+            key = query_key(fingerprint, self.start_pos, self.goal_pos, algo_name)
+            found, result = self.result_cache.lookup(key)
+            if found:
+                comparison['results'][algo_name] = result
+                self._update_comparison_progress(algo_name)
+            else:
+                comparison['keys'][algo_name] = key
+                misses.append((algo_name, algorithm, heuristic))
+        
+        if misses:
             try:
-                self.all_results = {}
-                
-                # Lista de todos os algoritmos
-                algorithms = [
-                    ("BFS", lambda: bfs(self.maze_grid, self.start_pos, self.goal_pos)),
-                    ("DFS", lambda: dfs(self.maze_grid, self.start_pos, self.goal_pos)),
-                    ("Guloso (Manhattan)", lambda: greedy_search(self.maze_grid, self.start_pos, self.goal_pos, HEURISTICS['manhattan'])),
-                    ("Guloso (Euclidiana)", lambda: greedy_search(self.maze_grid, self.start_pos, self.goal_pos, HEURISTICS['euclidean'])),
-                    ("Guloso (Chebyshev)", lambda: greedy_search(self.maze_grid, self.start_pos, self.goal_pos, HEURISTICS['chebyshev'])),
-                    ("A* (Manhattan)", lambda: astar(self.maze_grid, self.start_pos, self.goal_pos, HEURISTICS['manhattan'])),
-                    ("A* (Euclidiana)", lambda: astar(self.maze_grid, self.start_pos, self.goal_pos, HEURISTICS['euclidean'])),
-                    ("A* (Chebyshev)", lambda: astar(self.maze_grid, self.start_pos, self.goal_pos, HEURISTICS['chebyshev'])),
-                ]
-                
-                for algo_name, algo_func in algorithms:
-                    if self.stop_event.is_set():
-                        break
-                    
-                    result = algo_func()
-                    self.all_results[algo_name] = result
-                    
-                    # Mostrar progresso
-                    self.root.after(0, lambda name=algo_name: self._update_comparison_progress(name))
-                
-                if not self.stop_event.is_set():
-                    self.comparison_mode = True
-                    self.root.after(0, self._update_legend)
-                    self.root.after(0, self._draw_comparison)
-                    self.root.after(0, self._display_comparison_results)
-                    self.root.after(0, lambda: self.export_button.config(state=tk.NORMAL))
-                
+                blocks, specs = share_grids({COMPARISON_KEY: self.maze_grid})
+                comparison['blocks'] = blocks
+                # multiprocessing.Pool (e não ProcessPoolExecutor) porque terminate()
+                # encerra os processos no meio de uma busca quando o usuário interrompe.
+                pool = multiprocessing.Pool(min(len(misses), os.cpu_count() or 2),
+                                            initializer=attach_grids, initargs=(specs,))
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Erro", f"Erro na comparação: {str(e)}"))
-            finally:
-                self.is_solving = False
-                self.root.after(0, lambda: self.solve_button.config(state=tk.NORMAL))
-                self.root.after(0, lambda: self.compare_button.config(state=tk.NORMAL))
-                self.root.after(0, lambda: self.stop_button.config(state=tk.DISABLED))
-        
-        thread = threading.Thread(target=run_comparison, daemon=True)
-        thread.start()
+                release_grids(comparison['blocks'])
+                self._finish_comparison()
+                messagebox.showerror("Erro", f"Erro na comparação: {str(e)}")
+                return
+            comparison['pool'] = pool
+            comparison['pending'] = len(misses)
+            queue_put = self.comparison_queue.put
+            for algo_name, algorithm, heuristic in misses:
+                pool.apply_async(_compare_worker, (algo_name, algorithm, heuristic, self.start_pos, self.goal_pos),
+                                 callback=queue_put,
+                                 error_callback=lambda e, name=algo_name: queue_put((name, e)))
+        
+        self.comparison = comparison
+        self._poll_comparison()
+    
+    def _poll_comparison(self):
+        """
+        Recolhe (no thread do Tk, via root.after) os resultados que os processos
+        já terminaram; encerra o pool ao fim ou quando o usuário interrompe.
+        """
+        comparison = self.comparison
+        if self.stop_event.is_set():
+            self._close_comparison_pool(terminate=True)
+            self._finish_comparison()
+            return
+        
+        error = None
+        while True:
+            try:
+                algo_name, result = self.comparison_queue.get_nowait()
+            except queue.Empty:
+                break
+            comparison['pending'] -= 1
+            if isinstance(result, BaseException):
+                error = error or result
+                continue
+            comparison['results'][algo_name] = result
+            self.result_cache.put(comparison['keys'][algo_name], result)
+            self._update_comparison_progress(algo_name)
+        
+        if error is not None:
+            self._close_comparison_pool(terminate=True)
+            self._finish_comparison()
+            messagebox.showerror("Erro", f"Erro na comparação: {str(error)}")
+            return
+        if comparison['pending'] > 0:
+            self.root.after(COMPARISON_POLL_MS, self._poll_comparison)
+            return
+        
+        self._close_comparison_pool(terminate=False)
+        # Mesma ordem da lista de algoritmos (cores e legenda), qualquer que seja a ordem de chegada
+        self.all_results = {name: comparison['results'][name] for name in comparison['order']}
+        self.comparison_mode = True
+        self._update_legend()
+        self._draw_comparison()
+        self._display_comparison_results()
+        self.export_button.config(state=tk.NORMAL)
+        self._finish_comparison()
+    
+    def _close_comparison_pool(self, terminate):
+        """Encerra o pool da comparação (terminate mata buscas em andamento) e libera a memória compartilhada."""
+        comparison = self.comparison
+        pool = comparison['pool']
+        if pool is not None:
+            if terminate:
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
+            comparison['pool'] = None
+        release_grids(comparison['blocks'])
+        comparison['blocks'] = []
+        # Descarta respostas que chegaram depois da interrupção
+        while not self.comparison_queue.empty():
+            self.comparison_queue.get_nowait()
+    
+    def _finish_comparison(self):
+        self.is_solving = False
+        self.solve_button.config(state=tk.NORMAL)
+        self.compare_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
     
     def _update_comparison_progress(self, algo_name):
         """Atualiza o texto de progresso durante a comparação."""
@@ -950,9 +1193,14 @@ class MazeGUI:
             canvas_width = 800
             canvas_height = 800
         
+        if max(rows, cols) > CELL_CANVAS_LIMIT:
+            self._draw_comparison_pixels(canvas_width, canvas_height)
+            return
+        
         self.cell_size = min(canvas_width // cols, canvas_height // rows, 50)
         
-        self.canvas.delete("all")
+        self._clear_canvas()  # Desenho próprio (células divididas); o modo normal recria os itens
+        self.cells = self.cell_canvas
         
         # Criar um dicionário para mapear células aos algoritmos que as visitam
         cell_algorithms = {}  # (row, col) -> [list of algorithm indices]
@@ -1011,6 +1259,24 @@ class MazeGUI:
         
         self._update_stats()
     
+    def _draw_comparison_pixels(self, canvas_width, canvas_height):
+        """Comparação no modo de pixels: cada célula de caminho com a cor do primeiro algoritmo que passa por ela."""
+        grid = self.maze_grid
+        cols = grid.cols
+        cells = self._select_renderer(grid.rows, cols, canvas_width, canvas_height)
+        kinds = bytearray(grid.cells)
+        for algo_idx, result in enumerate(self.all_results.values()):
+            if result.found and result.path:
+                kind = FIRST_EXTRA + algo_idx % len(self.ALGORITHM_COLORS)
+                for r, c in result.path:
+                    if kinds[r * cols + c] == EMPTY:
+                        kinds[r * cols + c] = kind
+        marks = self._mark_endpoints(kinds, cols)
+        cells.paint(kinds)
+        cells.flush()
+        cells.labels(marks)
+        self._update_stats()
+    
     def _draw_divided_cell(self, x1, y1, x2, y2, algo_indices):
         """Divide uma célula entre múltiplos algoritmos."""
         num_algos = len(algo_indices)
@@ -1107,6 +1373,8 @@ class MazeGUI:
             best_nodes = min(successful_results.items(), key=lambda x: x[1].nodes_visited)
             text += f"🎯 Menos Nós: {best_nodes[0]} ({best_nodes[1].nodes_visited} nós)\n"
         
+        text += f"\n♻ Cache: {self.result_cache.summary()}\n"
+        
         self.results_text.insert(tk.END, text)
         self.results_text.config(state=tk.DISABLED)
     
@@ -1149,7 +1417,8 @@ class MazeGUI:
                             algo_map = {
                                 "Guloso": "Greedy",
                                 "A*": "A*",
-                                "A-Estrela": "A*"
+                                "A-Estrela": "A*",
+                                "A* Bidirecional": "BiA*"
                             }
                             heuristic_map = {
                                 "manhattan": "manhattan",
@@ -1160,7 +1429,7 @@ class MazeGUI:
                             algorithm = algo_map.get(algorithm, algorithm)
                             heuristic = heuristic_map.get(heuristic, heuristic)
                         else:
-                            algorithm = algo_name
+                            algorithm = {"BFS Bidirecional": "BiBFS"}.get(algo_name, algo_name)
                             heuristic = "-"
                         
                         # Path length é o tamanho do caminho (depth + 1 para BFS/DFS)
@@ -1194,6 +1463,50 @@ class MazeGUI:
                 
             except Exception as e:
                 messagebox.showerror("Erro", f"Erro ao exportar resultados: {str(e)}")
+    
+    def _save_maze_file(self):
+        """Salva o labirinto atual no formato binário .maze."""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".maze",
+            filetypes=[("Labirinto", "*.maze"), ("All files", "*.*")],
+            initialfile="labirinto.maze"
+        )
+        if not filename:
+            return
+        
+        maze = self.maze_grid.copy()
+        maze.start = self.start_pos
+        maze.goal = self.goal_pos
+        try:
+            save_maze(filename, maze)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Erro ao salvar labirinto: {str(e)}")
+    
+    def _open_maze_file(self):
+        """Abre um labirinto .maze (mapeado em memória; edições não alteram o arquivo)."""
+        if self.is_solving:
+            messagebox.showwarning("Aviso", "Aguarde o término da resolução atual.")
+            return
+        
+        filename = filedialog.askopenfilename(
+            filetypes=[("Labirinto", "*.maze"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        try:
+            grid = load_maze(filename, mode='c')
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Erro", f"Erro ao abrir labirinto: {str(e)}")
+            return
+        
+        self.maze_grid = grid
+        self.start_pos = grid.start if grid.start is not None else (0, 0)
+        self.goal_pos = grid.goal if grid.goal is not None else (grid.rows - 1, grid.cols - 1)
+        self.current_result = None
+        self.trace_visited = set()
+        self._draw_maze()
+        self._clear_results()
 
 
 def main():
@@ -1,92 +1,258 @@
 # run_experiments.py
-# Executa experimentos comparativos com DFS, BFS, Greedy Search e A* (com 3 heurísticas) nos labirintos.
+# Executa experimentos comparativos com DFS, BFS, Greedy Search e A* (com 3 heurísticas) nos labirintos,
+# incluindo as versões bidirecionais de BFS e A* e o Jump Point Search.
+import argparse
 import csv
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from maze import MAZES, MAZE_DESCRIPTIONS, get_start_and_goal
+from maze_generator import generate_corpus
 from search.dfs import dfs
 from search.bfs import bfs
 from search.greedy_search_optimized import greedy_search
 from search.astar import astar
+from search.bidirectional import bidirectional_bfs, bidirectional_astar
+from search.jps import jps
 from search.heuristics import HEURISTICS
+from search.landmarks import alt_heuristic
+from utils.adjacency import neighbor_index
+from utils.components import component_index
+from utils.grid import Grid, MazeLike, as_grid
+from utils.instrument import SearchObserver, with_observer
+from utils.limits import STOP_CANCELLED, STOP_TIMEOUT, SearchBudget
+from utils.mazefile import load_maze
+from utils.result_cache import ResultCache, grid_fingerprint, query_key
+from utils.shared_grids import attach_grids, release_grids, share_grids, worker_grid
 
 
-def run_experiment_on_maze(maze_id: int, allow_diagonal: bool = False) -> List[Dict[str, Any]]:
+CSV_COLUMNS = (
+    'maze_id', 'algorithm', 'heuristic', 'path_found', 'time_s', 'nodes_visited', 'nodes_generated',
+    'max_frontier_size', 'path_cost', 'path_length', 'memory_bytes', 'stop_reason',
+    'pushes', 'pops', 'stale_pops', 'reopened', 'neighbor_checks', 'heuristic_calls', 'heuristic_time_s',
+    'alt_reduction_pct',
+)
+ALT_BASELINE = 'manhattan'  # Linha do A* contra a qual alt_reduction_pct mede o ALT
+
+
+def experiment_matrix() -> List[Tuple[str, str]]:
+    """Pares (algoritmo, heurística) na ordem em que aparecem no CSV."""
+    specs = [('DFS', '-'), ('BFS', '-'), ('BiBFS', '-')]
+    for algorithm in ('Greedy', 'A*', 'BiA*', 'JPS'):
+        specs.extend((algorithm, heur_name) for heur_name in HEURISTICS)
+        if algorithm == 'A*':
+            specs.append(('A*', 'alt'))  # Marcos (landmarks), ver search/landmarks.py
+    return specs
+
+
+def prepare_grid(maze: MazeLike, allow_diagonal: bool = False) -> Grid:
+    """
+    Grid do labirinto com o índice de vizinhos e o de componentes já em cache.
+
+    As buscas consultam os dois índices; montá-los aqui, uma vez por
+    labirinto, tira esse O(células) do tempo medido (uma lista de listas
+    viraria um Grid novo, sem cache, a cada algoritmo).
+    """
+    grid = as_grid(maze)
+    neighbor_index(grid, allow_diagonal)
+    component_index(grid, allow_diagonal)
+    return grid
+
+
+def run_single_experiment(maze_id: int, maze: MazeLike, algorithm: str, heuristic: str,
+                          allow_diagonal: bool = False,
+                          budget: Optional[SearchBudget] = None,
+                          instrument: bool = False) -> Dict[str, Any]:
     """
-    Executa DFS, BFS, Greedy Search e A* (com 3 heurísticas) em um labirinto específico.
+    Executa um algoritmo em um labirinto e monta a linha do CSV.
     
     Args:
-        maze_id: ID do labirinto (1-9)
-        allow_diagonal: permite movimentos diagonais
+        maze_id: ID do labirinto
+        maze: labirinto (lista de listas ou Grid com início e objetivo)
+        algorithm: 'DFS', 'BFS', 'BiBFS', 'Greedy', 'A*', 'BiA*' ou 'JPS'
+        heuristic: nome em HEURISTICS, 'alt' (marcos), ou '-' para buscas não informadas
+        allow_diagonal: permite movimentos diagonais (A*, BiA*, JPS)
+        budget: prazo e teto de expansões da busca; se atingidos, a linha sai
+            com path_found=False e stop_reason ('timeout', 'max_expansions')
+        instrument: mede também vizinhos examinados e a heurística (chamadas e
+            tempo) com um observador; o custo da medição entra em time_s
     
     Returns:
-        lista de dicionários com resultados de cada algoritmo
+        dicionário com as métricas do algoritmo
     """
-    maze = MAZES[maze_id]
     start, goal = get_start_and_goal(maze)
-    results = []
+    if heuristic == 'alt':
+        # Pré-processamento (marcos e suas BFS) fica fora do tempo medido da busca.
+        heur_func = alt_heuristic(maze, allow_diagonal=allow_diagonal)
+    else:
+        heur_func = HEURISTICS.get(heuristic)
+    observer = SearchObserver() if instrument else None
+    limits = budget.start() if budget is not None else None  # O prazo conta a partir daqui
     
-    # DFS
-    result_dfs = dfs(maze, start, goal)
-    results.append({
-        'maze_id': maze_id,
-        'algorithm': 'DFS',
-        'heuristic': '-',
-        'path_found': result_dfs.found,
-        'time_s': result_dfs.time,
-        'nodes_visited': result_dfs.nodes_visited,
-        'nodes_generated': '-',
-        'max_frontier_size': '-',
-        'path_cost': '-',
-        'path_length': result_dfs.depth if result_dfs.found else None
-    })
-    
-    # BFS
-    result_bfs = bfs(maze, start, goal)
-    results.append({
+    if algorithm == 'DFS':
+        result = with_observer(dfs, observer)(maze, start, goal, limits=limits)
+    elif algorithm == 'BFS':
+        result = with_observer(bfs, observer)(maze, start, goal, limits=limits)
+    elif algorithm == 'BiBFS':
+        result = with_observer(bidirectional_bfs, observer)(maze, start, goal, limits=limits)
+    elif algorithm == 'Greedy':
+        result = with_observer(greedy_search, observer)(maze, start, goal, heur_func, limits=limits)
+    elif algorithm == 'A*':
+        result = with_observer(astar, observer)(maze, start, goal, heur_func, allow_diagonal, limits=limits)
+    elif algorithm == 'BiA*':
+        result = with_observer(bidirectional_astar, observer)(maze, start, goal, heur_func, allow_diagonal,
+                                                              limits=limits)
+    elif algorithm == 'JPS':
+        result = with_observer(jps, observer)(maze, start, goal, heur_func, allow_diagonal, limits=limits)
+    else:
+        raise ValueError(f"Algoritmo desconhecido: {algorithm!r}")
+    
+    # Buscas não informadas (e a BFS bidirecional) não reportam custo.
+    uninformed = algorithm in ('DFS', 'BFS')
+    stats = result.stats
+    return {
         'maze_id': maze_id,
-        'algorithm': 'BFS',
-        'heuristic': '-',
-        'path_found': result_bfs.found,
-        'time_s': result_bfs.time,
-        'nodes_visited': result_bfs.nodes_visited,
-        'nodes_generated': '-',
-        'max_frontier_size': '-',
-        'path_cost': '-',
-        'path_length': result_bfs.depth if result_bfs.found else None
-    })
-    
-    # Greedy Search com cada heurística
-    for heur_name, heur_func in HEURISTICS.items():
-        result_greedy = greedy_search(maze, start, goal, heur_func)
-        results.append({
-            'maze_id': maze_id,
-            'algorithm': 'Greedy',
-            'heuristic': heur_name,
-            'path_found': result_greedy.found,
-            'time_s': result_greedy.time,
-            'nodes_visited': result_greedy.nodes_visited,
-            'nodes_generated': result_greedy.nodes_generated,
-            'max_frontier_size': result_greedy.max_frontier_size,
-            'path_cost': result_greedy.path_cost,
-            'path_length': result_greedy.depth if result_greedy.found else None
-        })
-    
-    # A* com cada heurística
-    for heur_name, heur_func in HEURISTICS.items():
-        result_astar = astar(maze, start, goal, heur_func, allow_diagonal)
-        results.append({
-            'maze_id': maze_id,
-            'algorithm': 'A*',
-            'heuristic': heur_name,
-            'path_found': result_astar.found,
-            'time_s': result_astar.time,
-            'nodes_visited': result_astar.nodes_visited,
-            'nodes_generated': result_astar.nodes_generated,
-            'max_frontier_size': result_astar.max_frontier_size,
-            'path_cost': result_astar.path_cost,
-            'path_length': result_astar.depth if result_astar.found else None
-        })
+        'algorithm': algorithm,
+        'heuristic': heuristic,
+        'path_found': result.found,
+        'time_s': result.time,
+        'nodes_visited': result.nodes_visited,
+        'nodes_generated': result.nodes_generated,
+        'max_frontier_size': result.max_frontier_size,
+        'path_cost': '-' if uninformed or algorithm == 'BiBFS' else result.path_cost,
+        'path_length': result.depth if result.found else None,
+        'memory_bytes': result.memory_bytes,
+        'stop_reason': result.stop_reason,
+        'pushes': stats.pushes,
+        'pops': stats.pops,
+        'stale_pops': stats.stale_pops,
+        'reopened': stats.reopened,
+        'neighbor_checks': stats.neighbor_checks,
+        'heuristic_calls': stats.heuristic_calls,
+        'heuristic_time_s': stats.heuristic_time
+    }
+
+
+def _cache_key(fingerprint: str, maze: MazeLike, algorithm: str, heuristic: str,
+               allow_diagonal: bool, budget: Optional[SearchBudget], instrument: bool = False):
+    """Chave da linha no cache; o teto de expansões e a instrumentação mudam a linha, então entram na chave."""
+    start, goal = get_start_and_goal(maze)
+    if budget is not None and budget.max_expansions is not None:
+        algorithm = f"{algorithm}/max{budget.max_expansions}"
+    if instrument:
+        algorithm = f"{algorithm}/instrument"
+    return query_key(fingerprint, start, goal, algorithm, heuristic, allow_diagonal)
+
+
+def _cacheable(row: Dict[str, Any]) -> bool:
+    """Linhas interrompidas por prazo ou cancelamento dependem da máquina e da carga: não vão para o cache."""
+    return row.get('stop_reason') not in (STOP_TIMEOUT, STOP_CANCELLED)
+
+
+def run_cached_experiment(cache: Optional[ResultCache], fingerprint: str, maze_id: int, maze: MazeLike,
+                          algorithm: str, heuristic: str, allow_diagonal: bool = False,
+                          budget: Optional[SearchBudget] = None, instrument: bool = False) -> Dict[str, Any]:
+    """
+    run_single_experiment servido do cache quando o mesmo labirinto (pela
+    impressão digital) já rodou com os mesmos parâmetros.
+
+    A linha guardada é a da primeira execução, inclusive o tempo medido;
+    só o maze_id é trocado pelo atual.
+    """
+    if cache is None:
+        return run_single_experiment(maze_id, maze, algorithm, heuristic, allow_diagonal, budget, instrument)
+    key = _cache_key(fingerprint, maze, algorithm, heuristic, allow_diagonal, budget, instrument)
+    found, row = cache.lookup(key)
+    if not found:
+        row = run_single_experiment(maze_id, maze, algorithm, heuristic, allow_diagonal, budget, instrument)
+        if _cacheable(row):
+            cache.put(key, row)
+    return dict(row, maze_id=maze_id)
+
+
+def run_experiment_on_maze(maze_id: int, allow_diagonal: bool = False,
+                           maze: Optional[MazeLike] = None,
+                           cache: Optional[ResultCache] = None,
+                           budget: Optional[SearchBudget] = None,
+                           instrument: bool = False) -> List[Dict[str, Any]]:
+    """
+    Executa DFS, BFS, Greedy Search, A* (com 3 heurísticas), as versões
+    bidirecionais de BFS e A* e o JPS em um labirinto específico.
+    
+    Args:
+        maze_id: ID do labirinto (1-9)
+        allow_diagonal: permite movimentos diagonais
+        maze: labirinto a usar no lugar de MAZES[maze_id]
+        cache: cache de resultados (None = sempre executa)
+        budget: prazo e teto de expansões de cada busca (None = sem limites)
+        instrument: mede vizinhos examinados e a heurística (ver run_single_experiment)
+    
+    Returns:
+        lista de dicionários com resultados de cada algoritmo
+    """
+    if maze is None:
+        maze = MAZES[maze_id]
+    maze = prepare_grid(maze, allow_diagonal)
+    fingerprint = grid_fingerprint(maze) if cache is not None else ''
+    return [run_cached_experiment(cache, fingerprint, maze_id, maze, algorithm, heuristic, allow_diagonal,
+                                  budget, instrument)
+            for algorithm, heuristic in experiment_matrix()]
+
+
+# --- Execução paralela -------------------------------------------------------
+# Cada labirinto é copiado uma única vez para memória compartilhada
+# (utils/shared_grids.py); os processos do pool montam um Grid direto sobre
+# esse buffer (sem pickle do grid) e reaproveitam os índices em cache.
+
+def _run_task(task: Tuple[int, str, str, bool, Optional[SearchBudget], bool]) -> Dict[str, Any]:
+    maze_id, algorithm, heuristic, allow_diagonal, budget, instrument = task
+    return run_single_experiment(maze_id, prepare_grid(worker_grid(maze_id), allow_diagonal), algorithm, heuristic, allow_diagonal,
+                                 budget, instrument)
+
+
+def run_parallel_experiments(mazes: Dict[int, MazeLike], allow_diagonal: bool = False,
+                             workers: int = 2, cache: Optional[ResultCache] = None,
+                             budget: Optional[SearchBudget] = None,
+                             instrument: bool = False) -> List[Dict[str, Any]]:
+    """
+    Distribui a matriz labirinto × algoritmo × heurística em um pool de processos.
     
+    Os resultados voltam na mesma ordem da execução serial, então o CSV é
+    idêntico (exceto pelos tempos). Com cache, o processo principal consulta
+    o cache antes e só as faltas vão para o pool.
+    """
+    tasks = [(maze_id, algorithm, heuristic, allow_diagonal, budget, instrument)
+             for maze_id in mazes
+             for algorithm, heuristic in experiment_matrix()]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(tasks)
+    keys: List[Any] = [None] * len(tasks)
+    pending = list(range(len(tasks)))
+    if cache is not None:
+        fingerprints = {maze_id: grid_fingerprint(maze) for maze_id, maze in mazes.items()}
+        pending = []
+        for i, (maze_id, algorithm, heuristic, _, _, _) in enumerate(tasks):
+            keys[i] = _cache_key(fingerprints[maze_id], mazes[maze_id], algorithm, heuristic,
+                                 allow_diagonal, budget, instrument)
+            found, row = cache.lookup(keys[i])
+            if found:
+                results[i] = dict(row, maze_id=maze_id)
+            else:
+                pending.append(i)
+    if not pending:
+        return results
+
+    pending_mazes = {tasks[i][0]: mazes[tasks[i][0]] for i in pending}
+    blocks, specs = share_grids(pending_mazes)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=attach_grids,
+                                 initargs=(specs,)) as executor:
+            chunksize = max(1, len(pending) // (workers * 4))
+            computed = executor.map(_run_task, [tasks[i] for i in pending], chunksize=chunksize)
+            for i, row in zip(pending, computed):
+                results[i] = row
+                if cache is not None and _cacheable(row):
+                    cache.put(keys[i], row)
+    finally:
+        release_grids(blocks)
     return results
 
 
@@ -102,7 +268,9 @@ def save_results_to_csv(results: List[Dict[str, Any]], filename: str = 'results/
         print("Nenhum resultado para salvar.")
         return
     
-    fieldnames = results[0].keys()
+    # Colunas fixas; uma linha sem alguma delas a deixa vazia em vez de quebrar a escrita.
+    extra = [key for key in dict.fromkeys(key for r in results for key in r) if key not in CSV_COLUMNS]
+    fieldnames = list(CSV_COLUMNS) + extra
     
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -119,7 +287,7 @@ def print_results_table(results: List[Dict[str, Any]]):
     
     print("\n" + "="*120)
     print(f"{'Algoritmo':<10} {'Heurística':<12} {'Tempo (s)':<12} {'Nós Visit.':<12} "
-          f"{'Nós Ger.':<12} {'Front. Max':<12} {'Custo':<10} {'Caminho':<10}")
+          f"{'Nós Ger.':<12} {'Front. Max':<12} {'Custo':<10} {'Caminho':<10} {'Memória (B)':<12}")
     print("="*120)
     
     for r in results:
@@ -130,49 +298,177 @@ def print_results_table(results: List[Dict[str, Any]]):
               f"{str(r['nodes_generated']):<12} "
               f"{str(r['max_frontier_size']):<12} "
               f"{str(r['path_cost']):<10} "
-              f"{str(r['path_length']):<10}")
+              f"{str(r['path_length']):<10} "
+              f"{str(r['memory_bytes']):<12}")
     
     print("="*120 + "\n")
 
 
-def run_all_experiments(allow_diagonal: bool = False) -> List[Dict[str, Any]]:
+def print_heap_savings(results: List[Dict[str, Any]]):
+    """Compara as inserções no heap (nodes_generated) do JPS com as do A*."""
+    astar_pushes = {r['heuristic']: r['nodes_generated'] for r in results
+                    if r['algorithm'] == 'A*' and not r.get('stop_reason')}
+    for r in results:
+        if r['algorithm'] != 'JPS' or r.get('stop_reason') or not astar_pushes.get(r['heuristic']):
+            continue
+        base = astar_pushes[r['heuristic']]
+        reduction = 100 * (1 - r['nodes_generated'] / base)
+        print(f"JPS ({r['heuristic']}): {r['nodes_generated']} inserções no heap "
+              f"vs {base} do A* ({reduction:.1f}% a menos)")
+
+
+def print_alt_savings(results: List[Dict[str, Any]]):
+    """Compara os nós expandidos do A* com marcos (ALT) com os das heurísticas geométricas."""
+    alt = next((r for r in results if r['algorithm'] == 'A*' and r['heuristic'] == 'alt'), None)
+    if alt is None or alt.get('stop_reason'):
+        return
+    for r in results:
+        if r['algorithm'] != 'A*' or r['heuristic'] == 'alt' or r.get('stop_reason') or not r['nodes_visited']:
+            continue
+        reduction = 100 * (1 - alt['nodes_visited'] / r['nodes_visited'])
+        print(f"A* (alt): {alt['nodes_visited']} nós expandidos vs {r['nodes_visited']} "
+              f"com {r['heuristic']} ({reduction:.1f}% a menos)")
+
+
+def add_alt_reduction(results: List[Dict[str, Any]], baseline: str = ALT_BASELINE):
+    """
+    Preenche alt_reduction_pct: redução % dos nós expandidos do A* (alt) sobre o A* (baseline) do mesmo labirinto.
+
+    As demais linhas (e as interrompidas, sem base de comparação) recebem '-'.
+    """
+    base = {r['maze_id']: r['nodes_visited'] for r in results
+            if r['algorithm'] == 'A*' and r['heuristic'] == baseline and not r.get('stop_reason')}
+    for r in results:
+        reduction = '-'
+        if r['algorithm'] == 'A*' and r['heuristic'] == 'alt' and not r.get('stop_reason') \
+                and base.get(r['maze_id']):
+            reduction = round(100 * (1 - r['nodes_visited'] / base[r['maze_id']]), 1)
+        r['alt_reduction_pct'] = reduction
+
+
+def print_counters(results: List[Dict[str, Any]]):
+    """Contadores do laço (SearchStats); vizinhos e heurística só aparecem com --instrument."""
+    print(f"{'Algoritmo':<10} {'Heurística':<12} {'Pushes':<10} {'Pops':<10} {'Descart.':<10} "
+          f"{'Reabertos':<10} {'Vizinhos':<12} {'h() cham.':<12} {'h() (ms)':<10}")
+    for r in results:
+        h_time = r.get('heuristic_time_s')
+        print(f"{r['algorithm']:<10} "
+              f"{str(r['heuristic']):<12} "
+              f"{str(r.get('pushes', '-')):<10} "
+              f"{str(r.get('pops', '-')):<10} "
+              f"{str(r.get('stale_pops', '-')):<10} "
+              f"{str(r.get('reopened', '-')):<10} "
+              f"{str(r.get('neighbor_checks') or '-'):<12} "
+              f"{str(r.get('heuristic_calls') or '-'):<12} "
+              f"{f'{h_time * 1000:.3f}' if h_time is not None else '-':<10}")
+    print()
+
+
+def print_stopped(results: List[Dict[str, Any]]):
+    """Lista as buscas interrompidas por prazo ou teto de expansões."""
+    for r in results:
+        if r.get('stop_reason'):
+            print(f"{r['algorithm']} ({r['heuristic']}): interrompido ({r.get('stop_reason')}) "
+                  f"após {r['nodes_visited']} expansões e {r['time_s']:.3f}s")
+
+
+def run_all_experiments(allow_diagonal: bool = False, workers: int = 1,
+                        mazes: Optional[Dict[int, MazeLike]] = None,
+                        cache: Optional[ResultCache] = None,
+                        budget: Optional[SearchBudget] = None,
+                        instrument: bool = False) -> List[Dict[str, Any]]:
     """
     Executa experimentos em todos os labirintos.
     
     Args:
         allow_diagonal: permite movimentos diagonais
+        workers: número de processos; com mais de 1 usa run_parallel_experiments
+        mazes: labirintos por ID (padrão: MAZES)
+        cache: cache de resultados (None = sempre executa)
+        budget: prazo e teto de expansões de cada busca (None = sem limites)
+        instrument: mede vizinhos examinados e a heurística (ver run_single_experiment)
     
     Returns:
-        lista com todos os resultados consolidados
+        lista com todos os resultados consolidados, com alt_reduction_pct (ver add_alt_reduction)
     """
-    all_results = []
+    if mazes is None:
+        mazes = MAZES
     
-    for maze_id in MAZES.keys():
-        print(f"Executando experimentos no Labirinto {maze_id}...")
-        results = run_experiment_on_maze(maze_id, allow_diagonal)
-        all_results.extend(results)
+    if workers > 1:
+        print(f"Executando {len(mazes)} labirintos em {workers} processos...")
+        all_results = run_parallel_experiments(mazes, allow_diagonal, workers, cache, budget, instrument)
+    else:
+        all_results = []
+        for maze_id, maze in mazes.items():
+            print(f"Executando experimentos no Labirinto {maze_id}...")
+            results = run_experiment_on_maze(maze_id, allow_diagonal, maze, cache, budget, instrument)
+            all_results.extend(results)
     
+    add_alt_reduction(all_results)
     return all_results
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Experimentos comparativos dos algoritmos de busca.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processos para distribuir os experimentos (padrão: 1, serial)")
+    parser.add_argument('--random', type=int, default=0, metavar='N',
+                        help="usa N labirintos gerados em vez dos 9 padrão")
+    parser.add_argument('--size', type=int, default=100, help="lado dos labirintos gerados (padrão: 100)")
+    parser.add_argument('--density', type=float, default=0.25, help="densidade de paredes (padrão: 0.25)")
+    parser.add_argument('--seed', type=int, default=0, help="semente base dos labirintos gerados")
+    parser.add_argument('--files', nargs='+', metavar='ARQ',
+                        help="usa labirintos de arquivos .maze (abertos via mmap)")
+    parser.add_argument('--cache-dir', metavar='DIR',
+                        help="guarda os resultados também em disco; execuções seguintes reaproveitam")
+    parser.add_argument('--no-cache', action='store_true', help="desliga o cache de resultados")
+    parser.add_argument('--timeout', type=float, metavar='SEG',
+                        help="prazo por busca; ao estourar a linha sai com stop_reason=timeout")
+    parser.add_argument('--max-expansions', type=int, metavar='N',
+                        help="teto de nós expandidos por busca (stop_reason=max_expansions)")
+    parser.add_argument('--instrument', action='store_true',
+                        help="mede também vizinhos examinados e chamadas/tempo da heurística (custo entra em time_s)")
+    args = parser.parse_args()
+    cache = None if args.no_cache else ResultCache(directory=args.cache_dir)
+    budget = None
+    if args.timeout is not None or args.max_expansions is not None:
+        budget = SearchBudget(args.timeout, args.max_expansions)
+    
+    if args.files:
+        mazes = {maze_id: load_maze(path) for maze_id, path in enumerate(args.files, 1)}
+        descriptions = {maze_id: f"{path} ({mazes[maze_id].rows}x{mazes[maze_id].cols})"
+                        for maze_id, path in enumerate(args.files, 1)}
+    elif args.random > 0:
+        mazes = generate_corpus(args.random, args.size, args.density, args.seed)
+        descriptions = {maze_id: f"Aleatório {args.size}x{args.size}, densidade {args.density:.0%}, "
+                                 f"semente {args.seed + maze_id}" for maze_id in mazes}
+    else:
+        mazes, descriptions = MAZES, MAZE_DESCRIPTIONS
+    
     print("="*120)
-    print("EXPERIMENTOS COMPARATIVOS: DFS, BFS, Greedy Search e A* (Manhattan, Euclidean, Chebyshev)")
+    print("EXPERIMENTOS COMPARATIVOS: DFS, BFS, Greedy Search, A* (Manhattan, Euclidean, Chebyshev) e bidirecionais")
     print("="*120)
     
     # Executa em todos os labirintos
     print("\n>>> Experimentos com movimentos em 4 direções (sem diagonais)\n")
-    all_results = run_all_experiments(allow_diagonal=False)
+    all_results = run_all_experiments(allow_diagonal=False, workers=args.workers, mazes=mazes, cache=cache,
+                                      budget=budget, instrument=args.instrument)
+    if cache is not None:
+        print(f"Cache de resultados: {cache.summary()}")
     
     # Salva CSV consolidado
     save_results_to_csv(all_results, 'results/all_algorithms_comparison.csv')
     
     # Mostra estatísticas por labirinto
-    for maze_id in MAZES.keys():
+    for maze_id in mazes.keys():
         maze_results = [r for r in all_results if r['maze_id'] == maze_id]
         print(f"\n{'='*120}")
-        print(f"LABIRINTO {maze_id}: {MAZE_DESCRIPTIONS[maze_id]}")
+        print(f"LABIRINTO {maze_id}: {descriptions[maze_id]}")
         print(f"{'='*120}")
         print_results_table(maze_results)
+        print_counters(maze_results)
+        print_heap_savings(maze_results)
+        print_alt_savings(maze_results)
+        print_stopped(maze_results)
     
     print("\n✅ Experimentos concluídos! Resultados salvos em 'results/all_algorithms_comparison.csv'")
@@ -2,34 +2,20 @@
 # Implementação do A* (f = g + h) para labirintos.
 import heapq
 import time
-from typing import Callable, Dict, List, Tuple, Optional, Set, Union
+from typing import Callable, List, Tuple, Optional, Sequence, Union
 
-from utils.search import SearchResult
+from utils.adjacency import neighbor_index
+from utils.components import component_index, disconnected_result
+from utils.grid import MazeLike, as_grid
+from utils.instrument import observed
+from utils.limits import SearchLimits, first_check, stop_before_start
+from utils.search import SearchResult, SearchStats, frontier_nbytes, path_from_parents
+from utils.trace import EXPAND, GENERATE, TraceCallback
+from utils.workspace import SearchWorkspace
 
 Pos = Tuple[int,int]
 Cell = Union[str, int]
 
-class Node:
-    """Nó da árvore de busca com posição, custo g, f e referência ao pai."""
-    def __init__(self, pos: Pos, g: float, f: float, parent: Optional['Node']):
-        self.pos = pos
-        self.g = g      # custo do caminho até aqui
-        self.f = f      # f = g + h (estimativa total)
-        self.parent = parent
-
-    def __lt__(self, other):
-        return self.f < other.f
-
-def reconstruct_path(node: Node) -> List[Pos]:
-    """Reconstrói o caminho do início até o nó final."""
-    path = []
-    cur = node
-    while cur:
-        path.append(cur.pos)
-        cur = cur.parent
-    path.reverse()
-    return path
-
 def neighbors_4(pos: Pos):
     """Retorna vizinhos nas 4 direções (cima, baixo, esquerda, direita)."""
     x,y = pos
@@ -41,63 +27,96 @@ def neighbors_8(pos: Pos):
     return [(x+1,y),(x-1,y),(x,y+1),(x,y-1),
             (x+1,y+1),(x+1,y-1),(x-1,y+1),(x-1,y-1)]
 
-def astar(maze: List[List[Cell]],
+@observed('astar')
+def astar(maze: MazeLike,
           start: Pos,
           goal: Pos,
-          heuristic: Callable[[Pos,Pos], float],
+          heuristic: Optional[Callable[[Pos,Pos], float]],
           allow_diagonal: bool = False,
-          diag_cost: float = 1.41421356237) -> SearchResult:
+          diag_cost: float = 1.41421356237,
+          workspace: Optional[SearchWorkspace] = None,
+          h_table: Optional[Sequence[float]] = None,
+          trace: Optional[TraceCallback] = None,
+          limits: Optional[SearchLimits] = None) -> SearchResult:
     """
     Algoritmo A* completo para busca em labirinto.
     
     Args:
-        maze: matriz 2D onde 0/'S'/'G'=livre, 1=parede
+        maze: Grid ou matriz 2D onde 0/'S'/'G'=livre, 1=parede
         start, goal: posições (linha, coluna)
         heuristic: função h(pos, goal) -> float
         allow_diagonal: permite movimentos diagonais
         diag_cost: custo do movimento diagonal (padrão √2)
+        workspace: buffers reaproveitados entre consultas no mesmo grid
+            (padrão: o workspace do próprio grid, um por thread)
+        h_table: h pré-calculado por id de célula (ver heuristic_table); quando
+            dado, substitui as chamadas a heuristic
+        trace: callback(tipo, id) para os eventos EXPAND/GENERATE (ver utils/trace.py)
+        limits: prazo, teto de expansões e cancelamento (ver utils/limits.py); ao
+            atingir um deles devolve resultado parcial com stop_reason
     
     Returns:
-        SearchResult com caminho, profundidade, nós visitados, tempo e métricas adicionais
+        SearchResult com caminho, profundidade, nós visitados, tempo e métricas
+        adicionais; stats conta também as remoções descartadas (stale_pops)
     """
+    grid = as_grid(maze)
+    index = neighbor_index(grid, allow_diagonal)  # Vizinhos pré-computados (CSR)
+    components = component_index(grid, allow_diagonal)  # Regiões conexas, para descartar objetivos inalcançáveis
+    offsets, targets = index.offsets, index.targets
+    cols = grid.cols
+    start_id = start[0]*cols + start[1]
+    goal_id = goal[0]*cols + goal[1]
+    if h_table is not None and len(h_table) != grid.rows * cols:
+        raise ValueError(f"h_table com {len(h_table)} valores não corresponde ao grid {grid.rows}x{cols}.")
+
+    # g e pai vivem em arrays do workspace; seen[id] == epoch indica que
+    # g[id] e parent[id] são desta busca.
+    ws = SearchWorkspace.for_grid(grid, workspace)
+    epoch = ws.begin()
+    seen, came_g, parent, closed = ws.seen, ws.g, ws.parent, ws.closed
     t0 = time.perf_counter()
-    rows = len(maze)
-    cols = len(maze[0]) if rows>0 else 0
-
-    def is_walkable(pos: Pos) -> bool:
-        """Verifica se a posição é válida e caminhável."""
-        if not (0 <= pos[0] < rows and 0 <= pos[1] < cols):
-            return False
-        return maze[pos[0]][pos[1]] != 1
-    
-    neigh_func = neighbors_8 if allow_diagonal else neighbors_4
-
-    open_heap: List[Tuple[float,int,Node]] = []
-    entry_count = 0
-    start_node = Node(start, 0.0, heuristic(start,goal), None)
-    heapq.heappush(open_heap, (start_node.f, entry_count, start_node))
-    entry_count += 1
-
-    came_g: Dict[Pos,float] = {start: 0.0}
-    closed: Set[Pos] = set()
+    if not components.connected(start_id, goal_id):
+        return disconnected_result(t0, informed=True)
+
+    # Heap: (f, contador, id da célula, g)
+    h_start = h_table[start_id] if h_table is not None else heuristic(start, goal)
+    open_heap: List[Tuple[float,int,int,float]] = [(h_start, 0, start_id, 0.0)]
+    sample_entry = open_heap[0]  # Para estimar os bytes da fronteira
+    entry_count = 1
+    seen[start_id] = epoch
+    came_g[start_id] = 0.0
+    if trace is not None:
+        trace(GENERATE, start_id)
 
     nodes_expanded = 0
     nodes_generated = 1
     max_frontier = 1
+    stale_pops = 0
+    reopened = 0
+    check_at = first_check(limits)
+    reason = stop_before_start(limits)
+    if reason is not None:
+        return limits.stopped(t0, reason, 0, nodes_generated=1, max_frontier_size=1,
+                              memory_bytes=ws.nbytes + frontier_nbytes(1, sample_entry),
+                              stats=SearchStats(pushes=1, pops=0, stale_pops=0, reopened=0))
 
     while open_heap:
         max_frontier = max(max_frontier, len(open_heap))
-        _, _, current = heapq.heappop(open_heap)
+        _, _, current, g = heapq.heappop(open_heap)
 
         # Ignora nós com g desatualizado (caminho melhor já encontrado).
-        if came_g.get(current.pos, float('inf')) < current.g:
+        if came_g[current] < g:
+            stale_pops += 1
             continue
 
+        closed[current] = epoch
         nodes_expanded += 1
+        if trace is not None:
+            trace(EXPAND, current)
 
-        if current.pos == goal:
+        if current == goal_id:
             t1 = time.perf_counter()
-            path = reconstruct_path(current)
+            path = path_from_parents(parent, start_id, goal_id, cols)
             return SearchResult(
                 found=True,
                 path=path,
@@ -106,29 +125,55 @@ def astar(maze: List[List[Cell]],
                 time=t1 - t0,
                 nodes_generated=nodes_generated,
                 max_frontier_size=max_frontier,
-                path_cost=current.g
+                path_cost=g,
+                memory_bytes=ws.nbytes + frontier_nbytes(max_frontier, sample_entry),
+                stats=SearchStats(pushes=nodes_generated, pops=nodes_expanded + stale_pops,
+                                  stale_pops=stale_pops, reopened=reopened)
             )
 
-        closed.add(current.pos)
-
-        for nb in neigh_func(current.pos):
-            if not is_walkable(nb):
-                continue
-
+        if nodes_expanded == check_at:  # Prazo, teto de expansões ou cancelamento
+            reason = limits.check(nodes_expanded)
+            if reason is not None:
+                return limits.stopped(
+                    t0, reason, nodes_expanded,
+                    nodes_generated=nodes_generated,
+                    max_frontier_size=max_frontier,
+                    memory_bytes=ws.nbytes + frontier_nbytes(max_frontier, sample_entry),
+                    stats=SearchStats(pushes=nodes_generated, pops=nodes_expanded + stale_pops,
+                                      stale_pops=stale_pops, reopened=reopened)
+                )
+            check_at = limits.next_check(nodes_expanded)
+
+        r, c = divmod(current, cols)
+
+        for nb in targets[offsets[current]:offsets[current + 1]]:
             # Custo do movimento: diagonal vs reto.
-            step_cost = (diag_cost if (nb[0]!=current.pos[0] and nb[1]!=current.pos[1]) else 1.0)
-            tentative_g = current.g + step_cost
-
-            if nb in closed and tentative_g >= came_g.get(nb, float('inf')):
-                continue
-
-            if tentative_g < came_g.get(nb, float('inf')):
-                came_g[nb] = tentative_g
-                f = tentative_g + heuristic(nb, goal)
-                child = Node(nb, tentative_g, f, current)
-                heapq.heappush(open_heap, (f, entry_count, child))
-                entry_count += 1
-                nodes_generated += 1
+            if allow_diagonal:
+                nb_r, nb_c = divmod(nb, cols)
+                step_cost = (diag_cost if (nb_r!=r and nb_c!=c) else 1.0)
+            else:
+                step_cost = 1.0
+            tentative_g = g + step_cost
+
+            # Só reabre/insere se o caminho até nb for melhor que o conhecido.
+            if seen[nb] == epoch:
+                if tentative_g >= came_g[nb]:
+                    continue
+                if closed[nb] == epoch:  # Já expandido: volta para a fronteira
+                    reopened += 1
+
+            seen[nb] = epoch
+            came_g[nb] = tentative_g
+            parent[nb] = current
+            if h_table is not None:
+                f = tentative_g + h_table[nb]
+            else:
+                f = tentative_g + heuristic(divmod(nb, cols), goal)
+            heapq.heappush(open_heap, (f, entry_count, nb, tentative_g))
+            entry_count += 1
+            nodes_generated += 1
+            if trace is not None:
+                trace(GENERATE, nb)
 
     # Sem solução.
     t1 = time.perf_counter()
@@ -140,5 +185,8 @@ def astar(maze: List[List[Cell]],
         time=t1 - t0,
         nodes_generated=nodes_generated,
         max_frontier_size=max_frontier,
-        path_cost=None
+        path_cost=None,
+        memory_bytes=ws.nbytes + frontier_nbytes(max_frontier, sample_entry),
+        stats=SearchStats(pushes=nodes_generated, pops=nodes_expanded + stale_pops,
+                          stale_pops=stale_pops, reopened=reopened)
     )
@@ -2,30 +2,82 @@
 # BFS (Breadth-First Search) - busca em largura usando fila.
 from collections import deque
 import time
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
-from utils.search import SearchResult, get_neighbors, reconstruct_path
+from utils.adjacency import neighbor_index
+from utils.components import component_index, disconnected_result
+from utils.grid import MazeLike, as_grid
+from utils.instrument import observed
+from utils.limits import SearchLimits, first_check, stop_before_start
+from utils.search import SearchResult, SearchStats, path_from_parents
+from utils.trace import EXPAND, GENERATE, TraceCallback
+from utils.workspace import SearchWorkspace
 
 Position = Tuple[int, int]
 Cell = Union[str, int]
 
 
-def bfs(maze: List[List[Cell]], start: Position, goal: Position) -> SearchResult:
-    """Busca em largura. Explora nível por nível, garante caminho mais curto."""
-    queue = deque([start])  # Fila FIFO para processar nós
-    visited = set([start])  # Marca nós já visitados
-    parent: dict[Position, Position] = {}  # Rastreia caminho
-    nodes_visited = 0
+@observed('bfs')
+def bfs(maze: MazeLike, start: Position, goal: Position, engine: str = 'queue',
+        workspace: Optional[SearchWorkspace] = None,
+        trace: Optional[TraceCallback] = None,
+        limits: Optional[SearchLimits] = None) -> SearchResult:
+    """
+    Busca em largura. Explora nível por nível, garante caminho mais curto.
 
-    t0 = time.time()
+    engine='queue' usa a fila clássica; engine='wavefront' expande cada nível
+    inteiro de uma vez com numpy (ver search/wavefront.py). Um workspace
+    reaproveita os buffers entre consultas no mesmo grid (ver search/solver.py).
+    trace recebe os eventos da busca (ver utils/trace.py); só no motor 'queue'.
+    limits interrompe a busca por prazo, expansões ou cancelamento (ver utils/limits.py).
+    """
+    if engine == 'wavefront':
+        if trace is not None:
+            raise ValueError("O motor 'wavefront' não emite rastro; use engine='queue'.")
+        from search.wavefront import bfs_wavefront
+        return bfs_wavefront(maze, start, goal, limits=limits)
+    if engine != 'queue':
+        raise ValueError(f"Motor de BFS desconhecido: {engine!r} (use 'queue' ou 'wavefront').")
+
+    grid = as_grid(maze)  # Paredes em buffer plano
+    index = neighbor_index(grid)  # Vizinhos pré-computados (CSR)
+    components = component_index(grid)  # Regiões conexas, para descartar objetivos inalcançáveis
+    offsets, targets = index.offsets, index.targets
+    cols = grid.cols
+    start_id = start[0] * cols + start[1]
+    goal_id = goal[0] * cols + goal[1]
+
+    ws = SearchWorkspace.for_grid(grid, workspace)
+    epoch = ws.begin()
+    visited = ws.seen  # Marca nós já visitados (visited[id] == epoch)
+    parent = ws.parent  # Rastreia caminho
+    queue = deque([start_id])  # Fila FIFO para processar nós
+    visited[start_id] = epoch
+    nodes_visited = 0  # Cada nó entra na fila uma vez: gerados = visitados + len(queue)
+    max_frontier = 1
+
+    t0 = time.perf_counter()
+    if not components.connected(start_id, goal_id):
+        return disconnected_result(t0)
+    if trace is not None:
+        trace(GENERATE, start_id)
+    check_at = first_check(limits)
+    reason = stop_before_start(limits)
+    if reason is not None:
+        return limits.stopped(t0, reason, 0, nodes_generated=1, max_frontier_size=1,
+                              memory_bytes=ws.visit_nbytes, stats=SearchStats(pushes=1, pops=0))
 
     while queue:
+        if len(queue) > max_frontier:
+            max_frontier = len(queue)
         current = queue.popleft()  # Remove do início da fila
         nodes_visited += 1
+        if trace is not None:
+            trace(EXPAND, current)
 
-        if current == goal:  # Encontrou o objetivo
-            t1 = time.time()
-            path = reconstruct_path(parent, start, goal)
+        if current == goal_id:  # Encontrou o objetivo
+            t1 = time.perf_counter()
+            path = path_from_parents(parent, start_id, goal_id, cols)
             depth = len(path) - 1
             return SearchResult(
                 found=True,
@@ -33,20 +85,42 @@ def bfs(maze: List[List[Cell]], start: Position, goal: Position) -> SearchResult
                 depth=depth,
                 nodes_visited=nodes_visited,
                 time=t1 - t0,
+                nodes_generated=nodes_visited + len(queue),
+                max_frontier_size=max_frontier,
+                memory_bytes=ws.visit_nbytes,
+                stats=SearchStats(pushes=nodes_visited + len(queue), pops=nodes_visited),
             )
 
+        if nodes_visited == check_at:  # Prazo, teto de expansões ou cancelamento
+            reason = limits.check(nodes_visited)
+            if reason is not None:
+                return limits.stopped(
+                    t0, reason, nodes_visited,
+                    nodes_generated=nodes_visited + len(queue),
+                    max_frontier_size=max_frontier,
+                    memory_bytes=ws.visit_nbytes,
+                    stats=SearchStats(pushes=nodes_visited + len(queue), pops=nodes_visited)
+                )
+            check_at = limits.next_check(nodes_visited)
+
         # Explora vizinhos não visitados
-        for neighbor in get_neighbors(current, maze):
-            if neighbor not in visited:
-                visited.add(neighbor)
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if visited[neighbor] != epoch:
+                visited[neighbor] = epoch
                 parent[neighbor] = current
                 queue.append(neighbor)  # Adiciona no fim da fila
+                if trace is not None:
+                    trace(GENERATE, neighbor)
 
-    t1 = time.time()
+    t1 = time.perf_counter()
     return SearchResult(
         found=False,
         path=[],
         depth=None,
         nodes_visited=nodes_visited,
         time=t1 - t0,
+        nodes_generated=nodes_visited + len(queue),
+        max_frontier_size=max_frontier,
+        memory_bytes=ws.visit_nbytes,
+        stats=SearchStats(pushes=nodes_visited + len(queue), pops=nodes_visited),
     )
@@ -0,0 +1,316 @@
+# bidirectional.py
+# Buscas bidirecionais: BFS e A* partindo do início e do objetivo ao mesmo tempo.
+import heapq
+import time
+from array import array
+from typing import Callable, Dict, Optional, Tuple
+
+from utils.adjacency import neighbor_index
+from utils.components import component_index, disconnected_result
+from utils.grid import MazeLike, as_grid
+from utils.instrument import observed
+from utils.limits import SearchLimits, first_check, stop_before_start
+from utils.search import PathView, SearchResult, SearchStats, frontier_nbytes, structures_nbytes
+from utils.trace import EXPAND, GENERATE, TraceCallback
+
+Position = Tuple[int, int]
+
+
+def _join_paths(parent_f: Dict[int, int], parent_b: Dict[int, int],
+                start_id: int, goal_id: int, meet: int, cols: int) -> PathView:
+    """Une o caminho início→meet (árvore direta) com meet→objetivo (árvore reversa)."""
+    forward = array('i', [meet])
+    cell = meet
+    while cell != start_id:
+        cell = parent_f[cell]
+        forward.append(cell)
+    forward.reverse()
+    cell = meet
+    while cell != goal_id:
+        cell = parent_b[cell]
+        forward.append(cell)
+    return PathView(forward, cols)
+
+
+@observed('bibfs')
+def bidirectional_bfs(maze: MazeLike, start: Position, goal: Position,
+                      trace: Optional[TraceCallback] = None,
+                      limits: Optional[SearchLimits] = None) -> SearchResult:
+    """
+    BFS bidirecional. Expande, alternadamente, um nível inteiro da menor fronteira.
+
+    Ao encontrar a outra árvore o nível atual é terminado e fica o menor
+    encontro, o que mantém o caminho mais curto. trace recebe os eventos
+    dos dois lados, sem distinguir de qual árvore vieram; limits é verificado
+    a cada expansão, inclusive no meio de um nível (ver utils/limits.py).
+    """
+    grid = as_grid(maze)
+    index = neighbor_index(grid)
+    components = component_index(grid)
+    offsets, targets = index.offsets, index.targets
+    cols = grid.cols
+    start_id = start[0] * cols + start[1]
+    goal_id = goal[0] * cols + goal[1]
+
+    t0 = time.perf_counter()
+
+    reason = stop_before_start(limits)
+    if reason is not None:
+        generated = 1 if start_id == goal_id else 2
+        return limits.stopped(t0, reason, 0, nodes_generated=generated, max_frontier_size=generated,
+                              stats=SearchStats(pushes=generated, pops=0))
+    if start_id == goal_id:
+        return SearchResult(found=True, path=PathView(array('i', [start_id]), cols), depth=0,
+                            nodes_visited=1, time=time.perf_counter() - t0,
+                            stats=SearchStats(pushes=1, pops=1))
+    if not components.connected(start_id, goal_id):
+        return disconnected_result(t0)
+
+    # dist e pai de cada lado; as fronteiras guardam um nível completo
+    dist_f: Dict[int, int] = {start_id: 0}
+    dist_b: Dict[int, int] = {goal_id: 0}
+    parent_f: Dict[int, int] = {}
+    parent_b: Dict[int, int] = {}
+    frontier_f = [start_id]
+    frontier_b = [goal_id]
+    nodes_visited = 0
+    max_frontier = 2
+    best = None  # (comprimento, célula de encontro)
+    if trace is not None:
+        trace(GENERATE, start_id)
+        trace(GENERATE, goal_id)
+    check_at = first_check(limits)
+
+    while frontier_f and frontier_b:
+        # Expande o lado com menos nós no nível atual.
+        if len(frontier_f) <= len(frontier_b):
+            frontier, dist, parent, other = frontier_f, dist_f, parent_f, dist_b
+        else:
+            frontier, dist, parent, other = frontier_b, dist_b, parent_b, dist_f
+
+        next_level = []
+        for current in frontier:
+            nodes_visited += 1
+            if trace is not None:
+                trace(EXPAND, current)
+            if nodes_visited == check_at:  # Prazo, teto de expansões ou cancelamento
+                reason = limits.check(nodes_visited)
+                if reason is not None:
+                    return limits.stopped(
+                        t0, reason, nodes_visited,
+                        nodes_generated=len(dist_f) + len(dist_b),
+                        max_frontier_size=max_frontier,
+                        memory_bytes=(structures_nbytes(dist_f, dist_b, parent_f, parent_b)
+                                      + frontier_nbytes(max_frontier, start_id)),
+                        stats=SearchStats(pushes=len(dist_f) + len(dist_b), pops=nodes_visited),
+                    )
+                check_at = limits.next_check(nodes_visited)
+            d = dist[current] + 1
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if neighbor in dist:
+                    continue
+                dist[neighbor] = d
+                parent[neighbor] = current
+                next_level.append(neighbor)
+                if trace is not None:
+                    trace(GENERATE, neighbor)
+                if neighbor in other:
+                    length = d + other[neighbor]
+                    if best is None or length < best[0]:
+                        best = (length, neighbor)
+
+        if frontier is frontier_f:
+            frontier_f = next_level
+        else:
+            frontier_b = next_level
+        max_frontier = max(max_frontier, len(frontier_f) + len(frontier_b))
+
+        if best is not None:
+            path = _join_paths(parent_f, parent_b, start_id, goal_id, best[1], cols)
+            t1 = time.perf_counter()
+            return SearchResult(
+                found=True,
+                path=path,
+                depth=len(path) - 1,
+                nodes_visited=nodes_visited,
+                time=t1 - t0,
+                nodes_generated=len(dist_f) + len(dist_b),
+                max_frontier_size=max_frontier,
+                memory_bytes=(structures_nbytes(dist_f, dist_b, parent_f, parent_b)
+                              + frontier_nbytes(max_frontier, start_id)),
+                stats=SearchStats(pushes=len(dist_f) + len(dist_b), pops=nodes_visited),
+            )
+
+    t1 = time.perf_counter()
+    return SearchResult(
+        found=False,
+        path=[],
+        depth=None,
+        nodes_visited=nodes_visited,
+        time=t1 - t0,
+        nodes_generated=len(dist_f) + len(dist_b),
+        max_frontier_size=max_frontier,
+        memory_bytes=(structures_nbytes(dist_f, dist_b, parent_f, parent_b)
+                      + frontier_nbytes(max_frontier, start_id)),
+        stats=SearchStats(pushes=len(dist_f) + len(dist_b), pops=nodes_visited),
+    )
+
+
+@observed('biastar')
+def bidirectional_astar(maze: MazeLike,
+                        start: Position,
+                        goal: Position,
+                        heuristic: Callable[[Position, Position], float],
+                        allow_diagonal: bool = False,
+                        diag_cost: float = 1.41421356237,
+                        trace: Optional[TraceCallback] = None,
+                        limits: Optional[SearchLimits] = None) -> SearchResult:
+    """
+    A* bidirecional: uma busca guiada por h(n, objetivo) a partir do início e
+    outra guiada por h(n, início) a partir do objetivo.
+
+    Mantém mu, o custo do melhor caminho que já liga as duas árvores, e para
+    quando o menor f de um dos lados é >= mu; com heurística consistente
+    nenhum caminho ainda não visto pode ser mais barato, então o caminho é ótimo.
+
+    Args:
+        maze: Grid ou matriz 2D onde 0/'S'/'G'=livre, 1=parede
+        start, goal: posições (linha, coluna)
+        heuristic: função h(pos, alvo) -> float
+        allow_diagonal: permite movimentos diagonais
+        diag_cost: custo do movimento diagonal (padrão √2)
+        trace: callback(tipo, id) para os eventos dos dois lados (ver utils/trace.py)
+        limits: prazo, teto de expansões e cancelamento (ver utils/limits.py)
+    """
+    grid = as_grid(maze)
+    index = neighbor_index(grid, allow_diagonal)
+    components = component_index(grid, allow_diagonal)
+    offsets, targets = index.offsets, index.targets
+    cols = grid.cols
+    start_id = start[0] * cols + start[1]
+    goal_id = goal[0] * cols + goal[1]
+    t0 = time.perf_counter()
+    if not components.connected(start_id, goal_id):
+        return disconnected_result(t0)
+
+    # Índice 0 = busca direta (alvo: goal); 1 = busca reversa (alvo: start).
+    aims = (goal, start)
+    g_cost: Tuple[Dict[int, float], Dict[int, float]] = ({start_id: 0.0}, {goal_id: 0.0})
+    parents: Tuple[Dict[int, int], Dict[int, int]] = ({}, {})
+    closed = (bytearray(grid.rows * cols), bytearray(grid.rows * cols))
+    heaps: Tuple[list, list] = ([(heuristic(start, goal), 0, start_id, 0.0)],
+                                [(heuristic(goal, start), 1, goal_id, 0.0)])
+    sample_entry = heaps[0][0]  # Para estimar os bytes da fronteira
+    entry_count = 2
+    nodes_expanded = 0
+    nodes_generated = 2
+    max_frontier = 2
+    stale_pops = 0
+    reopened = 0
+
+    mu = 0.0 if start_id == goal_id else float('inf')
+    meet = start_id if start_id == goal_id else -1
+    if trace is not None:
+        trace(GENERATE, start_id)
+        trace(GENERATE, goal_id)
+    check_at = first_check(limits)
+    reason = stop_before_start(limits)
+    if reason is not None:
+        return limits.stopped(t0, reason, 0, nodes_generated=nodes_generated, max_frontier_size=max_frontier,
+                              memory_bytes=(structures_nbytes(*g_cost, *parents, *closed)
+                                            + frontier_nbytes(max_frontier, sample_entry)),
+                              stats=SearchStats(pushes=nodes_generated, pops=0, stale_pops=0, reopened=0))
+
+    while heaps[0] and heaps[1]:
+        # Descarta entradas desatualizadas do topo antes de olhar o menor f.
+        for side in (0, 1):
+            heap, g = heaps[side], g_cost[side]
+            while heap and g.get(heap[0][2], float('inf')) < heap[0][3]:
+                heapq.heappop(heap)
+                stale_pops += 1
+        if not heaps[0] or not heaps[1]:
+            break
+        if max(heaps[0][0][0], heaps[1][0][0]) >= mu:
+            break
+
+        max_frontier = max(max_frontier, len(heaps[0]) + len(heaps[1]))
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        heap, g, parent, aim = heaps[side], g_cost[side], parents[side], aims[side]
+        other_g = g_cost[1 - side]
+        _, _, current, current_g = heapq.heappop(heap)
+        nodes_expanded += 1
+        if trace is not None:
+            trace(EXPAND, current)
+        closed[side][current] = 1
+        if nodes_expanded == check_at:  # Prazo, teto de expansões ou cancelamento
+            reason = limits.check(nodes_expanded)
+            if reason is not None:
+                return limits.stopped(
+                    t0, reason, nodes_expanded,
+                    nodes_generated=nodes_generated,
+                    max_frontier_size=max_frontier,
+                    memory_bytes=(structures_nbytes(*g_cost, *parents, *closed)
+                                  + frontier_nbytes(max_frontier, sample_entry)),
+                    stats=SearchStats(pushes=nodes_generated, pops=nodes_expanded + stale_pops,
+                                      stale_pops=stale_pops, reopened=reopened)
+                )
+            check_at = limits.next_check(nodes_expanded)
+        r, c = divmod(current, cols)
+
+        for nb in targets[offsets[current]:offsets[current + 1]]:
+            nb_pos = divmod(nb, cols)
+            step_cost = diag_cost if (nb_pos[0] != r and nb_pos[1] != c) else 1.0
+            tentative_g = current_g + step_cost
+
+            if closed[side][nb] and tentative_g >= g.get(nb, float('inf')):
+                continue
+
+            if tentative_g < g.get(nb, float('inf')):
+                if closed[side][nb]:
+                    reopened += 1
+                g[nb] = tentative_g
+                parent[nb] = current
+                f = tentative_g + heuristic(nb_pos, aim)
+                heapq.heappush(heap, (f, entry_count, nb, tentative_g))
+                entry_count += 1
+                nodes_generated += 1
+                if trace is not None:
+                    trace(GENERATE, nb)
+
+                # Liga as duas árvores se o vizinho já foi alcançado pelo outro lado.
+                if nb in other_g and tentative_g + other_g[nb] < mu:
+                    mu = tentative_g + other_g[nb]
+                    meet = nb
+
+    t1 = time.perf_counter()
+    memory_bytes = (structures_nbytes(*g_cost, *parents, *closed)
+                    + frontier_nbytes(max_frontier, sample_entry))
+    stats = SearchStats(pushes=nodes_generated, pops=nodes_expanded + stale_pops,
+                        stale_pops=stale_pops, reopened=reopened)
+    if meet < 0:
+        return SearchResult(
+            found=False,
+            path=[],
+            depth=None,
+            nodes_visited=nodes_expanded,
+            time=t1 - t0,
+            nodes_generated=nodes_generated,
+            max_frontier_size=max_frontier,
+            path_cost=None,
+            memory_bytes=memory_bytes,
+            stats=stats
+        )
+
+    path = _join_paths(parents[0], parents[1], start_id, goal_id, meet, cols)
+    return SearchResult(
+        found=True,
+        path=path,
+        depth=len(path) - 1,
+        nodes_visited=nodes_expanded,
+        time=t1 - t0,
+        nodes_generated=nodes_generated,
+        max_frontier_size=max_frontier,
+        path_cost=mu,
+        memory_bytes=memory_bytes,
+        stats=stats
+    )
@@ -1,30 +1,72 @@
 # dfs.py
 # DFS (Depth-First Search) - busca em profundidade usando pilha.
 import time
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
-from utils.search import SearchResult, get_neighbors, reconstruct_path
+from utils.adjacency import neighbor_index
+from utils.components import component_index, disconnected_result
+from utils.grid import MazeLike, as_grid
+from utils.instrument import observed
+from utils.limits import SearchLimits, first_check, stop_before_start
+from utils.search import SearchResult, SearchStats, path_from_parents
+from utils.trace import EXPAND, GENERATE, TraceCallback
+from utils.workspace import SearchWorkspace
 
 Position = Tuple[int, int]
 Cell = Union[str, int]
 
 
-def dfs(maze: List[List[Cell]], start: Position, goal: Position) -> SearchResult:
-    """Busca em profundidade. Explora o mais fundo possível antes de retroceder."""
-    stack = [start]  # Pilha LIFO para processar nós
-    visited = set([start])  # Marca nós já visitados
-    parent: dict[Position, Position] = {}  # Rastreia caminho
-    nodes_visited = 0
+@observed('dfs')
+def dfs(maze: MazeLike, start: Position, goal: Position,
+        workspace: Optional[SearchWorkspace] = None,
+        trace: Optional[TraceCallback] = None,
+        limits: Optional[SearchLimits] = None) -> SearchResult:
+    """
+    Busca em profundidade. Explora o mais fundo possível antes de retroceder.
 
-    t0 = time.time()
+    Um workspace reaproveita os buffers entre consultas no mesmo grid;
+    trace recebe os eventos da busca (ver utils/trace.py); limits interrompe a
+    busca por prazo, expansões ou cancelamento (ver utils/limits.py).
+    """
+    grid = as_grid(maze)  # Paredes em buffer plano
+    index = neighbor_index(grid)  # Vizinhos pré-computados (CSR)
+    components = component_index(grid)  # Regiões conexas, para descartar objetivos inalcançáveis
+    offsets, targets = index.offsets, index.targets
+    cols = grid.cols
+    start_id = start[0] * cols + start[1]
+    goal_id = goal[0] * cols + goal[1]
+
+    ws = SearchWorkspace.for_grid(grid, workspace)
+    epoch = ws.begin()
+    visited = ws.seen  # Marca nós já visitados (visited[id] == epoch)
+    parent = ws.parent  # Rastreia caminho
+    stack = [start_id]  # Pilha LIFO para processar nós
+    visited[start_id] = epoch
+    nodes_visited = 0  # Cada nó entra na pilha uma vez: gerados = visitados + len(stack)
+    max_frontier = 1
+
+    t0 = time.perf_counter()
+    if not components.connected(start_id, goal_id):
+        return disconnected_result(t0)
+    if trace is not None:
+        trace(GENERATE, start_id)
+    check_at = first_check(limits)
+    reason = stop_before_start(limits)
+    if reason is not None:
+        return limits.stopped(t0, reason, 0, nodes_generated=1, max_frontier_size=1,
+                              memory_bytes=ws.visit_nbytes, stats=SearchStats(pushes=1, pops=0))
 
     while stack:
+        if len(stack) > max_frontier:
+            max_frontier = len(stack)
         current = stack.pop()  # Remove do topo da pilha
         nodes_visited += 1
+        if trace is not None:
+            trace(EXPAND, current)
 
-        if current == goal:  # Encontrou o objetivo
-            t1 = time.time()
-            path = reconstruct_path(parent, start, goal)
+        if current == goal_id:  # Encontrou o objetivo
+            t1 = time.perf_counter()
+            path = path_from_parents(parent, start_id, goal_id, cols)
             depth = len(path) - 1
             return SearchResult(
                 found=True,
@@ -32,20 +74,42 @@ def dfs(maze: List[List[Cell]], start: Position, goal: Position) -> SearchResult
                 depth=depth,
                 nodes_visited=nodes_visited,
                 time=t1 - t0,
+                nodes_generated=nodes_visited + len(stack),
+                max_frontier_size=max_frontier,
+                memory_bytes=ws.visit_nbytes,
+                stats=SearchStats(pushes=nodes_visited + len(stack), pops=nodes_visited),
             )
 
+        if nodes_visited == check_at:  # Prazo, teto de expansões ou cancelamento
+            reason = limits.check(nodes_visited)
+            if reason is not None:
+                return limits.stopped(
+                    t0, reason, nodes_visited,
+                    nodes_generated=nodes_visited + len(stack),
+                    max_frontier_size=max_frontier,
+                    memory_bytes=ws.visit_nbytes,
+                    stats=SearchStats(pushes=nodes_visited + len(stack), pops=nodes_visited)
+                )
+            check_at = limits.next_check(nodes_visited)
+
         # Explora vizinhos não visitados
-        for neighbor in get_neighbors(current, maze):
-            if neighbor not in visited:
-                visited.add(neighbor)
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if visited[neighbor] != epoch:
+                visited[neighbor] = epoch
                 parent[neighbor] = current
                 stack.append(neighbor)  # Adiciona no topo da pilha
+                if trace is not None:
+                    trace(GENERATE, neighbor)
 
-    t1 = time.time()
+    t1 = time.perf_counter()
     return SearchResult(
         found=False,
         path=[],
         depth=None,
         nodes_visited=nodes_visited,
         time=t1 - t0,
+        nodes_generated=nodes_visited + len(stack),
+        max_frontier_size=max_frontier,
+        memory_bytes=ws.visit_nbytes,
+        stats=SearchStats(pushes=nodes_visited + len(stack), pops=nodes_visited),
     )
@@ -0,0 +1,298 @@
+# distance_map.py
+# Mapas de distância por objetivo ("Dijkstra maps"): uma busca reversa serve qualquer início.
+import heapq
+import time
+from array import array
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from search.wavefront import flood, np
+from utils.adjacency import DIAGONAL_MOVES, STRAIGHT_MOVES, neighbor_index
+from utils.grid import Grid, MazeLike, as_grid
+from utils.limits import NO_CHECK, SearchLimits
+from utils.search import PathView, SearchResult
+
+Position = Tuple[int, int]
+
+UNREACHED = -1   # Distância de células que não alcançam o objetivo
+NO_HOP = 0       # Próximo passo do objetivo e de células sem caminho
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_DIAG_COST = 1.41421356237
+
+MapKey = Tuple[Position, bool, Optional[float]]
+
+# Em wavefront, parent_dir = k + 1 é o movimento do pai até a célula; o
+# próximo passo em direção ao objetivo é o movimento oposto (STRAIGHT_MOVES
+# vem em pares cima/baixo, esquerda/direita, então o oposto de k é k ^ 1).
+_REVERSE_HOP = bytes([NO_HOP] + [(k ^ 1) + 1 for k in range(4)] + [NO_HOP] * 251)
+
+
+class DistanceMap:
+    """
+    Distância de cada célula até um objetivo fixo e o próximo passo rumo a ele.
+
+    dist é array('i') (int32) com o número de passos até o objetivo (-1 =
+    sem caminho); next_hop é um bytearray com k + 1, onde k é o índice em
+    moves do movimento que aproxima a célula do objetivo. Com diagonais a
+    árvore é a de custo mínimo (diagonal = diag_cost) e dist conta os passos
+    dela; o custo fica em path_cost do resultado.
+    """
+    __slots__ = ('rows', 'cols', 'goal', 'allow_diagonal', 'diag_cost', 'dist', 'next_hop')
+
+    def __init__(self, rows: int, cols: int, goal: Position, allow_diagonal: bool,
+                 diag_cost: float, dist: array, next_hop: bytearray):
+        self.rows = rows
+        self.cols = cols
+        self.goal = goal
+        self.allow_diagonal = allow_diagonal
+        self.diag_cost = diag_cost
+        self.dist = dist
+        self.next_hop = next_hop
+
+    @property
+    def moves(self):
+        return STRAIGHT_MOVES + DIAGONAL_MOVES if self.allow_diagonal else STRAIGHT_MOVES
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.dist) * self.dist.itemsize + len(self.next_hop)
+
+    def distance(self, start: Position) -> Optional[int]:
+        """Passos de start até o objetivo, ou None se não há caminho."""
+        d = self.dist[start[0] * self.cols + start[1]]
+        return None if d == UNREACHED else d
+
+    def path(self, start: Position) -> Optional[PathView]:
+        """Caminho de start até o objetivo seguindo next_hop, em O(comprimento do caminho)."""
+        cols = self.cols
+        cell = start[0] * cols + start[1]
+        steps = self.dist[cell]
+        if steps == UNREACHED:
+            return None
+        deltas = [dr * cols + dc for dr, dc in self.moves]
+        next_hop = self.next_hop
+        ids = array('i', [cell])
+        for _ in range(steps):
+            cell += deltas[next_hop[cell] - 1]
+            ids.append(cell)
+        return PathView(ids, cols)
+
+    def solve(self, start: Position) -> SearchResult:
+        """SearchResult para start; nodes_visited conta as células percorridas no mapa."""
+        t0 = time.perf_counter()
+        path = self.path(start)
+        if path is None:
+            return SearchResult(found=False, path=[], depth=None, nodes_visited=0,
+                                time=time.perf_counter() - t0, path_cost=None, memory_bytes=0)
+        depth = len(path) - 1
+        cost = float(depth)
+        if self.allow_diagonal:
+            diagonal_steps = sum(1 for (r1, c1), (r2, c2) in zip(path, path[1:]) if r1 != r2 and c1 != c2)
+            cost = depth + diagonal_steps * (self.diag_cost - 1.0)
+        return SearchResult(
+            found=True,
+            path=path,
+            depth=depth,
+            nodes_visited=len(path),
+            time=time.perf_counter() - t0,
+            path_cost=cost,
+            memory_bytes=path.nbytes
+        )
+
+
+def _reverse_bfs(grid: Grid, goal_id: int,
+                 limits: Optional[SearchLimits] = None) -> Tuple[array, bytearray, Optional[str], int]:
+    """BFS a partir do objetivo sobre o índice CSR (sem numpy); devolve também o motivo de parada e as expansões."""
+    index = neighbor_index(grid)
+    offsets, targets = index.offsets, index.targets
+    cols = grid.cols
+    n = grid.rows * cols
+    dist = array('i', [UNREACHED]) * n
+    next_hop = bytearray(n)
+    # Próximo passo de nb: o movimento (linha, coluna) de nb até a célula atual.
+    hop_of = {move: k + 1 for k, move in enumerate(STRAIGHT_MOVES)}
+    dist[goal_id] = 0
+    frontier = [goal_id]
+    level = 0
+    expanded = 0
+    check_at = 0 if limits is not None else NO_CHECK  # Verifica já antes da primeira expansão
+    while frontier:
+        level += 1
+        reached = []
+        for current in frontier:
+            if expanded == check_at:  # Prazo, teto de expansões ou cancelamento
+                reason = limits.check(expanded)
+                if reason is not None:
+                    return dist, next_hop, reason, expanded
+                check_at = limits.next_check(expanded)
+            expanded += 1
+            r, c = divmod(current, cols)
+            for nb in targets[offsets[current]:offsets[current + 1]]:
+                if dist[nb] == UNREACHED:
+                    nb_r, nb_c = divmod(nb, cols)
+                    dist[nb] = level
+                    next_hop[nb] = hop_of[(r - nb_r, c - nb_c)]
+                    reached.append(nb)
+        frontier = reached
+    return dist, next_hop, None, expanded
+
+
+def _reverse_dijkstra(grid: Grid, goal_id: int, diag_cost: float,
+                      limits: Optional[SearchLimits] = None) -> Tuple[array, bytearray, Optional[str], int]:
+    """Dijkstra a partir do objetivo com diagonais; dist conta os passos da árvore."""
+    index = neighbor_index(grid, True)
+    offsets, targets = index.offsets, index.targets
+    cols = grid.cols
+    n = grid.rows * cols
+    cost = array('d', [float('inf')]) * n
+    dist = array('i', [UNREACHED]) * n
+    next_hop = bytearray(n)
+    moves = STRAIGHT_MOVES + DIAGONAL_MOVES
+    hop_of = {move: k + 1 for k, move in enumerate(moves)}
+    cost[goal_id] = 0.0
+    dist[goal_id] = 0
+    heap = [(0.0, goal_id)]
+    expanded = 0
+    check_at = 0 if limits is not None else NO_CHECK  # Verifica já antes da primeira expansão
+    while heap:
+        d, current = heapq.heappop(heap)
+        if d > cost[current]:
+            continue
+        if expanded == check_at:  # Prazo, teto de expansões ou cancelamento
+            reason = limits.check(expanded)
+            if reason is not None:
+                return dist, next_hop, reason, expanded
+            check_at = limits.next_check(expanded)
+        expanded += 1
+        r, c = divmod(current, cols)
+        steps = dist[current] + 1
+        for nb in targets[offsets[current]:offsets[current + 1]]:
+            nb_r, nb_c = divmod(nb, cols)
+            nd = d + (diag_cost if (nb_r != r and nb_c != c) else 1.0)
+            if nd < cost[nb]:
+                cost[nb] = nd
+                dist[nb] = steps
+                next_hop[nb] = hop_of[(r - nb_r, c - nb_c)]
+                heapq.heappush(heap, (nd, nb))
+    return dist, next_hop, None, expanded
+
+
+def build_distance_map(maze: MazeLike, goal: Position, allow_diagonal: bool = False,
+                       diag_cost: float = DEFAULT_DIAG_COST) -> DistanceMap:
+    """
+    Uma busca reversa a partir de goal: BFS em 4 direções (a inundação
+    vetorizada de wavefront quando há numpy), Dijkstra com diagonais.
+    """
+    distance_map, _, _ = _build(as_grid(maze), goal, allow_diagonal, diag_cost)
+    return distance_map
+
+
+def _build(grid: Grid, goal: Position, allow_diagonal: bool, diag_cost: float,
+           limits: Optional[SearchLimits] = None) -> Tuple[Optional[DistanceMap], Optional[str], int]:
+    """build_distance_map() com limites: (mapa ou None se interrompido, motivo de parada, expansões)."""
+    if not grid.is_open(goal):
+        raise ValueError(f"Objetivo {goal} é parede ou está fora do labirinto.")
+    goal_id = goal[0] * grid.cols + goal[1]
+    if allow_diagonal:
+        dist, next_hop, reason, expanded = _reverse_dijkstra(grid, goal_id, diag_cost, limits)
+    elif np is not None:
+        dist_np, parent_dir, reason, expanded = flood(grid, goal, limits=limits)
+        dist = array('i')
+        dist.frombytes(dist_np.tobytes())
+        next_hop = bytearray(parent_dir.tobytes().translate(_REVERSE_HOP))
+    else:
+        dist, next_hop, reason, expanded = _reverse_bfs(grid, goal_id, limits)
+    if reason is not None:
+        return None, reason, expanded  # Mapa incompleto não serve para consultas nem para o cache
+    return DistanceMap(grid.rows, grid.cols, goal, allow_diagonal, diag_cost, dist, next_hop), None, expanded
+
+
+class DistanceMapCache:
+    """
+    Mapas de distância de um grid, por objetivo, com despejo LRU limitado em bytes.
+
+    Cada mapa ocupa 5 bytes por célula (dist int32 + next_hop); quando a soma
+    passa de max_bytes os mapas usados há mais tempo são descartados (o mais
+    recente fica sempre, mesmo sozinho acima do limite). A chave é
+    (objetivo, diagonais, diag_cost); sem diagonais o custo diagonal não
+    muda o mapa e fica fora da chave.
+
+    Exemplo:
+        maps = distance_maps(grid)
+        for start in inicios:
+            result = maps.solve(start, saida)  # Uma busca reversa para todos
+    """
+
+    def __init__(self, grid: Grid, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.grid = grid
+        self.max_bytes = max_bytes
+        self._maps: 'OrderedDict[MapKey, DistanceMap]' = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    @staticmethod
+    def _key(goal: Position, allow_diagonal: bool, diag_cost: float) -> MapKey:
+        return tuple(goal), allow_diagonal, diag_cost if allow_diagonal else None
+
+    def get(self, goal: Position, allow_diagonal: bool = False,
+            diag_cost: float = DEFAULT_DIAG_COST) -> DistanceMap:
+        """Mapa do objetivo, construído na primeira vez e depois servido do cache."""
+        key = self._key(goal, allow_diagonal, diag_cost)
+        distance_map = self._maps.get(key)
+        if distance_map is not None:
+            self._maps.move_to_end(key)
+            self.hits += 1
+            return distance_map
+        self.misses += 1
+        return self._store(key, build_distance_map(self.grid, goal, allow_diagonal, diag_cost))
+
+    def _store(self, key: MapKey, distance_map: DistanceMap) -> DistanceMap:
+        self._maps[key] = distance_map
+        self.nbytes += distance_map.nbytes
+        self._evict()
+        return distance_map
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and len(self._maps) > 1:
+            _, evicted = self._maps.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+    def solve(self, start: Position, goal: Position, allow_diagonal: bool = False,
+              limits: Optional[SearchLimits] = None,
+              diag_cost: float = DEFAULT_DIAG_COST) -> SearchResult:
+        """
+        Caminho de start até goal; o custo do mapa só é pago na primeira consulta ao objetivo.
+
+        limits vale para a construção do mapa: se ela for interrompida, o
+        resultado é parcial (stop_reason) e nada entra no cache. Com a
+        inundação numpy (4 direções) o limite é verificado por nível, como
+        em bfs_wavefront, e max_expansions pode ser ultrapassado no último.
+        """
+        key = self._key(goal, allow_diagonal, diag_cost)
+        if limits is None or key in self._maps:
+            return self.get(goal, allow_diagonal, diag_cost).solve(start)
+        t0 = time.perf_counter()
+        distance_map, reason, expanded = _build(self.grid, goal, allow_diagonal, diag_cost, limits)
+        if distance_map is None:
+            return limits.stopped(t0, reason, expanded)
+        self.misses += 1
+        return self._store(key, distance_map).solve(start)
+
+    def clear(self):
+        self._maps.clear()
+        self.nbytes = 0
+
+
+def distance_maps(grid: Grid, max_bytes: Optional[int] = None) -> DistanceMapCache:
+    """Cache de mapas do grid, descartado na próxima edição (como o índice de vizinhos)."""
+    maps = grid.cached(('distance_maps',), lambda g: DistanceMapCache(g))
+    if max_bytes is not None and max_bytes != maps.max_bytes:
+        maps.max_bytes = max_bytes
+        maps._evict()
+    return maps
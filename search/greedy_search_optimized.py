@@ -12,51 +12,96 @@ Características:
 
 import heapq
 import time
-from typing import Callable, List, Tuple, Union
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
-from utils.search import SearchResult, get_neighbors
+from utils.adjacency import neighbor_index
+from utils.components import component_index, disconnected_result
+from utils.grid import MazeLike, as_grid
+from utils.instrument import observed
+from utils.limits import SearchLimits, first_check, stop_before_start
+from utils.search import SearchResult, SearchStats, frontier_nbytes, path_from_parents
+from utils.trace import EXPAND, GENERATE, TraceCallback
+from utils.workspace import SearchWorkspace
 
 Position = Tuple[int, int]
 Cell = Union[str, int]
 
 
+@observed('greedy')
 def greedy_search(
-    maze: List[List[Cell]],
+    maze: MazeLike,
     start: Position,
     goal: Position,
-    heuristic: Callable[[Position, Position], float]
+    heuristic: Optional[Callable[[Position, Position], float]],
+    workspace: Optional[SearchWorkspace] = None,
+    h_table: Optional[Sequence[float]] = None,
+    trace: Optional[TraceCallback] = None,
+    limits: Optional[SearchLimits] = None
 ) -> SearchResult:
     """
     Busca Gulosa (Greedy Best-First Search).
     Expande sempre o nó com menor valor heurístico.
     
     Args:
-        maze: matriz 2D onde 0/'S'/'G'=livre, 1=parede
+        maze: Grid ou matriz 2D onde 0/'S'/'G'=livre, 1=parede
         start: posição inicial (linha, coluna)
         goal: posição objetivo (linha, coluna)
         heuristic: função h(pos, goal) -> float
+        workspace: buffers reaproveitados entre consultas no mesmo grid
+            (padrão: o workspace do próprio grid, um por thread)
+        h_table: h pré-calculado por id de célula (ver heuristic_table); quando
+            dado, substitui as chamadas a heuristic
+        trace: callback(tipo, id) para os eventos EXPAND/GENERATE (ver utils/trace.py)
+        limits: prazo, teto de expansões e cancelamento (ver utils/limits.py)
     
     Returns:
         SearchResult com caminho, profundidade, nós visitados e tempo
     """
+    grid = as_grid(maze)  # Paredes em buffer plano
+    index = neighbor_index(grid)  # Vizinhos pré-computados (CSR)
+    components = component_index(grid)  # Regiões conexas, para descartar objetivos inalcançáveis
+    offsets, targets = index.offsets, index.targets
+    cols = grid.cols
+    start_id = start[0] * cols + start[1]
+    goal_id = goal[0] * cols + goal[1]
+    if h_table is not None and len(h_table) != grid.rows * cols:
+        raise ValueError(f"h_table com {len(h_table)} valores não corresponde ao grid {grid.rows}x{cols}.")
+    ws = SearchWorkspace.for_grid(grid, workspace)
+    epoch = ws.begin()
+    visited = ws.seen  # visited[id] == epoch
+    parent = ws.parent  # O caminho sai dos pais, não de cópias guardadas no heap
     t0 = time.perf_counter()
+    if not components.connected(start_id, goal_id):
+        return disconnected_result(t0, informed=True)
     
-    # Heap: (h, contador, posição, caminho)
-    h_start = heuristic(start, goal)
-    frontier = [(h_start, 0, start, [start])]
-    visited = {start}
+    # Heap: (h, contador, id da célula)
+    h_start = h_table[start_id] if h_table is not None else heuristic(start, goal)
+    frontier = [(h_start, 0, start_id)]
+    sample_entry = frontier[0]  # Para estimar os bytes da fronteira
+    visited[start_id] = epoch
     counter = 1
     nodes_visited = 0
     max_frontier = 1
+    if trace is not None:
+        trace(GENERATE, start_id)
+    check_at = first_check(limits)
+    reason = stop_before_start(limits)
+    if reason is not None:
+        return limits.stopped(t0, reason, 0, nodes_generated=1, max_frontier_size=1,
+                              memory_bytes=ws.visit_nbytes + frontier_nbytes(1, sample_entry),
+                              stats=SearchStats(pushes=1, pops=0))
     
     while frontier:
         max_frontier = max(max_frontier, len(frontier))
-        h_current, _, current, path = heapq.heappop(frontier)
+        _, _, current = heapq.heappop(frontier)
         nodes_visited += 1
+        if trace is not None:
+            trace(EXPAND, current)
         
         # Chegou ao objetivo
-        if current == goal:
+        if current == goal_id:
             t1 = time.perf_counter()
+            path = path_from_parents(parent, start_id, goal_id, cols)
             path_cost = float(len(path) - 1)  # Custo = número de movimentos
             return SearchResult(
                 found=True,
@@ -66,17 +111,36 @@ def greedy_search(
                 time=t1 - t0,
                 nodes_generated=counter,
                 max_frontier_size=max_frontier,
-                path_cost=path_cost
+                path_cost=path_cost,
+                memory_bytes=ws.visit_nbytes + frontier_nbytes(max_frontier, sample_entry),
+                stats=SearchStats(pushes=counter, pops=nodes_visited)
             )
         
+        if nodes_visited == check_at:  # Prazo, teto de expansões ou cancelamento
+            reason = limits.check(nodes_visited)
+            if reason is not None:
+                return limits.stopped(
+                    t0, reason, nodes_visited,
+                    nodes_generated=counter,
+                    max_frontier_size=max_frontier,
+                    memory_bytes=ws.visit_nbytes + frontier_nbytes(max_frontier, sample_entry),
+                    stats=SearchStats(pushes=counter, pops=nodes_visited)
+                )
+            check_at = limits.next_check(nodes_visited)
+
         # Expande vizinhos
-        for neighbor in get_neighbors(current, maze):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                h_neighbor = heuristic(neighbor, goal)
-                new_path = path + [neighbor]
-                heapq.heappush(frontier, (h_neighbor, counter, neighbor, new_path))
+        for neighbor in targets[offsets[current]:offsets[current + 1]]:
+            if visited[neighbor] != epoch:
+                visited[neighbor] = epoch
+                parent[neighbor] = current
+                if h_table is not None:
+                    h_neighbor = h_table[neighbor]
+                else:
+                    h_neighbor = heuristic(divmod(neighbor, cols), goal)
+                heapq.heappush(frontier, (h_neighbor, counter, neighbor))
                 counter += 1
+                if trace is not None:
+                    trace(GENERATE, neighbor)
     
     # Sem solução
     t1 = time.perf_counter()
@@ -88,6 +152,8 @@ def greedy_search(
         time=t1 - t0,
         nodes_generated=counter,
         max_frontier_size=max_frontier,
-        path_cost=None
+        path_cost=None,
+        memory_bytes=ws.visit_nbytes + frontier_nbytes(max_frontier, sample_entry),
+        stats=SearchStats(pushes=counter, pops=nodes_visited)
     )
 
@@ -1,7 +1,15 @@
 # heuristics.py
 # Três heurísticas para grid: manhattan, euclidiana, chebyshev
 import math
-from typing import Tuple
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional; as tabelas caem no laço em Python
+    np = None
 
 Pos = Tuple[int,int]
 
@@ -23,3 +31,103 @@ HEURISTICS = {
     'euclidean': euclidean,
     'chebyshev': chebyshev
 }
+
+
+DEFAULT_TABLE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def build_heuristic_table(rows: int, cols: int, goal: Pos, name: str) -> array:
+    """
+    Tabela com h(célula, goal) para todas as células, indexada por id (r * cols + c).
+
+    Lida em O(1) por astar() e greedy_search() (parâmetro h_table) no lugar
+    de chamar a função da heurística a cada nó gerado. Com numpy a tabela é
+    calculada de forma vetorizada; é guardada como array('d') porque indexar
+    com int do Python é mais rápido do que em um array numpy.
+    """
+    if name not in HEURISTICS:
+        raise ValueError(f"Heurística desconhecida: {name!r}")
+    table = array('d')
+    if np is not None:
+        dr = np.abs(np.arange(rows) - goal[0])[:, None]
+        dc = np.abs(np.arange(cols) - goal[1])[None, :]
+        if name == 'manhattan':
+            values = dr + dc
+        elif name == 'euclidean':
+            values = np.sqrt(dr * dr + dc * dc)  # Soma exata para inteiros; coincide com math.hypot
+        else:
+            values = np.maximum(dr, dc)
+        table.frombytes(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        return table
+    h = HEURISTICS[name]
+    for r in range(rows):
+        table.extend(h((r, c), goal) for c in range(cols))
+    return table
+
+
+class HeuristicTableCache:
+    """
+    Tabelas de heurística por (linhas, colunas, objetivo, heurística), com despejo LRU limitado em bytes.
+
+    Cada tabela ocupa 8 bytes por célula; quando a soma passa de max_bytes
+    as usadas há mais tempo são descartadas (a mais recente fica sempre,
+    mesmo sozinha acima do limite), como em DistanceMapCache.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_TABLE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._tables: 'OrderedDict[Tuple[int, int, Pos, str], array]' = OrderedDict()
+        self._lock = threading.Lock()  # Compartilhado entre as threads da GUI e do Solver
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def get(self, rows: int, cols: int, goal: Pos, name: str) -> array:
+        """Tabela pedida, construída na primeira vez e depois servida do cache."""
+        key = (rows, cols, tuple(goal), name)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+        table = build_heuristic_table(rows, cols, key[2], name)
+        with self._lock:
+            self.misses += 1
+            if key not in self._tables:
+                self._tables[key] = table
+                self.nbytes += len(table) * table.itemsize
+                self._evict()
+        return table
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and len(self._tables) > 1:
+            _, evicted = self._tables.popitem(last=False)
+            self.nbytes -= len(evicted) * evicted.itemsize
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self.nbytes = 0
+
+
+_TABLES = HeuristicTableCache()
+
+
+def heuristic_tables(max_bytes: Optional[int] = None) -> HeuristicTableCache:
+    """Cache global das tabelas; max_bytes ajusta o limite (e descarta o excedente)."""
+    if max_bytes is not None and max_bytes != _TABLES.max_bytes:
+        with _TABLES._lock:
+            _TABLES.max_bytes = max_bytes
+            _TABLES._evict()
+    return _TABLES
+
+
+def heuristic_table(rows: int, cols: int, goal: Pos, name: str) -> array:
+    """build_heuristic_table() servida do cache global (LRU limitado em bytes, ver HeuristicTableCache)."""
+    return _TABLES.get(rows, cols, goal, name)
@@ -0,0 +1,481 @@
+# hpastar.py
+# HPA* (Hierarchical Pathfinding A*): busca em um grafo abstrato de clusters, refinada só onde o caminho passa.
+import heapq
+import time
+from array import array
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from search.heuristics import chebyshev, manhattan
+from utils.adjacency import DIAGONAL_MOVES, STRAIGHT_MOVES
+from utils.components import cached_component_index, disconnected_result
+from utils.grid import MazeLike, WALL, as_grid
+from utils.limits import SearchLimits, stop_before_start
+from utils.search import PathView, SearchResult, SearchStats, frontier_nbytes, structures_nbytes
+
+Pos = Tuple[int, int]
+
+INF = float('inf')
+DEFAULT_CLUSTER_SIZE = 32
+ENTRANCE_SPLIT = 6  # Trechos livres de borda com 6+ células ganham duas entradas (nas pontas)
+
+
+class HPAStar:
+    """
+    Planejador hierárquico: o grid é dividido em clusters quadrados e a busca
+    acontece primeiro em um grafo pequeno de entradas entre clusters.
+
+    Pré-processamento:
+      - em cada borda entre dois clusters vizinhos, cada trecho contínuo de
+        pares livres vira uma entrada (duas, nas pontas, se o trecho é longo);
+        as duas células da entrada são nós abstratos ligados por custo 1
+        (com diagonais, travessias diagonais e pelos cantos também viram
+        entradas, custando diag_cost);
+      - dentro de cada cluster, os nós são ligados pela distância real entre
+        eles, calculada por uma busca restrita ao cluster.
+
+    Consulta: início e objetivo são ligados aos nós dos seus clusters, um A*
+    roda sobre o grafo abstrato e só os trechos do caminho abstrato são
+    refinados em células, cada um por uma busca dentro de um único cluster.
+    O caminho é quase ótimo: obrigatoriamente cruza as bordas pelas entradas.
+
+    As distâncias internas de um cluster são calculadas na primeira vez que
+    uma consulta passa por ele (ou todas de uma vez com precompute()) e ficam
+    guardadas até o cluster ser invalidado. Edições devem passar por
+    update_cells(), ou ser informadas por cells_changed(); só os clusters
+    editados têm bordas e distâncias recalculadas.
+
+    Exemplo:
+        planner = HPAStar(grid, cluster_size=32)
+        result = planner.solve(inicio, objetivo)
+        planner.update_cells({(3, 4): True})  # Parede nova: só um cluster é refeito
+    """
+
+    def __init__(self, maze: MazeLike, cluster_size: int = DEFAULT_CLUSTER_SIZE,
+                 heuristic: Optional[Callable[[Pos, Pos], float]] = None,
+                 allow_diagonal: bool = False,
+                 diag_cost: float = 1.41421356237):
+        if cluster_size < 2:
+            raise ValueError(f"cluster_size deve ser pelo menos 2 (recebido {cluster_size}).")
+        self.grid = as_grid(maze)
+        self.cluster_size = cluster_size
+        self.allow_diagonal = allow_diagonal
+        self.diag_cost = diag_cost
+        # Sem heurística explícita: a maior que continua admissível para o tipo de movimento.
+        self.heuristic = heuristic or (chebyshev if allow_diagonal else manhattan)
+        self.moves = STRAIGHT_MOVES + DIAGONAL_MOVES if allow_diagonal else STRAIGHT_MOVES
+
+        self.cluster_rows = -(-self.grid.rows // cluster_size)
+        self.cluster_cols = -(-self.grid.cols // cluster_size)
+        count = self.cluster_rows * self.cluster_cols
+        self.nodes: List[Set[int]] = [set() for _ in range(count)]  # nós abstratos por cluster
+        self.edges: Dict[int, Dict[int, float]] = {}  # nó -> {vizinho: custo}
+        self._refs: Dict[int, int] = {}  # um nó de canto pode servir a duas bordas
+        self._entrances: Dict[Tuple[int, int], List[Tuple[int, int, float]]] = {}
+        self._ready = bytearray(count)  # 1 = distâncias internas do cluster em dia
+
+        for cid in range(count):
+            for other in self._forward_neighbors(cid):
+                self._build_border(cid, other)
+
+    # --- Geometria dos clusters ------------------------------------------
+    @property
+    def cluster_count(self) -> int:
+        return len(self.nodes)
+
+    def cluster_of(self, cell: int) -> int:
+        """Cluster que contém a célula de id `cell`."""
+        r, c = divmod(cell, self.grid.cols)
+        size = self.cluster_size
+        return (r // size) * self.cluster_cols + c // size
+
+    def bounds(self, cid: int) -> Tuple[int, int, int, int]:
+        """(linha inicial, coluna inicial, linha final, coluna final) do cluster, finais exclusivas."""
+        cr, cc = divmod(cid, self.cluster_cols)
+        size = self.cluster_size
+        r0, c0 = cr * size, cc * size
+        return r0, c0, min(r0 + size, self.grid.rows), min(c0 + size, self.grid.cols)
+
+    def _forward_neighbors(self, cid: int) -> List[int]:
+        """Clusters à direita e abaixo (e nas diagonais de baixo, com diagonais); cada borda uma vez."""
+        cr, cc = divmod(cid, self.cluster_cols)
+        result = []
+        if cc + 1 < self.cluster_cols:
+            result.append(cid + 1)
+        if cr + 1 < self.cluster_rows:
+            below = cid + self.cluster_cols
+            result.append(below)
+            if self.allow_diagonal:
+                if cc + 1 < self.cluster_cols:
+                    result.append(below + 1)
+                if cc > 0:
+                    result.append(below - 1)
+        return result
+
+    def _adjacent(self, cid: int) -> List[int]:
+        """Os clusters que compartilham borda (ou canto, com diagonais) com cid."""
+        cr, cc = divmod(cid, self.cluster_cols)
+        result = self._forward_neighbors(cid)
+        if cc > 0:
+            result.append(cid - 1)
+        if cr > 0:
+            above = cid - self.cluster_cols
+            result.append(above)
+            if self.allow_diagonal:
+                if cc > 0:
+                    result.append(above - 1)
+                if cc + 1 < self.cluster_cols:
+                    result.append(above + 1)
+        return result
+
+    # --- Grafo abstrato --------------------------------------------------
+    def _retain(self, cell: int, cid: int):
+        refs = self._refs.get(cell, 0)
+        self._refs[cell] = refs + 1
+        if refs == 0:
+            self.nodes[cid].add(cell)
+            self.edges[cell] = {}
+            self._ready[cid] = 0  # Nó novo ainda sem distâncias internas
+
+    def _release(self, cell: int, cid: int):
+        refs = self._refs[cell] - 1
+        if refs:
+            self._refs[cell] = refs
+            return
+        del self._refs[cell]
+        for nb in self.edges.pop(cell):
+            self.edges[nb].pop(cell, None)
+        self.nodes[cid].discard(cell)
+        self._ready[cid] = 0
+
+    def _build_border(self, a: int, b: int):
+        """(Re)calcula as entradas entre o cluster a e o vizinho b, com b > a (abaixo ou à direita)."""
+        r0, c0, r1, c1 = self.bounds(a)
+        cols, cells = self.grid.cols, self.grid.cells
+        a_row, a_col = divmod(a, self.cluster_cols)
+        b_row, b_col = divmod(b, self.cluster_cols)
+        entrances: List[Tuple[int, int, float]] = []
+
+        if a_row != b_row and a_col != b_col:
+            # Clusters que só se tocam no canto: a única travessia é a diagonal.
+            u = (r1 - 1) * cols + (c1 - 1 if b_col > a_col else c0)
+            v = r1 * cols + (c1 if b_col > a_col else c0 - 1)
+            if cells[u] != WALL and cells[v] != WALL:
+                entrances.append((u, v, self.diag_cost))
+        else:
+            if a_row == b_row:  # b à direita
+                pairs = [(r * cols + c1 - 1, r * cols + c1) for r in range(r0, r1)]
+            else:  # b abaixo
+                pairs = [((r1 - 1) * cols + c, r1 * cols + c) for c in range(c0, c1)]
+            open_pairs = [cells[u] != WALL and cells[v] != WALL for u, v in pairs]
+
+            run: List[Tuple[int, int]] = []
+            for pair, is_open in zip(pairs + [(-1, -1)], open_pairs + [False]):
+                if is_open:
+                    run.append(pair)
+                    continue
+                if len(run) >= ENTRANCE_SPLIT:
+                    entrances += ((*run[0], 1.0), (*run[-1], 1.0))
+                elif run:
+                    entrances.append((*run[len(run) // 2], 1.0))
+                run = []
+
+            if self.allow_diagonal:
+                # Travessia diagonal entre dois pares bloqueados; se um dos pares
+                # estivesse livre, as duas células já estariam ligadas pelo trecho dele.
+                for i in range(len(pairs) - 1):
+                    if open_pairs[i] or open_pairs[i + 1]:
+                        continue
+                    for u, v in ((pairs[i][0], pairs[i + 1][1]), (pairs[i + 1][0], pairs[i][1])):
+                        if cells[u] != WALL and cells[v] != WALL:
+                            entrances.append((u, v, self.diag_cost))
+
+        key = (a, b)
+        old = self._entrances.get(key, [])
+        if old == entrances:
+            return
+        for u, v, _ in old:
+            self.edges[u].pop(v, None)
+            self.edges[v].pop(u, None)
+            self._release(u, a)
+            self._release(v, b)
+        for u, v, cost in entrances:
+            self._retain(u, a)
+            self._retain(v, b)
+            self.edges[u][v] = cost
+            self.edges[v][u] = cost
+        self._entrances[key] = entrances
+
+    def _build_cluster(self, cid: int):
+        """Liga os nós do cluster pela distância real entre eles dentro do cluster."""
+        nodes, edges = self.nodes[cid], self.edges
+        for node in nodes:
+            table = edges[node]
+            for nb in [nb for nb in table if nb in nodes]:
+                del table[nb]  # Arestas internas antigas; as de entrada (outro cluster) ficam
+        for node in nodes:
+            dist, _, _ = self._local_search(cid, node, nodes)
+            table = edges[node]
+            for other in nodes:
+                if other != node and other in dist:
+                    table[other] = dist[other]
+        self._ready[cid] = 1
+
+    def precompute(self) -> 'HPAStar':
+        """Calcula já as distâncias internas de todos os clusters pendentes."""
+        for cid in range(self.cluster_count):
+            if not self._ready[cid]:
+                self._build_cluster(cid)
+        return self
+
+    @property
+    def node_count(self) -> int:
+        return len(self.edges)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(table) for table in self.edges.values()) // 2
+
+    def _local_search(self, cid: int, source: int, targets: Iterable[int],
+                      parents: bool = False) -> Tuple[Dict[int, float], Optional[Dict[int, int]], int]:
+        """
+        Busca de source restrita ao cluster, até alcançar todos os targets.
+
+        BFS em 4 direções; Dijkstra com diagonais, já que elas custam diag_cost.
+
+        Returns:
+            (distâncias por id, pais por id se parents=True, nós expandidos)
+        """
+        r0, c0, r1, c1 = self.bounds(cid)
+        cols, cells, moves = self.grid.cols, self.grid.cells, self.moves
+        remaining = set(targets)
+        remaining.discard(source)
+        dist = {source: 0.0}
+        parent = {source: -1} if parents else None
+        expanded = 0
+
+        if not self.allow_diagonal:
+            queue = deque([source])
+            while queue and remaining:
+                current = queue.popleft()
+                expanded += 1
+                r, c = divmod(current, cols)
+                d = dist[current] + 1.0
+                for dr, dc in moves:
+                    nr, nc = r + dr, c + dc
+                    if r0 <= nr < r1 and c0 <= nc < c1:
+                        nb = nr * cols + nc
+                        if nb not in dist and cells[nb] != WALL:
+                            dist[nb] = d
+                            if parent is not None:
+                                parent[nb] = current
+                            remaining.discard(nb)
+                            queue.append(nb)
+            return dist, parent, expanded
+
+        heap = [(0.0, source)]
+        diag_cost = self.diag_cost
+        while heap and remaining:
+            d, current = heapq.heappop(heap)
+            if d > dist[current]:
+                continue
+            expanded += 1
+            remaining.discard(current)
+            r, c = divmod(current, cols)
+            for dr, dc in moves:
+                nr, nc = r + dr, c + dc
+                if r0 <= nr < r1 and c0 <= nc < c1:
+                    nb = nr * cols + nc
+                    if cells[nb] == WALL:
+                        continue
+                    nd = d + (diag_cost if dr and dc else 1.0)
+                    if nd < dist.get(nb, INF):
+                        dist[nb] = nd
+                        if parent is not None:
+                            parent[nb] = current
+                        heapq.heappush(heap, (nd, nb))
+        return dist, parent, expanded
+
+    # --- Edições ---------------------------------------------------------
+    def invalidate_cluster(self, cid: int):
+        """Refaz as entradas nas bordas do cluster e descarta suas distâncias internas."""
+        for other in self._adjacent(cid):
+            self._build_border(min(cid, other), max(cid, other))
+        self._ready[cid] = 0
+
+    def cells_changed(self, positions: Iterable[Pos]):
+        """Informa células cujo estado (parede/livre) já foi alterado no grid."""
+        for cid in {self.cluster_of(self.grid.index(pos)) for pos in positions}:
+            self.invalidate_cluster(cid)
+
+    def update_cells(self, changes: Union[Dict[Pos, bool], Iterable[Tuple[Pos, bool]]]):
+        """Aplica edições {posição: é_parede} ao grid e invalida só os clusters afetados."""
+        items = changes.items() if isinstance(changes, dict) else changes
+        changed = []
+        for pos, wall in items:
+            if self.grid.is_open(pos) == bool(wall):
+                self.grid.set_wall(pos, wall)
+                changed.append(pos)
+        self.cells_changed(changed)
+
+    # --- Consulta --------------------------------------------------------
+    def solve(self, start: Pos, goal: Pos, limits: Optional[SearchLimits] = None) -> SearchResult:
+        """
+        Caminho de start a goal pelo grafo abstrato, refinado em células.
+
+        nodes_visited soma as expansões do A* abstrato e das buscas locais
+        (ligação de início/objetivo e refinamento); nodes_generated e
+        max_frontier_size referem-se ao A* abstrato. O cálculo preguiçoso das
+        distâncias internas de clusters ainda não visitados não entra na conta.
+
+        stats conta o A* abstrato: neighbor_checks são as arestas abstratas
+        examinadas.
+
+        limits (ver utils/limits.py) é verificado a cada nó abstrato expandido,
+        contra o total de expansões; as buscas locais, limitadas a um
+        cluster, não são interrompidas.
+        """
+        t0 = time.perf_counter()
+        grid = self.grid
+        cols = grid.cols
+        start_id, goal_id = grid.index(start), grid.index(goal)
+        components = cached_component_index(grid, self.allow_diagonal)
+        if grid.cells[start_id] == WALL or grid.cells[goal_id] == WALL or (
+                components is not None and not components.connected(start_id, goal_id)):
+            return disconnected_result(t0, informed=True)
+        reason = stop_before_start(limits)
+        if reason is not None:
+            return limits.stopped(t0, reason, 0)
+        if start_id == goal_id:
+            path = PathView(array('i', [start_id]), cols)
+            return SearchResult(found=True, path=path, depth=0, nodes_visited=1,
+                                time=time.perf_counter() - t0, nodes_generated=1,
+                                max_frontier_size=1, path_cost=0.0, memory_bytes=0)
+
+        # Arestas temporárias que ligam início e objetivo aos nós dos seus clusters.
+        extra: Dict[int, Dict[int, float]] = {}
+        local_expanded = 0
+        start_cluster, goal_cluster = self.cluster_of(start_id), self.cluster_of(goal_id)
+        for cell, cid in ((start_id, start_cluster), (goal_id, goal_cluster)):
+            if cell in self.edges:
+                continue  # Já é nó abstrato
+            nodes = self.nodes[cid]
+            dist, _, expanded = self._local_search(cid, cell, nodes)
+            local_expanded += expanded
+            for node in nodes:
+                if node in dist:
+                    extra.setdefault(cell, {})[node] = dist[node]
+                    extra.setdefault(node, {})[cell] = dist[node]
+        if start_cluster == goal_cluster:
+            dist, _, expanded = self._local_search(start_cluster, start_id, (goal_id,))
+            local_expanded += expanded
+            if goal_id in dist:
+                extra.setdefault(start_id, {})[goal_id] = dist[goal_id]
+
+        # A* no grafo abstrato.
+        h = self.heuristic
+        g_score = {start_id: 0.0}
+        parent = {start_id: -1}
+        closed: Set[int] = set()
+        open_heap = [(h(start, goal), 0, start_id)]
+        sample_entry = open_heap[0]
+        counter = 1
+        max_frontier = 1
+        abstract_expanded = 0
+        stale_pops = 0
+        neighbor_checks = 0
+        reopened = 0
+        check_at = limits.next_check(local_expanded) if limits is not None else 0
+        ready, edges, no_edges = self._ready, self.edges, {}
+        while open_heap:
+            max_frontier = max(max_frontier, len(open_heap))
+            _, _, current = heapq.heappop(open_heap)
+            if current in closed:
+                stale_pops += 1
+                continue
+            closed.add(current)
+            abstract_expanded += 1
+            if current == goal_id:
+                break
+            if limits is not None and abstract_expanded + local_expanded >= check_at:
+                reason = limits.check(abstract_expanded + local_expanded)
+                if reason is not None:
+                    return limits.stopped(
+                        t0, reason, abstract_expanded + local_expanded,
+                        nodes_generated=counter,
+                        max_frontier_size=max_frontier,
+                        memory_bytes=(frontier_nbytes(max_frontier, sample_entry)
+                                      + structures_nbytes(g_score, parent, closed, extra)),
+                        stats=SearchStats(pushes=counter, pops=abstract_expanded + stale_pops,
+                                          stale_pops=stale_pops, neighbor_checks=neighbor_checks,
+                                          reopened=reopened)
+                    )
+                check_at = limits.next_check(abstract_expanded + local_expanded)
+            if current in edges:
+                cid = self.cluster_of(current)
+                if not ready[cid]:
+                    self._build_cluster(cid)
+            g = g_score[current]
+            for table in (edges.get(current, no_edges), extra.get(current, no_edges)):
+                neighbor_checks += len(table)
+                for nb, cost in table.items():
+                    tentative_g = g + cost
+                    if tentative_g < g_score.get(nb, INF):
+                        if nb in closed:
+                            reopened += 1
+                        g_score[nb] = tentative_g
+                        parent[nb] = current
+                        heapq.heappush(open_heap, (tentative_g + h(divmod(nb, cols), goal), counter, nb))
+                        counter += 1
+
+        memory = frontier_nbytes(max_frontier, sample_entry) + structures_nbytes(g_score, parent, closed, extra)
+        stats = SearchStats(pushes=counter, pops=abstract_expanded + stale_pops, stale_pops=stale_pops,
+                            neighbor_checks=neighbor_checks, reopened=reopened)
+        if goal_id not in closed:
+            return SearchResult(
+                found=False,
+                path=[],
+                depth=None,
+                nodes_visited=abstract_expanded + local_expanded,
+                time=time.perf_counter() - t0,
+                nodes_generated=counter,
+                max_frontier_size=max_frontier,
+                path_cost=None,
+                memory_bytes=memory,
+                stats=stats
+            )
+
+        # Refinamento: só os clusters atravessados pelo caminho abstrato.
+        abstract = [goal_id]
+        while parent[abstract[-1]] != -1:
+            abstract.append(parent[abstract[-1]])
+        abstract.reverse()
+        ids = array('i', [start_id])
+        for a, b in zip(abstract, abstract[1:]):
+            cid = self.cluster_of(a)
+            if cid != self.cluster_of(b):
+                ids.append(b)  # Aresta de entrada: células vizinhas
+                continue
+            _, local_parent, expanded = self._local_search(cid, a, (b,), parents=True)
+            local_expanded += expanded
+            segment = []
+            cell = b
+            while cell != a:
+                segment.append(cell)
+                cell = local_parent[cell]
+            segment.reverse()
+            ids.extend(segment)
+
+        path = PathView(ids, cols)
+        return SearchResult(
+            found=True,
+            path=path,
+            depth=len(path) - 1,
+            nodes_visited=abstract_expanded + local_expanded,
+            time=time.perf_counter() - t0,
+            nodes_generated=counter,
+            max_frontier_size=max_frontier,
+            path_cost=g_score[goal_id],
+            memory_bytes=memory + path.nbytes,
+            stats=stats
+        )
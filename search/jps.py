@@ -0,0 +1,276 @@
+# jps.py
+# Jump Point Search: A* em grid de custo uniforme que salta células simétricas.
+import heapq
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.components import component_index, disconnected_result
+from utils.grid import MazeLike, WALL, as_grid
+from utils.instrument import observed
+from utils.limits import SearchLimits, first_check, stop_before_start
+from utils.search import PathView, SearchResult, SearchStats, frontier_nbytes, structures_nbytes
+from utils.trace import EXPAND, GENERATE, TraceCallback
+
+Pos = Tuple[int, int]
+
+
+def _sign(x: int) -> int:
+    return (x > 0) - (x < 0)
+
+
+def expand_path(jump_points: List[Pos]) -> List[Pos]:
+    """Converte a lista de pontos de salto no caminho completo, célula a célula."""
+    path = [jump_points[0]]
+    for r1, c1 in jump_points[1:]:
+        r, c = path[-1]
+        dr, dc = _sign(r1 - r), _sign(c1 - c)
+        while (r, c) != (r1, c1):
+            r, c = r + dr, c + dc
+            path.append((r, c))
+    return path
+
+
+@observed('jps')
+def jps(maze: MazeLike,
+        start: Pos,
+        goal: Pos,
+        heuristic: Callable[[Pos, Pos], float],
+        allow_diagonal: bool = False,
+        diag_cost: float = 1.41421356237,
+        trace: Optional[TraceCallback] = None,
+        limits: Optional[SearchLimits] = None) -> SearchResult:
+    """
+    Jump Point Search sobre a mesma movimentação do astar().
+
+    Em vez de empilhar todo vizinho livre, cada nó só gera os "pontos de salto"
+    alcançados em linha reta (ou diagonal) até encontrar um vizinho forçado
+    ou o objetivo. Com 8 direções segue a regra do astar(): a diagonal é
+    permitida sempre que a célula de destino está livre.
+
+    Args:
+        maze: Grid ou matriz 2D onde 0/'S'/'G'=livre, 1=parede
+        start, goal: posições (linha, coluna)
+        heuristic: função h(pos, goal) -> float
+        allow_diagonal: permite movimentos diagonais
+        diag_cost: custo do movimento diagonal (padrão √2)
+        trace: callback(tipo, id) para os eventos (ver utils/trace.py); só
+            os pontos de salto aparecem, não as células percorridas no salto
+        limits: prazo, teto de expansões (pontos de salto) e cancelamento
+            (ver utils/limits.py)
+
+    Returns:
+        SearchResult com o caminho completo; nodes_visited conta pontos de
+        salto expandidos e nodes_generated as inserções no heap.
+    """
+    grid = as_grid(maze)
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    goal_r, goal_c = goal
+    components = component_index(grid, allow_diagonal)  # Regiões conexas, para descartar objetivos inalcançáveis
+
+    def free(r: int, c: int) -> bool:
+        return 0 <= r < rows and 0 <= c < cols and cells[r*cols + c] != WALL
+
+    def jump_straight4(r: int, c: int, dr: int, dc: int) -> Optional[Pos]:
+        """Salto em 4 direções a partir de (r, c), já um passo à frente do pai."""
+        while True:
+            if not free(r, c):
+                return None
+            if r == goal_r and c == goal_c:
+                return (r, c)
+            if dc != 0:
+                # Horizontal: vizinho forçado acima/abaixo que estava bloqueado atrás.
+                if (free(r-1, c) and not free(r-1, c-dc)) or (free(r+1, c) and not free(r+1, c-dc)):
+                    return (r, c)
+            else:
+                if (free(r, c-1) and not free(r-dr, c-1)) or (free(r, c+1) and not free(r-dr, c+1)):
+                    return (r, c)
+                # Na vertical, qualquer ponto de salto horizontal torna (r, c) um ponto de salto.
+                if jump_straight4(r, c+1, 0, 1) or jump_straight4(r, c-1, 0, -1):
+                    return (r, c)
+            r, c = r + dr, c + dc
+
+    def jump_straight8(r: int, c: int, dr: int, dc: int) -> Optional[Pos]:
+        """Salto reto com diagonais liberadas."""
+        while True:
+            if not free(r, c):
+                return None
+            if r == goal_r and c == goal_c:
+                return (r, c)
+            if dc != 0:
+                if (free(r+1, c+dc) and not free(r+1, c)) or (free(r-1, c+dc) and not free(r-1, c)):
+                    return (r, c)
+            else:
+                if (free(r+dr, c+1) and not free(r, c+1)) or (free(r+dr, c-1) and not free(r, c-1)):
+                    return (r, c)
+            r, c = r + dr, c + dc
+
+    def jump8(r: int, c: int, dr: int, dc: int) -> Optional[Pos]:
+        """Salto em 8 direções; na diagonal também testa os saltos retos."""
+        if dr == 0 or dc == 0:
+            return jump_straight8(r, c, dr, dc)
+        while True:
+            if not free(r, c):
+                return None
+            if r == goal_r and c == goal_c:
+                return (r, c)
+            if (free(r+dr, c-dc) and not free(r, c-dc)) or (free(r-dr, c+dc) and not free(r-dr, c)):
+                return (r, c)
+            if jump_straight8(r+dr, c, dr, 0) or jump_straight8(r, c+dc, 0, dc):
+                return (r, c)
+            r, c = r + dr, c + dc
+
+    def successors(r: int, c: int, parent: Optional[Pos]) -> List[Tuple[int, int]]:
+        """Direções a explorar a partir de (r, c), podadas pela direção de chegada."""
+        if parent is None:
+            if allow_diagonal:
+                moves = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+            else:
+                moves = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+            return [(dr, dc) for dr, dc in moves if free(r+dr, c+dc)]
+
+        dr, dc = _sign(r - parent[0]), _sign(c - parent[1])
+        dirs = []
+        if not allow_diagonal:
+            if dc != 0:
+                dirs = [(-1, 0), (1, 0), (0, dc)]
+            else:
+                dirs = [(0, -1), (0, 1), (dr, 0)]
+            return [(a, b) for a, b in dirs if free(r+a, c+b)]
+
+        if dr != 0 and dc != 0:
+            dirs = [(dr, 0), (0, dc), (dr, dc)]
+            if not free(r, c-dc):
+                dirs.append((dr, -dc))
+            if not free(r-dr, c):
+                dirs.append((-dr, dc))
+        elif dc != 0:
+            dirs = [(0, dc)]
+            if not free(r+1, c):
+                dirs.append((1, dc))
+            if not free(r-1, c):
+                dirs.append((-1, dc))
+        else:
+            dirs = [(dr, 0)]
+            if not free(r, c+1):
+                dirs.append((dr, 1))
+            if not free(r, c-1):
+                dirs.append((dr, -1))
+        return [(a, b) for a, b in dirs if free(r+a, c+b)]
+
+    jump = jump8 if allow_diagonal else jump_straight4
+
+    t0 = time.perf_counter()
+    if not components.connected(grid.index(start), grid.index(goal)):
+        return disconnected_result(t0)
+
+    open_heap: List[Tuple[float, int, Pos, float]] = [(heuristic(start, goal), 0, start, 0.0)]
+    sample_entry = open_heap[0]  # Para estimar os bytes da fronteira
+    entry_count = 1
+    came_g: Dict[Pos, float] = {start: 0.0}
+    parent: Dict[Pos, Optional[Pos]] = {start: None}
+    closed = set()
+
+    nodes_expanded = 0
+    nodes_generated = 1
+    max_frontier = 1
+    stale_pops = 0
+    reopened = 0
+    if trace is not None:
+        trace(GENERATE, start[0] * cols + start[1])
+    check_at = first_check(limits)
+    reason = stop_before_start(limits)
+    if reason is not None:
+        return limits.stopped(t0, reason, 0, nodes_generated=1, max_frontier_size=1,
+                              memory_bytes=(structures_nbytes(came_g, parent, closed)
+                                            + frontier_nbytes(1, sample_entry)),
+                              stats=SearchStats(pushes=1, pops=0, stale_pops=0, reopened=0))
+
+    while open_heap:
+        max_frontier = max(max_frontier, len(open_heap))
+        _, _, current, g = heapq.heappop(open_heap)
+
+        # Ignora entradas com g desatualizado.
+        if came_g.get(current, float('inf')) < g:
+            stale_pops += 1
+            continue
+
+        nodes_expanded += 1
+        if trace is not None:
+            trace(EXPAND, current[0] * cols + current[1])
+
+        if current == goal:
+            jump_points = [current]
+            while parent[jump_points[-1]] is not None:
+                jump_points.append(parent[jump_points[-1]])
+            jump_points.reverse()
+            path = PathView.from_positions(expand_path(jump_points), cols)
+            t1 = time.perf_counter()
+            return SearchResult(
+                found=True,
+                path=path,
+                depth=len(path) - 1,
+                nodes_visited=nodes_expanded,
+                time=t1 - t0,
+                nodes_generated=nodes_generated,
+                max_frontier_size=max_frontier,
+                path_cost=g,
+                memory_bytes=(structures_nbytes(came_g, parent, closed)
+                              + frontier_nbytes(max_frontier, sample_entry)),
+                stats=SearchStats(pushes=nodes_generated, pops=nodes_expanded + stale_pops,
+                                  stale_pops=stale_pops, reopened=reopened)
+            )
+
+        if nodes_expanded == check_at:  # Prazo, teto de expansões ou cancelamento
+            reason = limits.check(nodes_expanded)
+            if reason is not None:
+                return limits.stopped(
+                    t0, reason, nodes_expanded,
+                    nodes_generated=nodes_generated,
+                    max_frontier_size=max_frontier,
+                    memory_bytes=(structures_nbytes(came_g, parent, closed)
+                                  + frontier_nbytes(max_frontier, sample_entry)),
+                    stats=SearchStats(pushes=nodes_generated, pops=nodes_expanded + stale_pops,
+                                      stale_pops=stale_pops, reopened=reopened)
+                )
+            check_at = limits.next_check(nodes_expanded)
+
+        closed.add(current)
+        r, c = current
+
+        for dr, dc in successors(r, c, parent[current]):
+            jp = jump(r + dr, c + dc, dr, dc)
+            if jp is None:
+                continue
+
+            # Custo octil entre pontos de salto (trecho reto ou diagonal).
+            ar, ac = abs(jp[0] - r), abs(jp[1] - c)
+            tentative_g = g + min(ar, ac) * diag_cost + abs(ar - ac)
+
+            if jp in closed and tentative_g >= came_g.get(jp, float('inf')):
+                continue
+
+            if tentative_g < came_g.get(jp, float('inf')):
+                if jp in closed:
+                    reopened += 1
+                came_g[jp] = tentative_g
+                parent[jp] = current
+                heapq.heappush(open_heap, (tentative_g + heuristic(jp, goal), entry_count, jp, tentative_g))
+                entry_count += 1
+                nodes_generated += 1
+                if trace is not None:
+                    trace(GENERATE, jp[0] * cols + jp[1])
+
+    t1 = time.perf_counter()
+    return SearchResult(
+        found=False,
+        path=[],
+        depth=None,
+        nodes_visited=nodes_expanded,
+        time=t1 - t0,
+        nodes_generated=nodes_generated,
+        max_frontier_size=max_frontier,
+        path_cost=None,
+        memory_bytes=structures_nbytes(came_g, parent, closed) + frontier_nbytes(max_frontier, sample_entry),
+        stats=SearchStats(pushes=nodes_generated, pops=nodes_expanded + stale_pops,
+                          stale_pops=stale_pops, reopened=reopened)
+    )
@@ -0,0 +1,213 @@
+# landmarks.py
+# Heurística ALT (A*, Landmarks, Triangle inequality): limites inferiores a partir de distâncias a marcos.
+import heapq
+import random
+from array import array
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+from utils.adjacency import neighbor_index
+from utils.components import component_index
+from utils.grid import Grid, MazeLike, WALL, as_grid
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional; table() cai no laço em Python
+    np = None
+
+Pos = Tuple[int, int]
+
+INF = float('inf')
+STRATEGIES = ('farthest', 'corners', 'random')
+DEFAULT_LANDMARKS = 4
+
+
+def distances_from(grid: Grid, source: int, allow_diagonal: bool = False,
+                   diag_cost: float = 1.41421356237) -> array:
+    """
+    Distância de `source` até todas as células (array('d'), inf = inalcançável).
+
+    BFS em 4 direções; Dijkstra com diagonais, já que elas custam diag_cost.
+    """
+    index = neighbor_index(grid, allow_diagonal)
+    offsets, targets = index.offsets, index.targets
+    cols = grid.cols
+    dist = array('d', [INF]) * (grid.rows * cols)
+    dist[source] = 0.0
+
+    if not allow_diagonal:
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            d = dist[current] + 1.0
+            for nb in targets[offsets[current]:offsets[current + 1]]:
+                if dist[nb] == INF:
+                    dist[nb] = d
+                    queue.append(nb)
+        return dist
+
+    heap = [(0.0, source)]
+    while heap:
+        d, current = heapq.heappop(heap)
+        if d > dist[current]:
+            continue
+        r, c = divmod(current, cols)
+        for nb in targets[offsets[current]:offsets[current + 1]]:
+            nb_r, nb_c = divmod(nb, cols)
+            nd = d + (diag_cost if (nb_r != r and nb_c != c) else 1.0)
+            if nd < dist[nb]:
+                dist[nb] = nd
+                heapq.heappush(heap, (nd, nb))
+    return dist
+
+
+class Landmarks:
+    """
+    Tabelas de distância até K marcos e a heurística ALT derivada delas.
+
+    Pela desigualdade triangular, para qualquer marco L:
+        d(n, goal) >= |d(L, goal) - d(L, n)|
+    e o máximo sobre os marcos é uma heurística admissível e consistente,
+    que "enxerga" paredes, ao contrário das distâncias geométricas.
+    """
+
+    def __init__(self, grid: Grid, landmarks: List[int], tables: List[array],
+                 allow_diagonal: bool = False):
+        self.rows = grid.rows
+        self.cols = grid.cols
+        self.allow_diagonal = allow_diagonal
+        self.landmarks = landmarks
+        self.tables = tables
+
+    @property
+    def positions(self) -> List[Pos]:
+        return [divmod(cell, self.cols) for cell in self.landmarks]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(t) * t.itemsize for t in self.tables)
+
+    def heuristic(self, pos: Pos, goal: Pos) -> float:
+        """h(pos, goal) no formato das funções de search/heuristics.py."""
+        cols = self.cols
+        a = pos[0] * cols + pos[1]
+        b = goal[0] * cols + goal[1]
+        best = 0.0
+        for dist in self.tables:
+            da, db = dist[a], dist[b]
+            if da == INF or db == INF:
+                if da != db:
+                    return INF  # Componentes diferentes: não há caminho
+                continue
+            d = da - db if da > db else db - da
+            if d > best:
+                best = d
+        return best
+
+    def table(self, goal: Pos) -> array:
+        """h de todas as células até `goal`, para o parâmetro h_table de astar()."""
+        cols = self.cols
+        b = goal[0] * cols + goal[1]
+        n = self.rows * cols
+        if np is None:
+            return array('d', (self.heuristic(divmod(i, cols), goal) for i in range(n)))
+        dist = np.array([np.frombuffer(t, dtype=np.float64) for t in self.tables]).reshape(-1, n)
+        with np.errstate(invalid='ignore'):
+            diff = np.abs(dist - dist[:, b:b + 1])
+        diff[np.isnan(diff)] = 0.0  # Marco que não alcança nem n nem goal não limita nada
+        values = diff.max(axis=0) if len(self.tables) else np.zeros(n)
+        out = array('d')
+        out.frombytes(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        return out
+
+
+def _open_cells(grid: Grid) -> List[int]:
+    cells = grid.cells
+    return [i for i in range(grid.rows * grid.cols) if cells[i] != WALL]
+
+
+def _select_farthest(grid: Grid, k: int, allow_diagonal: bool, rng: random.Random,
+                     open_cells: List[int]) -> Tuple[List[int], List[array]]:
+    """
+    Seleção "farthest": cada marco novo é a célula alcançável mais distante dos
+    já escolhidos. O primeiro é o ponto mais distante de uma célula sorteada
+    na maior região conexa, para que os marcos não fiquem presos em uma ilha.
+    """
+    components = component_index(grid, allow_diagonal)
+    largest = components.largest()
+    candidates = [cell for cell in open_cells if components.labels[cell] == largest]
+    seed_dist = distances_from(grid, rng.choice(candidates), allow_diagonal)
+    min_dist = seed_dist
+    landmarks, tables = [], []
+    for _ in range(k):
+        best, best_d = -1, -1.0
+        for cell in open_cells:
+            d = min_dist[cell]
+            if d != INF and d > best_d:
+                best, best_d = cell, d
+        if best < 0 or best in landmarks:
+            break
+        dist = distances_from(grid, best, allow_diagonal)
+        landmarks.append(best)
+        tables.append(dist)
+        min_dist = dist if not tables[:-1] else array('d', map(min, min_dist, dist))
+    return landmarks, tables
+
+
+def _select_corners(grid: Grid, k: int, open_cells: List[int]) -> List[int]:
+    """Seleção "corners": células livres mais próximas dos cantos e dos meios das bordas."""
+    rows, cols = grid.rows, grid.cols
+    anchors = [(0, 0), (rows - 1, cols - 1), (0, cols - 1), (rows - 1, 0),
+               (0, cols // 2), (rows - 1, cols // 2), (rows // 2, 0), (rows // 2, cols - 1)]
+    chosen: List[int] = []
+    for ar, ac in anchors[:k]:
+        best = min(open_cells, key=lambda i: abs(i // cols - ar) + abs(i % cols - ac))
+        if best not in chosen:
+            chosen.append(best)
+    return chosen
+
+
+def build_landmarks(maze: MazeLike, k: int = DEFAULT_LANDMARKS, strategy: str = 'farthest',
+                    allow_diagonal: bool = False, seed: int = 0) -> Landmarks:
+    """
+    Escolhe K marcos e calcula as tabelas de distância até cada um.
+
+    Args:
+        maze: Grid ou matriz 2D
+        k: número de marcos (cada um custa uma BFS/Dijkstra e 8 bytes por célula)
+        strategy: 'farthest' (mais distantes entre si, o padrão), 'corners'
+            (junto aos cantos e bordas) ou 'random'
+        allow_diagonal: distâncias com movimentos diagonais (custo √2)
+        seed: semente para as estratégias com sorteio
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estratégia desconhecida: {strategy!r} (opções: {', '.join(STRATEGIES)}).")
+    grid = as_grid(maze)
+    open_cells = _open_cells(grid)
+    if not open_cells or k <= 0:
+        return Landmarks(grid, [], [], allow_diagonal)
+    rng = random.Random(seed)
+
+    if strategy == 'farthest':
+        landmarks, tables = _select_farthest(grid, k, allow_diagonal, rng, open_cells)
+        return Landmarks(grid, landmarks, tables, allow_diagonal)
+
+    if strategy == 'corners':
+        landmarks = _select_corners(grid, k, open_cells)
+    else:
+        landmarks = rng.sample(open_cells, min(k, len(open_cells)))
+    tables = [distances_from(grid, cell, allow_diagonal) for cell in landmarks]
+    return Landmarks(grid, landmarks, tables, allow_diagonal)
+
+
+def landmarks_for(grid: Grid, k: int = DEFAULT_LANDMARKS, strategy: str = 'farthest',
+                  allow_diagonal: bool = False) -> Landmarks:
+    """Marcos do grid, em cache até a próxima edição (como o índice de vizinhos)."""
+    return grid.cached(('landmarks', k, strategy, allow_diagonal),
+                       lambda g: build_landmarks(g, k, strategy, allow_diagonal))
+
+
+def alt_heuristic(maze: MazeLike, k: int = DEFAULT_LANDMARKS, strategy: str = 'farthest',
+                  allow_diagonal: bool = False) -> Callable[[Pos, Pos], float]:
+    """Atalho: heurística ALT pronta para passar a astar()/greedy_search()."""
+    return landmarks_for(as_grid(maze), k, strategy, allow_diagonal).heuristic
@@ -0,0 +1,257 @@
+# lpastar.py
+# LPA* (Lifelong Planning A*): replanejamento incremental quando paredes mudam.
+import heapq
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from search.astar import astar
+from utils.adjacency import DIAGONAL_MOVES, STRAIGHT_MOVES
+from utils.grid import MazeLike, WALL, as_grid
+from utils.limits import NO_CHECK, SearchLimits
+from utils.search import PathView, SearchResult, SearchStats, frontier_nbytes
+
+Pos = Tuple[int, int]
+
+INF = float('inf')
+
+
+class LPAStar:
+    """
+    Planejador LPA* que mantém g, rhs e a fila entre edições do labirinto.
+
+    Na primeira chamada a solve() equivale a um A*. Depois de update_cells(),
+    só os vértices cujo rhs mudou (as células editadas e seus vizinhos) voltam
+    para a fila, e solve() reexpande apenas a parte da árvore afetada.
+
+    O planejador trabalha sobre o Grid recebido (sem cópia); as edições devem
+    passar por update_cells(), ou ser informadas por cells_changed() se o
+    chamador já alterou o grid.
+
+    Exemplo:
+        planner = LPAStar(grid, inicio, objetivo, manhattan)
+        planner.solve()
+        result = planner.update_cells({(3, 4): True})  # Parede nova em (3, 4)
+        print(result.nodes_visited, "reexpansões")
+    """
+
+    def __init__(self, maze: MazeLike, start: Pos, goal: Pos,
+                 heuristic: Callable[[Pos, Pos], float],
+                 allow_diagonal: bool = False,
+                 diag_cost: float = 1.41421356237):
+        self.grid = as_grid(maze)
+        self.start = start
+        self.goal = goal
+        self.heuristic = heuristic
+        self.allow_diagonal = allow_diagonal
+        self.diag_cost = diag_cost
+        self.moves = STRAIGHT_MOVES + DIAGONAL_MOVES if allow_diagonal else STRAIGHT_MOVES
+
+        n = self.grid.rows * self.grid.cols
+        self.g = array('d', [INF]) * n
+        self.rhs = array('d', [INF]) * n
+        self._queued: Dict[int, Tuple[float, float]] = {}  # chave atual de quem está na fila
+        self._heap: List[Tuple[float, float, int, int]] = []
+        self._counter = 0
+        self.expansions = 0  # Total desde a criação
+        self._stale_pops = 0  # Entradas desatualizadas descartadas do heap, desde a criação
+
+        self._start_id = self.grid.index(start)
+        self._goal_id = self.grid.index(goal)
+        self.rhs[self._start_id] = 0.0
+        self._push(self._start_id)
+
+    # --- Estrutura do grafo ------------------------------------------------
+    def _neighbors(self, cell: int) -> List[Tuple[int, float]]:
+        """Vizinhos livres e custo da aresta; paredes não têm arestas."""
+        grid = self.grid
+        rows, cols, cells = grid.rows, grid.cols, grid.cells
+        if cells[cell] == WALL:
+            return []
+        r, c = divmod(cell, cols)
+        result = []
+        for dr, dc in self.moves:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                nb = nr * cols + nc
+                if cells[nb] != WALL:
+                    result.append((nb, self.diag_cost if dr and dc else 1.0))
+        return result
+
+    def _cells_around(self, cell: int) -> List[int]:
+        """A célula e todos os vizinhos dentro do grid, livres ou não."""
+        rows, cols = self.grid.rows, self.grid.cols
+        r, c = divmod(cell, cols)
+        around = [cell]
+        for dr, dc in self.moves:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols:
+                around.append(nr * cols + nc)
+        return around
+
+    # --- Fila de prioridade ------------------------------------------------
+    def _key(self, cell: int) -> Tuple[float, float]:
+        m = min(self.g[cell], self.rhs[cell])
+        return (m + self.heuristic(divmod(cell, self.grid.cols), self.goal), m)
+
+    def _push(self, cell: int):
+        key = self._key(cell)
+        self._queued[cell] = key
+        heapq.heappush(self._heap, (key[0], key[1], self._counter, cell))
+        self._counter += 1
+
+    def _top_key(self) -> Tuple[float, float]:
+        """Menor chave válida; entradas removidas ou desatualizadas são descartadas."""
+        heap, queued = self._heap, self._queued
+        while heap:
+            k1, k2, _, cell = heap[0]
+            if queued.get(cell) == (k1, k2):
+                return (k1, k2)
+            heapq.heappop(heap)
+            self._stale_pops += 1
+        return (INF, INF)
+
+    def _update_vertex(self, cell: int):
+        if cell != self._start_id:
+            best = INF
+            g = self.g
+            for nb, cost in self._neighbors(cell):
+                if g[nb] + cost < best:
+                    best = g[nb] + cost
+            self.rhs[cell] = best
+        self._queued.pop(cell, None)
+        if self.g[cell] != self.rhs[cell]:
+            self._push(cell)
+
+    # --- API ---------------------------------------------------------------
+    def cells_changed(self, positions: Iterable[Pos]):
+        """Informa células cujo estado (parede/livre) já foi alterado no grid."""
+        for pos in positions:
+            for cell in self._cells_around(self.grid.index(pos)):
+                self._update_vertex(cell)
+
+    def update_cells(self, changes: Union[Dict[Pos, bool], Iterable[Tuple[Pos, bool]]],
+                     limits: Optional[SearchLimits] = None) -> SearchResult:
+        """
+        Aplica edições {posição: é_parede} ao grid e replaneja (limits como em solve()).
+
+        Returns:
+            SearchResult do replanejamento; nodes_visited conta só as
+            reexpansões feitas para reparar a árvore
+        """
+        items = changes.items() if isinstance(changes, dict) else changes
+        changed = []
+        for pos, wall in items:
+            if self.grid.is_open(pos) == bool(wall):
+                self.grid.set_wall(pos, wall)
+                changed.append(pos)
+        self.cells_changed(changed)
+        return self.solve(limits)
+
+    def solve(self, limits: Optional[SearchLimits] = None) -> SearchResult:
+        """
+        Processa a fila até o objetivo ficar consistente e devolve o caminho atual.
+
+        Se limits interromper (ver utils/limits.py), o resultado é parcial
+        (stop_reason) e a fila fica como estava: o próximo solve() continua
+        de onde este parou. Em stats, reopened conta as expansões
+        subconsistentes (g invalidado e vértice devolvido à fila).
+        """
+        t0 = time.perf_counter()
+        g, rhs, goal_id = self.g, self.rhs, self._goal_id
+        expanded = 0
+        pushes_before = self._counter
+        max_frontier = len(self._queued)
+        stale_before = self._stale_pops
+        neighbor_checks = 0
+        reopened = 0
+        check_at = 0 if limits is not None else NO_CHECK  # Verifica já antes da primeira expansão
+
+        while (self._top_key() < self._key(goal_id)) or rhs[goal_id] != g[goal_id]:
+            if not self._heap:
+                break
+            if expanded == check_at:  # Prazo, teto de expansões ou cancelamento
+                reason = limits.check(expanded)
+                if reason is not None:
+                    self.expansions += expanded
+                    return limits.stopped(
+                        t0, reason, expanded,
+                        nodes_generated=self._counter - pushes_before,
+                        max_frontier_size=max_frontier,
+                        memory_bytes=len(g) * g.itemsize * 2 + frontier_nbytes(len(self._heap), (0.0, 0.0, 0, 0)),
+                        stats=self._stats(pushes_before, stale_before, expanded, neighbor_checks, reopened)
+                    )
+                check_at = limits.next_check(expanded)
+            _, _, _, cell = heapq.heappop(self._heap)
+            del self._queued[cell]
+            expanded += 1
+            neighbors = self._neighbors(cell)
+            neighbor_checks += len(neighbors)
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]  # Sobreconsistente: fixa o custo
+                for nb, _ in neighbors:
+                    self._update_vertex(nb)
+            else:
+                g[cell] = INF  # Subconsistente: invalida e propaga
+                reopened += 1
+                self._update_vertex(cell)
+                for nb, _ in neighbors:
+                    self._update_vertex(nb)
+            max_frontier = max(max_frontier, len(self._queued))
+
+        self.expansions += expanded
+        path = self._extract_path()
+        t1 = time.perf_counter()
+        memory = len(g) * g.itemsize * 2 + frontier_nbytes(len(self._heap), (0.0, 0.0, 0, 0))
+        return SearchResult(
+            found=path is not None,
+            path=path if path is not None else [],
+            depth=len(path) - 1 if path is not None else None,
+            nodes_visited=expanded,
+            time=t1 - t0,
+            nodes_generated=self._counter - pushes_before,
+            max_frontier_size=max_frontier,
+            path_cost=g[goal_id] if path is not None else None,
+            memory_bytes=memory,
+            stats=self._stats(pushes_before, stale_before, expanded, neighbor_checks, reopened)
+        )
+
+    def _stats(self, pushes_before: int, stale_before: int, expanded: int,
+               neighbor_checks: int, reopened: int) -> SearchStats:
+        """Contadores desta chamada de solve(), a partir dos totais do planejador."""
+        stale = self._stale_pops - stale_before
+        return SearchStats(pushes=self._counter - pushes_before, pops=expanded + stale, stale_pops=stale,
+                           neighbor_checks=neighbor_checks, reopened=reopened)
+
+    def _extract_path(self) -> Optional[PathView]:
+        """Do objetivo ao início, sempre pelo vizinho que minimiza g(vizinho) + custo."""
+        g, goal_id, start_id = self.g, self._goal_id, self._start_id
+        if g[goal_id] == INF:
+            return None
+        cells = array('i', [goal_id])
+        current = goal_id
+        while current != start_id:
+            best, best_cost = -1, INF
+            for nb, cost in self._neighbors(current):
+                if g[nb] + cost < best_cost:
+                    best, best_cost = nb, g[nb] + cost
+            if best < 0:
+                return None
+            current = best
+            cells.append(current)
+        cells.reverse()
+        return PathView(cells, self.grid.cols)
+
+
+def replan_vs_astar(planner: LPAStar, changes: Dict[Pos, bool]) -> Tuple[SearchResult, SearchResult]:
+    """
+    Aplica as edições no planejador e roda um A* do zero no grid resultante.
+
+    Returns:
+        (resultado do LPA*, resultado do A*); compare os nodes_visited para
+        ver quanto o replanejamento incremental economizou
+    """
+    incremental = planner.update_cells(changes)
+    full = astar(planner.grid, planner.start, planner.goal, planner.heuristic,
+                 planner.allow_diagonal, planner.diag_cost)
+    return incremental, full
@@ -0,0 +1,132 @@
+# solver.py
+# Solver: resolve muitas consultas (início, objetivo) no mesmo labirinto.
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+
+from search.astar import astar
+from search.bfs import bfs
+from search.bidirectional import bidirectional_astar, bidirectional_bfs
+from search.dfs import dfs
+from search.distance_map import distance_maps
+from search.greedy_search_optimized import greedy_search
+from search.heuristics import HEURISTICS, heuristic_table
+from search.jps import jps
+from search.landmarks import landmarks_for
+from utils.adjacency import neighbor_index
+from utils.components import component_index
+from utils.grid import MazeLike, as_grid
+from utils.instrument import SearchObserver, with_observer
+from utils.limits import SearchLimits
+from utils.search import SearchResult
+from utils.trace import TraceCallback, TraceStream
+from utils.workspace import SearchWorkspace
+
+Position = Tuple[int, int]
+Heuristic = Union[str, Callable[[Position, Position], float]]
+
+ALGORITHMS = ('bfs', 'dfs', 'greedy', 'astar', 'jps', 'bibfs', 'biastar', 'distmap')
+
+
+class Solver:
+    """
+    Resolve várias consultas no mesmo labirinto reaproveitando o pré-processamento.
+
+    O grid é convertido uma vez, o índice de vizinhos (CSR) é construído uma
+    vez e os buffers de busca (SearchWorkspace) são reaproveitados entre as
+    consultas, sem realocar dicionários e conjuntos a cada chamada.
+
+    Com heuristic_tables=True, A* e busca gulosa com heurística dada por nome
+    leem h de uma tabela por objetivo (heuristic_table, em cache) em vez de
+    chamar a função a cada nó; compensa quando muitas consultas compartilham
+    o mesmo objetivo.
+
+    algorithm='distmap' faz uma busca reversa por objetivo (search/distance_map.py)
+    e responde cada início em O(comprimento do caminho); compensa quando
+    muitas consultas compartilham poucos objetivos.
+
+    heuristic='alt' usa marcos (search/landmarks.py), calculados uma vez por
+    grid e reaproveitados por todas as consultas.
+
+    Exemplo:
+        solver = Solver(MAZES[9])
+        for result in solver.solve_many(pares, algorithm='astar', heuristic='manhattan'):
+            ...
+    """
+
+    def __init__(self, maze: MazeLike, allow_diagonal: bool = False, heuristic_tables: bool = False):
+        self.grid = as_grid(maze)
+        self.allow_diagonal = allow_diagonal
+        self.heuristic_tables = heuristic_tables
+        self.workspace = SearchWorkspace.for_grid(self.grid)
+        # Aquece o cache do grid com os índices que as buscas vão usar.
+        neighbor_index(self.grid)
+        component_index(self.grid)
+        if allow_diagonal:
+            neighbor_index(self.grid, True)
+            component_index(self.grid, True)
+
+    def solve(self, start: Position, goal: Position,
+              algorithm: str = 'astar', heuristic: Heuristic = 'manhattan',
+              trace: Optional[TraceCallback] = None,
+              limits: Optional[SearchLimits] = None,
+              observer: Optional[SearchObserver] = None) -> SearchResult:
+        """
+        Resolve uma única consulta; trace recebe os eventos da busca (ver utils/trace.py).
+
+        limits interrompe a busca por prazo, expansões ou cancelamento e devolve
+        um resultado parcial com stop_reason (ver utils/limits.py). O
+        pré-processamento de heuristic='alt' (marcos) não é limitado.
+        observer recebe os ganchos e mede a heurística (ver utils/instrument.py);
+        com tabela de heurística não há chamadas a medir.
+        """
+        grid, ws = self.grid, self.workspace
+        h_table = None
+        if heuristic == 'alt':
+            landmarks = landmarks_for(grid, allow_diagonal=self.allow_diagonal)
+            h = landmarks.heuristic
+            if self.heuristic_tables and algorithm in ('greedy', 'astar'):
+                h_table = landmarks.table(goal)
+        else:
+            h = HEURISTICS[heuristic] if isinstance(heuristic, str) else heuristic
+            if self.heuristic_tables and isinstance(heuristic, str) and algorithm in ('greedy', 'astar'):
+                h_table = heuristic_table(grid.rows, grid.cols, goal, heuristic)
+
+        if algorithm == 'bfs':
+            return with_observer(bfs, observer)(grid, start, goal, workspace=ws, trace=trace, limits=limits)
+        if algorithm == 'dfs':
+            return with_observer(dfs, observer)(grid, start, goal, workspace=ws, trace=trace, limits=limits)
+        if algorithm == 'greedy':
+            return with_observer(greedy_search, observer)(grid, start, goal, h, workspace=ws, h_table=h_table,
+                                                          trace=trace, limits=limits)
+        if algorithm == 'astar':
+            return with_observer(astar, observer)(grid, start, goal, h, self.allow_diagonal, workspace=ws,
+                                                  h_table=h_table, trace=trace, limits=limits)
+        if algorithm == 'jps':
+            return with_observer(jps, observer)(grid, start, goal, h, self.allow_diagonal, trace=trace,
+                                                limits=limits)
+        if algorithm == 'bibfs':
+            return with_observer(bidirectional_bfs, observer)(grid, start, goal, trace=trace, limits=limits)
+        if algorithm == 'biastar':
+            return with_observer(bidirectional_astar, observer)(grid, start, goal, h, self.allow_diagonal,
+                                                                trace=trace, limits=limits)
+        if algorithm == 'distmap':
+            if trace is not None:
+                raise ValueError("'distmap' não expande nós por consulta e não emite rastro.")
+            if observer is not None:
+                observer.search_started(algorithm)
+            result = distance_maps(grid).solve(start, goal, self.allow_diagonal, limits)
+            if observer is not None:
+                observer.search_finished(algorithm, result)
+            return result
+        raise ValueError(f"Algoritmo desconhecido: {algorithm!r} (opções: {', '.join(ALGORITHMS)}).")
+
+    def trace(self, start: Position, goal: Position, algorithm: str = 'astar',
+              heuristic: Heuristic = 'manhattan', maxsize: int = 16) -> TraceStream:
+        """Eventos da consulta como gerador (TraceStream); o resultado fica em .result no fim."""
+        return TraceStream(lambda trace: self.solve(start, goal, algorithm, heuristic, trace), maxsize)
+
+    def solve_many(self, pairs: Iterable[Tuple[Position, Position]],
+                   algorithm: str = 'astar', heuristic: Heuristic = 'manhattan',
+                   limits: Optional[SearchLimits] = None) -> Iterator[SearchResult]:
+        """Resolve os pares (início, objetivo) em ordem, entregando cada resultado assim que pronto."""
+        for start, goal in pairs:
+            yield self.solve(start, goal, algorithm, heuristic, limits=limits)
@@ -0,0 +1,155 @@
+# wavefront.py
+# BFS vetorizado: expande a fronteira inteira de uma vez com máscaras numpy.
+import time
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional; só este motor depende dele
+    np = None
+
+from utils.adjacency import STRAIGHT_MOVES
+from utils.components import cached_component_index, disconnected_result
+from utils.grid import Grid, MazeLike, as_grid
+from utils.limits import SearchLimits
+from utils.search import PathView, SearchResult
+
+Position = Tuple[int, int]
+
+UNREACHED = -1  # Distância de células ainda não alcançadas
+NO_PARENT = 0   # Direção do pai para o início e células não alcançadas
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("O motor 'wavefront' do BFS requer numpy (pip install numpy).")
+
+
+def wavefront(grid: Grid, start: Position, goal: Optional[Position] = None):
+    """
+    Inunda o grid a partir de `start`, um nível BFS inteiro por iteração.
+
+    A fronteira é um array de ids de células; cada movimento de STRAIGHT_MOVES
+    vira um deslocamento do array inteiro (id + dr*cols + dc), filtrado por
+    máscaras de borda e de visitados. Assim cada nível custa O(fronteira), e
+    não O(grid).
+
+    Retorna (dist, parent_dir), ambos (rows, cols): dist é int32 com a
+    distância em passos (-1 = inalcançável); parent_dir é int8 com k+1, onde k
+    é o índice em STRAIGHT_MOVES do movimento que levou o pai até a célula.
+    Se `goal` for dado, a inundação para no nível em que ele é alcançado.
+    """
+    dist, parent_dir, _, _ = flood(grid, start, goal)
+    return dist, parent_dir
+
+
+def flood(grid: Grid, start: Position, goal: Optional[Position] = None,
+          limits: Optional[SearchLimits] = None):
+    """
+    wavefront() com limites verificados uma vez por nível.
+
+    Retorna (dist, parent_dir, motivo de parada ou None, células expandidas).
+    Um nível nunca é interrompido pela metade, então max_expansions pode ser
+    ultrapassado em até um nível.
+    """
+    _require_numpy()
+    rows, cols = grid.rows, grid.cols
+    n = rows * cols
+    cells = np.frombuffer(grid.cells, dtype=np.uint8)
+    visited = cells == 1  # Paredes contam como já visitadas
+    dist = np.full(n, UNREACHED, dtype=np.int32)
+    parent_dir = np.full(n, NO_PARENT, dtype=np.int8)
+
+    start_id = start[0] * cols + start[1]
+    goal_id = goal[0] * cols + goal[1] if goal is not None else -1
+    visited[start_id] = True
+    dist[start_id] = 0
+    frontier = np.array([start_id], dtype=np.int64)
+
+    level = 0
+    expanded = 0
+    while frontier.size:
+        if goal_id >= 0 and dist[goal_id] != UNREACHED:
+            break
+        if limits is not None:  # Prazo, teto de expansões ou cancelamento, entre níveis
+            reason = limits.check(expanded)
+            if reason is not None:
+                return dist.reshape(rows, cols), parent_dir.reshape(rows, cols), reason, expanded
+        expanded += int(frontier.size)
+        level += 1
+        frontier_col = frontier % cols
+        reached = []
+        for k, (dr, dc) in enumerate(STRAIGHT_MOVES):
+            # Máscara de borda: o movimento não pode sair do grid.
+            if dr == -1:
+                src = frontier[frontier >= cols]
+            elif dr == 1:
+                src = frontier[frontier < n - cols]
+            elif dc == -1:
+                src = frontier[frontier_col != 0]
+            else:
+                src = frontier[frontier_col != cols - 1]
+            nb = src + (dr * cols + dc)
+            nb = nb[~visited[nb]]
+            visited[nb] = True
+            parent_dir[nb] = k + 1
+            reached.append(nb)
+        frontier = np.concatenate(reached)
+        dist[frontier] = level
+
+    return dist.reshape(rows, cols), parent_dir.reshape(rows, cols), None, expanded
+
+
+def path_from_directions(parent_dir, start: Position, goal: Position):
+    """Reconstrói o caminho seguindo as direções dos pais a partir do objetivo."""
+    path = [goal]
+    r, c = goal
+    while (r, c) != start:
+        dr, dc = STRAIGHT_MOVES[int(parent_dir[r, c]) - 1]
+        r, c = r - dr, c - dc
+        path.append((r, c))
+    path.reverse()
+    return path
+
+
+def bfs_wavefront(maze: MazeLike, start: Position, goal: Position,
+                  limits: Optional[SearchLimits] = None) -> SearchResult:
+    """BFS por frentes de onda vetorizadas; mesmos campos do bfs() com fila. limits é verificado por nível."""
+    grid = as_grid(maze)
+    _require_numpy()
+    t0 = time.perf_counter()
+    # Construir o índice custaria mais que a própria inundação vetorizada; usa só se já existir.
+    components = cached_component_index(grid)
+    if components is not None and not components.connected(grid.index(start), grid.index(goal)):
+        return disconnected_result(t0, informed=False)
+
+    dist, parent_dir, reason, expanded = flood(grid, start, goal, limits)
+    goal_dist = int(dist[goal])
+    # dist, parent_dir e a máscara de visitados (1 byte por célula) usada em wavefront().
+    memory_bytes = dist.nbytes + parent_dir.nbytes + dist.size
+    if reason is not None:
+        return limits.stopped(t0, reason, expanded, memory_bytes=memory_bytes)
+
+    if goal_dist == UNREACHED:
+        t1 = time.perf_counter()
+        return SearchResult(
+            found=False,
+            path=[],
+            depth=None,
+            nodes_visited=int(np.count_nonzero(dist != UNREACHED)),
+            time=t1 - t0,
+            memory_bytes=memory_bytes,
+        )
+
+    path = PathView.from_positions(path_from_directions(parent_dir, start, goal), grid.cols)
+    t1 = time.perf_counter()
+    # Expandidos: todas as células de níveis anteriores ao do objetivo, mais ele.
+    nodes_visited = int(np.count_nonzero((dist != UNREACHED) & (dist < goal_dist))) + 1
+    return SearchResult(
+        found=True,
+        path=path,
+        depth=len(path) - 1,
+        nodes_visited=nodes_visited,
+        time=t1 - t0,
+        memory_bytes=memory_bytes,
+    )
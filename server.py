@@ -0,0 +1,277 @@
+# server.py
+# Serviço local de consultas de caminho: JSON por linha sobre TCP, com lotes por labirinto e pool de processos.
+#
+# Protocolo: cada linha enviada é um objeto JSON; a resposta é uma linha JSON com o mesmo "id".
+# As respostas saem na ordem em que ficam prontas, não na ordem dos pedidos.
+#
+#   {"id": 1, "maze": "9", "start": [0, 0], "goal": [4, 14], "algorithm": "astar", "heuristic": "manhattan"}
+#   -> {"id": 1, "ok": true, "result": {"found": true, "path": [[0, 0], ...], "depth": ..., ...}}
+#   {"id": 2, "op": "mazes"}  -> labirintos carregados (linhas, colunas, início, objetivo)
+#   {"id": 3, "op": "stats"}  -> pedidos, lotes e tamanho médio dos lotes
+#   {"id": 4, "op": "ping"}
+#
+# Uso: python server.py [--port 8765] [--workers 4] [--files a.maze ...] [--random N --size S]
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from maze import MAZES
+from maze_generator import generate_corpus
+from search.heuristics import HEURISTICS
+from search.solver import ALGORITHMS, Solver
+from utils.grid import Grid, as_grid
+from utils.mazefile import load_maze
+from utils.shared_grids import attach_grids, release_grids, share_grids, worker_grid
+
+Position = Tuple[int, int]
+Query = Tuple[Position, Position, str, str, bool]
+
+DEFAULT_PORT = 8765
+DEFAULT_BATCH_WINDOW = 0.002  # Segundos que um pedido espera por outros do mesmo labirinto
+DEFAULT_MAX_BATCH = 64
+
+
+# --- Lado dos workers -----------------------------------------------------
+# Cada processo guarda um Solver por (labirinto, diagonais): índices e buffers
+# são montados na primeira consulta e reaproveitados por todos os lotes.
+
+_WORKER_SOLVERS: Dict[Tuple[str, bool], Solver] = {}
+
+
+def _solve_batch(maze_key: str, queries: List[Query]) -> List[Dict[str, Any]]:
+    """
+    Resolve um lote de consultas no mesmo labirinto, dentro de um processo do pool.
+
+    Cada consulta tem sua própria resposta de erro: uma consulta que falha
+    não derruba as outras do lote, que vêm de outros clientes.
+    """
+    responses = []
+    for start, goal, algorithm, heuristic, allow_diagonal in queries:
+        try:
+            solver = _WORKER_SOLVERS.get((maze_key, allow_diagonal))
+            if solver is None:
+                solver = _WORKER_SOLVERS[(maze_key, allow_diagonal)] = Solver(worker_grid(maze_key),
+                                                                                allow_diagonal)
+            result = solver.solve(start, goal, algorithm, heuristic)
+        except Exception as e:
+            responses.append({'ok': False, 'error': str(e) or type(e).__name__})
+        else:
+            responses.append({'ok': True, 'result': result.to_dict()})
+    return responses
+
+
+# --- Serviço --------------------------------------------------------------
+
+class PathService:
+    """
+    Atende consultas de caminho sem bloquear o event loop.
+
+    Os labirintos são copiados uma vez para memória compartilhada e anexados
+    pelos processos do pool. Pedidos para o mesmo labirinto que chegam dentro
+    de batch_window segundos (ou até max_batch pedidos) viram um único lote:
+    uma ida ao pool em vez de uma por pedido, e o mesmo Solver no worker.
+    """
+
+    def __init__(self, mazes: Dict[str, Grid], workers: int = 2,
+                 batch_window: float = DEFAULT_BATCH_WINDOW, max_batch: int = DEFAULT_MAX_BATCH):
+        self.mazes = mazes
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._blocks, specs = share_grids(mazes)
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=attach_grids, initargs=(specs,))
+        self._pending: Dict[str, List[Tuple[Query, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+
+    def close(self):
+        self._pool.shutdown(cancel_futures=True)
+        release_grids(self._blocks)
+
+    # --- Consultas ----------------------------------------------------------
+    def _parse_position(self, grid: Grid, value: Any, name: str) -> Position:
+        if not (isinstance(value, (list, tuple)) and len(value) == 2
+                and all(isinstance(v, int) and not isinstance(v, bool) for v in value)):
+            raise ValueError(f"'{name}' deve ser [linha, coluna].")
+        pos = (value[0], value[1])
+        if not grid.in_bounds(pos):
+            raise ValueError(f"'{name}' {list(pos)} fora do labirinto {grid.rows}x{grid.cols}.")
+        return pos
+
+    def _parse_query(self, message: Dict[str, Any]) -> Tuple[str, Query]:
+        """Valida o pedido no processo principal, para que erros não ocupem o pool."""
+        maze_key = str(message.get('maze'))
+        grid = self.mazes.get(maze_key)
+        if grid is None:
+            raise ValueError(f"Labirinto desconhecido: {maze_key!r} (carregados: {', '.join(self.mazes)}).")
+        start = self._parse_position(grid, message.get('start', grid.start), 'start')
+        goal = self._parse_position(grid, message.get('goal', grid.goal), 'goal')
+        algorithm = message.get('algorithm', 'astar')
+        if not isinstance(algorithm, str) or algorithm not in ALGORITHMS:
+            raise ValueError(f"Algoritmo desconhecido: {algorithm!r} (opções: {', '.join(ALGORITHMS)}).")
+        heuristic = message.get('heuristic', 'manhattan')
+        if not isinstance(heuristic, str) or (heuristic != 'alt' and heuristic not in HEURISTICS):
+            raise ValueError(f"Heurística desconhecida: {heuristic!r}.")
+        return maze_key, (start, goal, algorithm, heuristic, bool(message.get('allow_diagonal', False)))
+
+    async def solve(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Enfileira a consulta no lote do seu labirinto e espera a resposta."""
+        maze_key, query = self._parse_query(message)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.setdefault(maze_key, [])
+        batch.append((query, future))
+        if len(batch) >= self.max_batch:
+            self._flush(maze_key)
+        elif maze_key not in self._timers:
+            self._timers[maze_key] = loop.call_later(self.batch_window, self._flush, maze_key)
+        return await future
+
+    def _flush(self, maze_key: str):
+        """Envia o lote pendente do labirinto para o pool."""
+        timer = self._timers.pop(maze_key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(maze_key, [])
+        if not batch:
+            return
+        self.batches += 1
+        queries = [query for query, _ in batch]
+        task = asyncio.get_running_loop().run_in_executor(self._pool, _solve_batch, maze_key, queries)
+        task.add_done_callback(lambda done: self._deliver(batch, done))
+
+    @staticmethod
+    def _deliver(batch: List[Tuple[Query, asyncio.Future]], done: asyncio.Future):
+        if done.cancelled():
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+            return
+        error = done.exception()
+        for i, (_, future) in enumerate(batch):
+            if future.done():
+                continue  # Cliente desistiu
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[i])
+
+    # --- Protocolo ----------------------------------------------------------
+    async def handle(self, message: Any) -> Dict[str, Any]:
+        """Resposta (já com o "id" do pedido) para uma mensagem decodificada."""
+        if not isinstance(message, dict):
+            self.errors += 1
+            return {'ok': False, 'error': "Mensagem deve ser um objeto JSON."}
+        response: Dict[str, Any]
+        op = message.get('op', 'solve')
+        try:
+            if op == 'solve':
+                self.requests += 1
+                response = await self.solve(message)
+            elif op == 'mazes':
+                response = {'ok': True, 'mazes': {
+                    key: {'rows': g.rows, 'cols': g.cols,
+                          'start': list(g.start) if g.start else None,
+                          'goal': list(g.goal) if g.goal else None}
+                    for key, g in self.mazes.items()}}
+            elif op == 'stats':
+                response = {'ok': True, 'requests': self.requests, 'batches': self.batches,
+                            'errors': self.errors,
+                            'mean_batch': self.requests / self.batches if self.batches else 0.0}
+            elif op == 'ping':
+                response = {'ok': True}
+            else:
+                raise ValueError(f"Operação desconhecida: {op!r}.")
+        except Exception as e:  # Pedido inválido ou falha no worker: responde em vez de derrubar a conexão
+            response = {'ok': False, 'error': str(e) or type(e).__name__}
+        if not response['ok']:
+            self.errors += 1
+        if 'id' in message:
+            response['id'] = message['id']
+        return response
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter):
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            response = {'ok': False, 'error': f"JSON inválido: {e}"}
+            self.errors += 1
+        else:
+            response = await self.handle(message)
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+        await writer.drain()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Uma conexão: lê pedidos linha a linha e atende vários ao mesmo tempo."""
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._respond(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def load_service_mazes(files: Optional[List[str]] = None, random_count: int = 0, size: int = 100,
+                       density: float = 0.25, seed: int = 0) -> Dict[str, Grid]:
+    """Labirintos servidos, por nome: os 9 padrão ('1'..'9'), arquivos .maze (nome sem extensão) e gerados."""
+    mazes = {str(maze_id): as_grid(maze) for maze_id, maze in MAZES.items()}
+    for path in files or []:
+        mazes[os.path.splitext(os.path.basename(path))[0]] = load_maze(path)
+    if random_count > 0:
+        for maze_id, grid in generate_corpus(random_count, size, density, seed).items():
+            mazes[f"random-{maze_id}"] = grid
+    return mazes
+
+
+async def serve(service: PathService, host: str = '127.0.0.1', port: int = DEFAULT_PORT):
+    server = await asyncio.start_server(service.handle_client, host, port)
+    print(f"Servindo {len(service.mazes)} labirintos em {host}:{port} "
+          f"(lotes de até {service.max_batch}, janela de {service.batch_window * 1000:.1f} ms)")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço JSON/TCP de consultas de caminho.")
+    parser.add_argument('--host', default='127.0.0.1', help="endereço (padrão: 127.0.0.1, só local)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"porta (padrão: {DEFAULT_PORT})")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                        help="processos do pool (padrão: número de CPUs)")
+    parser.add_argument('--batch-window', type=float, default=DEFAULT_BATCH_WINDOW * 1000, metavar='MS',
+                        help="espera máxima por pedidos do mesmo labirinto, em ms (padrão: 2)")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help=f"pedidos por lote (padrão: {DEFAULT_MAX_BATCH})")
+    parser.add_argument('--files', nargs='+', metavar='ARQ', help="labirintos extras em arquivos .maze")
+    parser.add_argument('--random', type=int, default=0, metavar='N', help="N labirintos gerados extras")
+    parser.add_argument('--size', type=int, default=100, help="lado dos labirintos gerados (padrão: 100)")
+    parser.add_argument('--density', type=float, default=0.25, help="densidade de paredes (padrão: 0.25)")
+    parser.add_argument('--seed', type=int, default=0, help="semente base dos labirintos gerados")
+    args = parser.parse_args()
+
+    mazes = load_service_mazes(args.files, args.random, args.size, args.density, args.seed)
+    service = PathService(mazes, args.workers, args.batch_window / 1000, args.max_batch)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nEncerrando.")
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
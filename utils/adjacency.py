@@ -0,0 +1,112 @@
+# adjacency.py
+# Índice de vizinhos pré-computado (CSR) compartilhado pelos algoritmos de busca.
+from __future__ import annotations
+from array import array
+from typing import Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional; sem ele o índice é montado em Python
+    np = None
+
+from utils.grid import Grid, WALL
+
+# Ordem dos vizinhos: a de get_neighbors (cima, baixo, esquerda, direita)
+# seguida, com diagonais, da ordem de neighbors_8 no A*.
+STRAIGHT_MOVES: Tuple[Tuple[int, int], ...] = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIAGONAL_MOVES: Tuple[Tuple[int, int], ...] = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class NeighborIndex:
+    """
+    Adjacência em formato CSR (compressed sparse row) sobre as células do grid.
+
+    O id de uma célula é seu índice plano (linha * cols + coluna). Os vizinhos
+    livres da célula i são targets[offsets[i]:offsets[i + 1]]; paredes têm
+    faixa vazia. offsets e targets são array('i') (int32).
+    """
+    __slots__ = ('rows', 'cols', 'diagonal', 'offsets', 'targets')
+
+    def __init__(self, rows: int, cols: int, diagonal: bool, offsets: array, targets: array):
+        self.rows = rows
+        self.cols = cols
+        self.diagonal = diagonal
+        self.offsets = offsets
+        self.targets = targets
+
+    def neighbors(self, cell: int) -> array:
+        """Ids dos vizinhos livres de uma célula."""
+        return self.targets[self.offsets[cell]:self.offsets[cell + 1]]
+
+    def degree(self, cell: int) -> int:
+        return self.offsets[cell + 1] - self.offsets[cell]
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos dois arrays do índice."""
+        return (len(self.offsets) + len(self.targets)) * self.offsets.itemsize
+
+
+BAND_CELLS = 1 << 20  # Células por faixa de linhas na montagem vetorizada
+
+
+def _build_numpy(grid: Grid, moves: Tuple[Tuple[int, int], ...]) -> Tuple[array, array]:
+    """
+    offsets e targets com numpy, em faixas de linhas para limitar a memória.
+
+    Para cada faixa monta a matriz (células x movimentos) de ids vizinhos e
+    a máscara de vizinhos livres; o achatamento em ordem de linha já dá os
+    alvos célula a célula, na ordem de moves.
+    """
+    rows, cols = grid.rows, grid.cols
+    free = np.zeros((rows + 2, cols + 2), dtype=bool)  # Borda de paredes
+    free[1:-1, 1:-1] = np.frombuffer(grid.cells, dtype=np.uint8).reshape(rows, cols) != WALL
+    degree = np.zeros(rows * cols, dtype=np.int64)
+    targets = array('i')
+    band = max(1, BAND_CELLS // max(cols, 1))
+    for top in range(0, rows, band):
+        bottom = min(rows, top + band)
+        cell_free = free[1 + top:1 + bottom, 1:-1]
+        ids = np.arange(top * cols, bottom * cols, dtype=np.int32).reshape(bottom - top, cols)
+        valid = np.empty((bottom - top, cols, len(moves)), dtype=bool)
+        neighbor = np.empty((bottom - top, cols, len(moves)), dtype=np.int32)
+        for k, (dr, dc) in enumerate(moves):
+            valid[:, :, k] = cell_free & free[1 + top + dr:1 + bottom + dr, 1 + dc:1 + cols + dc]
+            neighbor[:, :, k] = ids + (dr * cols + dc)
+        degree[top * cols:bottom * cols] = valid.sum(axis=2).ravel()
+        targets.frombytes(neighbor[valid].tobytes())
+    offsets = array('i', [0])
+    offsets.frombytes(np.cumsum(degree).astype(np.int32).tobytes())
+    return offsets, targets
+
+
+def build_neighbor_index(grid: Grid, diagonal: bool = False) -> NeighborIndex:
+    """Constrói o índice CSR em uma única passada pelo grid (vetorizada com numpy)."""
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    moves = STRAIGHT_MOVES + DIAGONAL_MOVES if diagonal else STRAIGHT_MOVES
+    if np is not None:
+        offsets, targets = _build_numpy(grid, moves)
+        return NeighborIndex(rows, cols, diagonal, offsets, targets)
+    offsets = array('i', [0])
+    targets = array('i')
+    append_target = targets.append
+    append_offset = offsets.append
+
+    for r in range(rows):
+        base = r * cols
+        for c in range(cols):
+            if cells[base + c] != WALL:
+                for dr, dc in moves:
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < rows and 0 <= nc < cols:
+                        nb = nr * cols + nc
+                        if cells[nb] != WALL:
+                            append_target(nb)
+            append_offset(len(targets))
+
+    return NeighborIndex(rows, cols, diagonal, offsets, targets)
+
+
+def neighbor_index(grid: Grid, diagonal: bool = False) -> NeighborIndex:
+    """Índice CSR do grid, reaproveitado entre consultas enquanto o grid não mudar."""
+    return grid.cached(('neighbors', diagonal), lambda g: build_neighbor_index(g, diagonal))
@@ -0,0 +1,200 @@
+# components.py
+# Índice de componentes conexas: "início e objetivo estão na mesma região?" em O(1).
+from __future__ import annotations
+import time
+from array import array
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional; sem ele a rotulação usa o índice CSR em Python
+    np = None
+
+from utils.adjacency import neighbor_index
+from utils.grid import Grid, WALL
+from utils.search import SearchResult, SearchStats
+
+Position = Tuple[int, int]
+
+NO_COMPONENT = -1  # Rótulo das paredes
+
+
+class ComponentIndex:
+    """
+    Rótulo da componente conexa de cada célula livre (paredes = -1).
+
+    labels[id] é o rótulo da célula e sizes[rótulo] o número de células da
+    componente. Duas células estão ligadas por algum caminho se, e só se,
+    têm o mesmo rótulo.
+    """
+    __slots__ = ('rows', 'cols', 'diagonal', 'labels', 'sizes')
+
+    def __init__(self, rows: int, cols: int, diagonal: bool, labels: array, sizes: array):
+        self.rows = rows
+        self.cols = cols
+        self.diagonal = diagonal
+        self.labels = labels
+        self.sizes = sizes
+
+    @property
+    def count(self) -> int:
+        """Número de componentes."""
+        return len(self.sizes)
+
+    def label(self, pos: Position) -> int:
+        return self.labels[pos[0] * self.cols + pos[1]]
+
+    def connected(self, a: int, b: int) -> bool:
+        """True se as células de ids a e b estão na mesma componente (ou são a mesma célula)."""
+        return a == b or (self.labels[a] != NO_COMPONENT and self.labels[a] == self.labels[b])
+
+    def size_of(self, cell: int) -> int:
+        """Tamanho da componente da célula (0 para parede)."""
+        label = self.labels[cell]
+        return 0 if label == NO_COMPONENT else self.sizes[label]
+
+    def largest(self) -> int:
+        """Rótulo da maior componente (-1 se não há células livres)."""
+        if not self.sizes:
+            return NO_COMPONENT
+        return max(range(len(self.sizes)), key=self.sizes.__getitem__)
+
+    def region(self, cell: int) -> array:
+        """Ids de todas as células da componente de `cell`, em ordem crescente."""
+        label = self.labels[cell]
+        if label == NO_COMPONENT:
+            return array('i')
+        labels = self.labels
+        return array('i', [i for i in range(len(labels)) if labels[i] == label])
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.labels) * self.labels.itemsize + len(self.sizes) * self.sizes.itemsize
+
+
+def _pair_slices(rows: int, cols: int, dr: int, dc: int):
+    """Fatias (a, b) do grid 2D tais que b é a célula a + (dr, dc), para dr >= 0."""
+    rows_a, rows_b = slice(0, rows - dr), slice(dr, rows)
+    if dc >= 0:
+        cols_a, cols_b = slice(0, cols - dc), slice(dc, cols)
+    else:
+        cols_a, cols_b = slice(-dc, cols), slice(0, cols + dc)
+    return (rows_a, cols_a), (rows_b, cols_b)
+
+
+def _label_numpy(grid: Grid, diagonal: bool) -> Tuple[array, array]:
+    """
+    Rótulos e tamanhos por ganchos de raízes + salto de ponteiros, tudo vetorizado.
+
+    parent[id] começa em id. A cada rodada, em cada aresta entre células
+    livres cujas raízes diferem, a raiz maior passa a apontar para a menor
+    (np.minimum.at), e depois parent = parent[parent] até estabilizar; as
+    arestas já resolvidas saem da lista. A raiz de cada componente termina
+    sendo seu menor id, então os rótulos saem na mesma ordem da varredura
+    em Python. Poucas rodadas bastam, sem índice CSR.
+    """
+    rows, cols = grid.rows, grid.cols
+    n = rows * cols
+    dtype = np.int32 if n <= np.iinfo(np.int32).max else np.int64
+    free = np.frombuffer(grid.cells, dtype=np.uint8).reshape(rows, cols) != WALL
+    ids = np.arange(n, dtype=dtype).reshape(rows, cols)
+    moves = ((0, 1), (1, 0), (1, 1), (1, -1)) if diagonal else ((0, 1), (1, 0))
+    heads, tails = [], []
+    for dr, dc in moves:
+        a, b = _pair_slices(rows, cols, dr, dc)
+        mask = free[a] & free[b]
+        heads.append(ids[a][mask])
+        tails.append(ids[b][mask])
+    del ids
+    head, tail = np.concatenate(heads), np.concatenate(tails)
+    del heads, tails
+    parent = np.arange(n, dtype=dtype)
+    while True:
+        root_a, root_b = parent[head], parent[tail]
+        differ = root_a != root_b
+        if not differ.any():
+            break
+        head, tail = head[differ], tail[differ]
+        root_a, root_b = root_a[differ], root_b[differ]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        while True:  # Salto de ponteiros: todo parent passa a ser uma raiz
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+    free_flat = free.ravel()
+    is_root = free_flat & (parent == np.arange(n, dtype=dtype))
+    root_label = np.cumsum(is_root, dtype=np.int32) - 1
+    labels_np = np.where(free_flat, root_label[parent], NO_COMPONENT).astype(np.int32)
+    labels = array('i')
+    labels.frombytes(labels_np.tobytes())
+    sizes = array('i')
+    sizes.frombytes(np.bincount(labels_np[free_flat], minlength=int(is_root.sum())).astype(np.int32).tobytes())
+    return labels, sizes
+
+
+def build_component_index(grid: Grid, diagonal: bool = False) -> ComponentIndex:
+    """
+    Rotula as componentes em O(células).
+
+    Com numpy, por ganchos vetorizados sobre o próprio buffer (_label_numpy),
+    sem montar o índice CSR; sem numpy, uma inundação por componente sobre
+    o índice CSR.
+    """
+    if np is not None:
+        labels, sizes = _label_numpy(grid, diagonal)
+        return ComponentIndex(grid.rows, grid.cols, diagonal, labels, sizes)
+    index = neighbor_index(grid, diagonal)
+    offsets, targets = index.offsets, index.targets
+    cells = grid.cells
+    n = grid.rows * grid.cols
+    labels = array('i', [NO_COMPONENT]) * n
+    sizes = array('i')
+
+    for seed in range(n):
+        if labels[seed] != NO_COMPONENT or cells[seed] == WALL:
+            continue
+        label = len(sizes)
+        labels[seed] = label
+        stack = [seed]
+        size = 0
+        while stack:
+            current = stack.pop()
+            size += 1
+            for nb in targets[offsets[current]:offsets[current + 1]]:
+                if labels[nb] == NO_COMPONENT:
+                    labels[nb] = label
+                    stack.append(nb)
+        sizes.append(size)
+
+    return ComponentIndex(grid.rows, grid.cols, diagonal, labels, sizes)
+
+
+def component_index(grid: Grid, diagonal: bool = False) -> ComponentIndex:
+    """Índice de componentes do grid, em cache até a próxima edição (como o índice de vizinhos)."""
+    return grid.cached(('components', diagonal), lambda g: build_component_index(g, diagonal))
+
+
+def cached_component_index(grid: Grid, diagonal: bool = False) -> Optional[ComponentIndex]:
+    """Índice de componentes se já estiver em cache no grid, sem construí-lo."""
+    return grid.peek(('components', diagonal))
+
+
+def disconnected_result(t0: float, informed: bool = True) -> SearchResult:
+    """
+    Resultado para início e objetivo em componentes diferentes: nenhum nó é expandido.
+
+    informed=True preenche também os campos extras (gerados, fronteira) que
+    as buscas com heap reportam.
+    """
+    extra = {'nodes_generated': 0, 'max_frontier_size': 0} if informed else {}
+    return SearchResult(
+        found=False,
+        path=[],
+        depth=None,
+        nodes_visited=0,
+        time=time.perf_counter() - t0,
+        memory_bytes=0,
+        stats=SearchStats(),
+        **extra
+    )
@@ -0,0 +1,190 @@
+# grid.py
+# Representação compacta do labirinto: paredes em um buffer plano de bytes.
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple, Union
+
+Position = Tuple[int, int]
+Cell = Union[str, int]
+
+WALL = 1  # Byte que marca parede
+OPEN = 0  # Byte que marca célula livre
+
+
+class GridRow:
+    """Visão de uma linha do Grid; mantém compatível o acesso grid[linha][coluna]."""
+    __slots__ = ('_grid', '_row')
+
+    def __init__(self, grid: 'Grid', row: int):
+        self._grid = grid
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._grid.cols
+
+    def __getitem__(self, col: int) -> int:
+        cols = self._grid.cols
+        if col < 0:
+            col += cols
+        if not 0 <= col < cols:
+            raise IndexError("coluna fora do labirinto")
+        return self._grid.cells[self._row * cols + col]
+
+    def __setitem__(self, col: int, value: Cell):
+        self._grid.set_wall((self._row, col), value == WALL)
+
+    def __iter__(self) -> Iterator[int]:
+        base = self._row * self._grid.cols
+        return iter(self._grid.cells[base:base + self._grid.cols])
+
+    def count(self, value: int) -> int:
+        """Conta quantas células da linha têm o valor informado."""
+        return sum(1 for cell in self if cell == value)
+
+
+class Grid:
+    """
+    Labirinto armazenado em um buffer plano (bytearray, memoryview ou numpy uint8).
+
+    A célula (r, c) fica no índice r * cols + c; 1 = parede, 0 = livre.
+    Início e objetivo são guardados à parte, fora do buffer. Estruturas
+    derivadas (ex.: índice de vizinhos) ficam em cache até a próxima edição
+    feita por set_wall(); quem escreve direto no buffer deve chamar invalidate().
+    """
+    __slots__ = ('rows', 'cols', 'cells', 'start', 'goal', '_cache')
+
+    def __init__(self, rows: int, cols: int, cells=None,
+                 start: Optional[Position] = None, goal: Optional[Position] = None):
+        if cells is None:
+            cells = bytearray(rows * cols)
+        elif len(cells) != rows * cols:
+            raise ValueError(f"Buffer com {len(cells)} células não corresponde a {rows}x{cols}.")
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.start = start
+        self.goal = goal
+        self._cache: Dict[Hashable, Any] = {}
+
+    @classmethod
+    def from_list(cls, maze: List[List[Cell]]) -> 'Grid':
+        """Converte o formato lista de listas ('S', 'G', 0, 1) em um Grid."""
+        rows = len(maze)
+        cols = len(maze[0]) if rows > 0 else 0
+        cells = bytearray(rows * cols)
+        start = goal = None
+        for r, row in enumerate(maze):
+            base = r * cols
+            for c, value in enumerate(row):
+                if value == WALL:
+                    cells[base + c] = WALL
+                elif value == "S":
+                    start = (r, c)
+                elif value == "G":
+                    goal = (r, c)
+        return cls(rows, cols, cells, start, goal)
+
+    @classmethod
+    def from_buffer(cls, buffer, rows: int, cols: int,
+                    start: Optional[Position] = None, goal: Optional[Position] = None) -> 'Grid':
+        """Cria um Grid sobre um buffer existente (bytes, mmap, numpy) sem copiar."""
+        return cls(rows, cols, memoryview(buffer).cast('B'), start, goal)
+
+    @classmethod
+    def from_numpy(cls, array, start: Optional[Position] = None,
+                   goal: Optional[Position] = None) -> 'Grid':
+        """Cria um Grid que compartilha memória com um array numpy uint8 2D."""
+        rows, cols = array.shape
+        return cls.from_buffer(array, rows, cols, start, goal)
+
+    def to_list(self) -> List[List[Cell]]:
+        """Converte de volta para lista de listas, marcando 'S' e 'G'."""
+        maze: List[List[Cell]] = [list(row) for row in self]
+        if self.start is not None:
+            maze[self.start[0]][self.start[1]] = "S"
+        if self.goal is not None:
+            maze[self.goal[0]][self.goal[1]] = "G"
+        return maze
+
+    def to_numpy(self):
+        """Retorna uma visão numpy (rows, cols) uint8 do buffer, sem cópia."""
+        import numpy as np
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.rows, self.cols)
+
+    def copy(self) -> 'Grid':
+        """Cópia independente do Grid (buffer sempre em bytearray)."""
+        return Grid(self.rows, self.cols, bytearray(self.cells), self.start, self.goal)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, row: int) -> GridRow:
+        if row < 0:
+            row += self.rows
+        if not 0 <= row < self.rows:
+            raise IndexError("linha fora do labirinto")
+        return GridRow(self, row)
+
+    def __iter__(self) -> Iterator[GridRow]:
+        return (GridRow(self, r) for r in range(self.rows))
+
+    def index(self, pos: Position) -> int:
+        """Índice plano da posição (linha, coluna)."""
+        return pos[0] * self.cols + pos[1]
+
+    def position(self, index: int) -> Position:
+        """Posição (linha, coluna) de um índice plano."""
+        return divmod(index, self.cols)
+
+    def in_bounds(self, pos: Position) -> bool:
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    def is_open(self, pos: Position) -> bool:
+        """True se a posição está dentro do grid e não é parede."""
+        r, c = pos
+        return 0 <= r < self.rows and 0 <= c < self.cols and self.cells[r * self.cols + c] != WALL
+
+    def set_wall(self, pos: Position, wall: bool = True):
+        """Marca (ou desmarca) uma parede na posição."""
+        r, c = pos
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise IndexError(f"Posição {pos} fora do labirinto.")
+        self.cells[r * self.cols + c] = WALL if wall else OPEN
+        self._cache.clear()
+
+    def invalidate(self):
+        """Descarta as estruturas derivadas em cache (após editar o buffer diretamente)."""
+        self._cache.clear()
+
+    def cached(self, key: Hashable, build: Callable[['Grid'], Any]) -> Any:
+        """Retorna a estrutura derivada de `key`, construindo-a com build(grid) se preciso."""
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = build(self)
+            return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """Estrutura derivada de `key` se já estiver em cache, sem construí-la."""
+        return self._cache.get(key)
+
+    def wall_count(self) -> int:
+        """Total de paredes no grid."""
+        cells = self.cells
+        if isinstance(cells, (bytes, bytearray)):
+            return cells.count(WALL)
+        return bytes(cells).count(WALL)
+
+
+MazeLike = Union[Grid, List[List[Cell]]]
+
+
+def as_grid(maze: MazeLike) -> Grid:
+    """
+    Adapta qualquer labirinto aceito pelos algoritmos para Grid.
+
+    Um Grid é devolvido como está (sem cópia); listas de listas são
+    convertidas em uma única passada.
+    """
+    if isinstance(maze, Grid):
+        return maze
+    return Grid.from_list(maze)
@@ -0,0 +1,140 @@
+# instrument.py
+# Observadores das buscas: ganchos de início e fim e medições que só existem quando há observador.
+#
+# Os contadores gratuitos (pushes, pops, stale_pops, reopened) vêm sempre em
+# result.stats. Os que custam algo a cada nó (neighbor_checks, chamadas e
+# tempo da heurística) só são medidos na variante que @observed registra em
+# search.observed (with_observer(search, observer) a devolve): ela troca a
+# heurística por uma versão cronometrada e pendura um contador no gancho
+# trace= (ver utils/trace.py), já protegido por "if trace is not None" no
+# laço. A busca em si continua sendo a função original, sem invólucro.
+# Com observador, result.time inclui o custo da medição.
+from __future__ import annotations
+import functools
+import inspect
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Tuple
+
+from utils.adjacency import neighbor_index
+from utils.grid import as_grid
+from utils.search import SearchResult, SearchStats
+from utils.trace import EXPAND, TraceCallback
+
+Position = Tuple[int, int]
+
+
+class TimedHeuristic:
+    """Heurística que conta as chamadas e soma o tempo gasto nelas."""
+    __slots__ = ('function', 'calls', 'seconds')
+
+    def __init__(self, function: Callable[[Position, Position], float]):
+        self.function = function
+        self.calls = 0
+        self.seconds = 0.0
+
+    def __call__(self, pos: Position, goal: Position) -> float:
+        t0 = time.perf_counter()
+        value = self.function(pos, goal)
+        self.seconds += time.perf_counter() - t0
+        self.calls += 1
+        return value
+
+
+class NeighborCounter:
+    """Callback de rastro que soma o grau (vizinhos livres) de cada célula expandida."""
+    __slots__ = ('offsets', 'forward', 'checks')
+
+    def __init__(self, offsets, forward: Optional[TraceCallback] = None):
+        self.offsets = offsets
+        self.forward = forward  # Rastro pedido pelo chamador, repassado sem mudanças
+        self.checks = 0
+
+    def __call__(self, kind: int, cell: int):
+        if kind == EXPAND:
+            self.checks += self.offsets[cell + 1] - self.offsets[cell]
+        if self.forward is not None:
+            self.forward(kind, cell)
+
+
+class SearchObserver:
+    """Observador de buscas; as subclasses sobrescrevem os ganchos que interessam."""
+
+    def search_started(self, algorithm: str):
+        """Chamado antes da busca."""
+
+    def search_finished(self, algorithm: str, result: SearchResult):
+        """Chamado com o resultado, com neighbor_checks e a heurística já medidos em result.stats."""
+
+
+class StatsCollector(SearchObserver):
+    """Soma os SearchStats de todas as buscas observadas, por algoritmo."""
+
+    def __init__(self):
+        self.searches: Dict[str, int] = defaultdict(int)
+        self.totals: Dict[str, SearchStats] = {}
+
+    def search_finished(self, algorithm: str, result: SearchResult):
+        stats = result.stats
+        if stats is None:
+            return
+        self.searches[algorithm] += 1
+        total = self.totals.setdefault(algorithm, SearchStats())
+        total.pushes += stats.pushes
+        total.pops += stats.pops
+        total.stale_pops += stats.stale_pops
+        total.reopened += stats.reopened
+        if stats.neighbor_checks is not None:
+            total.neighbor_checks = (total.neighbor_checks or 0) + stats.neighbor_checks
+        if stats.heuristic_calls is not None:
+            total.heuristic_calls = (total.heuristic_calls or 0) + stats.heuristic_calls
+            total.heuristic_time = (total.heuristic_time or 0.0) + stats.heuristic_time
+
+
+def observed(algorithm: str):
+    """
+    Decorador das buscas: registra em search.observed a versão com observador.
+
+    A busca decorada é a própria função, sem camada extra: quem não observa
+    chama direto o laço. search.observed(..., observer=SearchObserver) é a
+    variante instrumentada (use with_observer). Nela, a heurística (se houver
+    e não houver h_table) vira uma TimedHeuristic, o rastro passa por um
+    NeighborCounter (exceto no BFS com engine='wavefront', que não emite
+    rastro) e o resultado recebe as medições.
+    """
+    def decorate(search):
+        signature = inspect.signature(search)
+        has_heuristic = 'heuristic' in signature.parameters
+
+        @functools.wraps(search)
+        def wrapper(*args, observer: SearchObserver, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            arguments = bound.arguments
+            timer = counter = None
+            if has_heuristic and arguments.get('heuristic') is not None and arguments.get('h_table') is None:
+                timer = arguments['heuristic'] = TimedHeuristic(arguments['heuristic'])
+            if arguments.get('engine', 'queue') == 'queue':
+                index = neighbor_index(as_grid(arguments['maze']), arguments.get('allow_diagonal', False))
+                counter = arguments['trace'] = NeighborCounter(index.offsets, arguments.get('trace'))
+            observer.search_started(algorithm)
+            result = search(*bound.args, **bound.kwargs)
+            if result.stats is not None:
+                if counter is not None:
+                    result.stats.neighbor_checks = counter.checks
+                if timer is not None:
+                    result.stats.heuristic_calls = timer.calls
+                    result.stats.heuristic_time = timer.seconds
+            observer.search_finished(algorithm, result)
+            return result
+
+        search.observed = wrapper
+        return search
+    return decorate
+
+
+def with_observer(search: Callable[..., SearchResult],
+                  observer: Optional[SearchObserver]) -> Callable[..., SearchResult]:
+    """A busca decorada com @observed ligada a observer; sem observador, a própria busca."""
+    if observer is None:
+        return search
+    return functools.partial(search.observed, observer=observer)
@@ -0,0 +1,125 @@
+# limits.py
+# Limites de busca: prazo, número máximo de expansões e cancelamento cooperativo.
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from utils.search import SearchResult
+
+# Motivos de parada (SearchResult.stop_reason); None = a busca terminou por conta própria.
+STOP_TIMEOUT = 'timeout'
+STOP_MAX_EXPANSIONS = 'max_expansions'
+STOP_CANCELLED = 'cancelled'
+
+DEFAULT_CHECK_EVERY = 1024  # Expansões entre duas verificações de prazo e cancelamento
+NO_CHECK = -1  # O contador de expansões nunca chega aqui: sem limites, nenhuma verificação
+
+
+class CancelToken:
+    """Sinal de cancelamento compartilhado entre quem pede e a busca (qualquer objeto com is_set() serve)."""
+    __slots__ = ('_event',)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+
+@dataclass
+class SearchLimits:
+    """
+    Limites verificados pela busca a cada check_every expansões.
+
+    deadline é um instante de time.perf_counter() (ver SearchLimits.timeout);
+    cancel é um CancelToken ou um threading.Event (ex.: stop_event da GUI).
+    max_expansions é exato: a busca para com nodes_visited == max_expansions,
+    inclusive 0 (nada é expandido).
+
+    Nas buscas, o custo sem limites é uma comparação de inteiros por
+    expansão (contador == próxima verificação, que nunca chega); a
+    verificação anterior ao laço cobre teto <= 0, prazo vencido e
+    cancelamento pedido antes da busca começar:
+
+        check_at = first_check(limits)
+        reason = stop_before_start(limits)
+        if reason is not None:
+            return limits.stopped(t0, reason, 0, ...)
+        ...
+        if nodes_expanded == check_at:
+            reason = limits.check(nodes_expanded)
+            if reason is not None:
+                return limits.stopped(t0, reason, nodes_expanded, ...)
+            check_at = limits.next_check(nodes_expanded)
+    """
+    deadline: Optional[float] = None
+    max_expansions: Optional[int] = None
+    cancel: Optional[object] = None
+    check_every: int = DEFAULT_CHECK_EVERY
+
+    @classmethod
+    def timeout(cls, seconds: float, **kwargs) -> 'SearchLimits':
+        """Limites com prazo de `seconds` a partir de agora."""
+        return cls(deadline=time.perf_counter() + seconds, **kwargs)
+
+    def next_check(self, expansions: int) -> int:
+        """Número de expansões em que a próxima verificação acontece."""
+        at = expansions + max(1, self.check_every)
+        if self.max_expansions is not None:
+            at = min(at, max(self.max_expansions, expansions + 1))
+        return at
+
+    def check(self, expansions: int) -> Optional[str]:
+        """Motivo para parar agora, ou None para seguir."""
+        if self.max_expansions is not None and expansions >= self.max_expansions:
+            return STOP_MAX_EXPANSIONS
+        if self.cancel is not None and self.cancel.is_set():
+            return STOP_CANCELLED
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            return STOP_TIMEOUT
+        return None
+
+    @staticmethod
+    def stopped(t0: float, reason: str, nodes_visited: int, **metrics) -> SearchResult:
+        """Resultado parcial de uma busca interrompida: sem caminho, com as métricas até ali."""
+        return SearchResult(
+            found=False,
+            path=[],
+            depth=None,
+            nodes_visited=nodes_visited,
+            time=time.perf_counter() - t0,
+            stop_reason=reason,
+            **metrics
+        )
+
+
+@dataclass(frozen=True)
+class SearchBudget:
+    """
+    Orçamento relativo (segundos e expansões) que vira SearchLimits no início de cada busca.
+
+    Ao contrário de SearchLimits, não guarda instante absoluto: pode ser
+    repassado a processos do pool e reaproveitado por várias buscas.
+    """
+    timeout: Optional[float] = None
+    max_expansions: Optional[int] = None
+
+    def start(self, cancel: Optional[object] = None) -> SearchLimits:
+        """Limites de uma busca que começa agora."""
+        deadline = time.perf_counter() + self.timeout if self.timeout is not None else None
+        return SearchLimits(deadline=deadline, max_expansions=self.max_expansions, cancel=cancel)
+
+
+def first_check(limits: Optional[SearchLimits]) -> int:
+    """Primeira verificação de `limits` (ou NO_CHECK sem limites), para o laço das buscas."""
+    return limits.next_check(0) if limits is not None else NO_CHECK
+
+
+def stop_before_start(limits: Optional[SearchLimits]) -> Optional[str]:
+    """Motivo para a busca parar antes da primeira expansão, ou None (sempre None sem limites)."""
+    return limits.check(0) if limits is not None else None
@@ -0,0 +1,149 @@
+# mazefile.py
+# Formato binário de labirinto (.maze), aberto via mmap sem ler o arquivo inteiro.
+#
+# Layout (little-endian):
+#   0  4s  magic b'MAZE'
+#   4  B   versão (1)
+#   5  B   empacotamento: 0 = 1 byte por célula, 1 = 1 bit por célula
+#   6  2x  reservado
+#   8  I   linhas
+#  12  I   colunas
+#  16  4i  início (linha, coluna) e objetivo (linha, coluna); -1 = ausente
+#  32      paredes em ordem linha a linha (1 = parede)
+from __future__ import annotations
+import mmap
+import struct
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from utils.grid import Grid, MazeLike, as_grid
+
+Position = Tuple[int, int]
+
+MAGIC = b'MAZE'
+VERSION = 1
+PACK_BYTES = 0
+PACK_BITS = 1
+
+_HEADER = struct.Struct('<4sBBxxIIiiii')
+HEADER_SIZE = _HEADER.size  # 32 bytes
+
+_ACCESS = {'r': mmap.ACCESS_READ, 'c': mmap.ACCESS_COPY, 'r+': mmap.ACCESS_WRITE}
+
+# Tabelas para (des)empacotar bits com bytes.translate, sem laço em Python.
+_TO_ASCII = bytes(0x31 if b else 0x30 for b in range(256))          # 0/1 -> '0'/'1'
+_FROM_ASCII = bytes(1 if b == 0x31 else 0 for b in range(256))      # '0'/'1' -> 0/1
+
+
+@dataclass
+class MazeHeader:
+    """Cabeçalho de um arquivo .maze."""
+    rows: int
+    cols: int
+    start: Optional[Position]
+    goal: Optional[Position]
+    packing: int = PACK_BYTES
+
+    @property
+    def payload_size(self) -> int:
+        cells = self.rows * self.cols
+        return cells if self.packing == PACK_BYTES else (cells + 7) // 8
+
+
+def _pos_fields(pos: Optional[Position]) -> Tuple[int, int]:
+    return (-1, -1) if pos is None else (pos[0], pos[1])
+
+
+def _pos_from_fields(r: int, c: int) -> Optional[Position]:
+    return None if r < 0 else (r, c)
+
+
+def pack_bits(cells) -> bytes:
+    """Empacota células 0/1 em bits (MSB primeiro, última fração completada com zeros)."""
+    n = len(cells)
+    if n == 0:
+        return b''
+    digits = bytes(cells).translate(_TO_ASCII)
+    nbytes = (n + 7) // 8
+    return int(digits + b'0' * (nbytes * 8 - n), 2).to_bytes(nbytes, 'big')
+
+
+def unpack_bits(payload, count: int) -> bytearray:
+    """Inverso de pack_bits: devolve count células 0/1."""
+    if count == 0:
+        return bytearray()
+    nbytes = (count + 7) // 8
+    value = int.from_bytes(payload[:nbytes], 'big')
+    digits = format(value, f'0{nbytes * 8}b').encode('ascii')
+    return bytearray(digits[:count].translate(_FROM_ASCII))
+
+
+def read_header(data) -> MazeHeader:
+    """Lê e valida o cabeçalho a partir de um buffer (bytes ou mmap)."""
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Arquivo de labirinto truncado (cabeçalho incompleto).")
+    magic, version, packing, rows, cols, sr, sc, gr, gc = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Arquivo não está no formato .maze.")
+    if version != VERSION:
+        raise ValueError(f"Versão {version} do formato .maze não suportada.")
+    if packing not in (PACK_BYTES, PACK_BITS):
+        raise ValueError(f"Empacotamento desconhecido: {packing}.")
+    header = MazeHeader(rows, cols, _pos_from_fields(sr, sc), _pos_from_fields(gr, gc), packing)
+    if len(data) < HEADER_SIZE + header.payload_size:
+        raise ValueError("Arquivo de labirinto truncado (paredes incompletas).")
+    return header
+
+
+def save_maze(path: str, maze: MazeLike, packed: bool = False):
+    """
+    Grava um labirinto (lista de listas ou Grid) no formato .maze.
+
+    Args:
+        path: arquivo de destino
+        maze: labirinto; início/objetivo vêm dos símbolos 'S'/'G' ou do Grid
+        packed: grava 1 bit por célula (8x menor, mas a leitura precisa desempacotar)
+    """
+    grid = as_grid(maze)
+    packing = PACK_BITS if packed else PACK_BYTES
+    header = _HEADER.pack(MAGIC, VERSION, packing, grid.rows, grid.cols,
+                          *_pos_fields(grid.start), *_pos_fields(grid.goal))
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(pack_bits(grid.cells) if packed else grid.cells)
+
+
+def load_maze(path: str, mode: str = 'r') -> Grid:
+    """
+    Abre um arquivo .maze como Grid.
+
+    Com 1 byte por célula o Grid usa o próprio mmap como buffer: nada é lido
+    até a busca tocar as páginas, então abrir um labirinto de 100M células é
+    instantâneo. Arquivos com bits empacotados são desempacotados em memória.
+
+    Args:
+        path: arquivo .maze
+        mode: como no numpy.memmap: 'r' somente leitura, 'c' cópia na escrita
+            (edições não vão para o disco), 'r+' edições gravadas no arquivo
+
+    Returns:
+        Grid com start e goal do cabeçalho
+    """
+    if mode not in _ACCESS:
+        raise ValueError(f"Modo inválido: {mode!r} (use 'r', 'c' ou 'r+').")
+    with open(path, 'r+b' if mode == 'r+' else 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=_ACCESS[mode])
+    header = read_header(data)
+    count = header.rows * header.cols
+
+    if header.packing == PACK_BITS:
+        if mode == 'r+':
+            data.close()
+            raise ValueError("Arquivos com bits empacotados não podem ser abertos em modo 'r+'.")
+        cells = unpack_bits(memoryview(data)[HEADER_SIZE:], count)
+        data.close()
+        return Grid(header.rows, header.cols, cells, header.start, header.goal)
+
+    # O memoryview mantém o mmap vivo enquanto o Grid existir.
+    payload = memoryview(data)[HEADER_SIZE:HEADER_SIZE + count]
+    return Grid.from_buffer(payload, header.rows, header.cols, header.start, header.goal)
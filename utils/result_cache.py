@@ -0,0 +1,150 @@
+# result_cache.py
+# Cache de resultados de busca por impressão digital do labirinto + consulta (LRU em memória e disco opcional).
+from __future__ import annotations
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from utils.grid import Grid, MazeLike, as_grid
+
+Position = Tuple[int, int]
+
+CACHE_VERSION = 3  # Mude quando o formato dos valores guardados mudar (invalida o disco)
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def grid_fingerprint(maze: MazeLike) -> str:
+    """
+    Hash blake2b (128 bits) das dimensões e das paredes do labirinto.
+
+    Início e objetivo ficam de fora: fazem parte da consulta. O hash de um
+    Grid fica em cache até a próxima edição, então consultas repetidas no
+    mesmo labirinto não releem o buffer.
+    """
+    def build(grid: Grid) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{grid.rows}x{grid.cols}:".encode('ascii'))
+        digest.update(grid.cells)
+        return digest.hexdigest()
+
+    return as_grid(maze).cached(('fingerprint',), build)
+
+
+def query_key(fingerprint: str, start: Position, goal: Position, algorithm: str,
+              heuristic: str = '-', allow_diagonal: bool = False) -> Tuple:
+    """Chave de uma consulta: labirinto (impressão digital) + parâmetros da busca."""
+    return (CACHE_VERSION, fingerprint, tuple(start), tuple(goal), algorithm, heuristic, bool(allow_diagonal))
+
+
+class ResultCache:
+    """
+    Memoização de resultados de busca com despejo LRU e camada opcional em disco.
+
+    A camada em memória guarda até max_entries valores (OrderedDict, o usado
+    há mais tempo sai primeiro). Com `directory`, cada valor também é gravado
+    em um arquivo pickle nomeado pelo hash da chave, de modo que execuções
+    seguintes sobre o mesmo corpus são servidas do disco; um acerto no disco
+    volta para a memória.
+
+    hits conta acertos (memória ou disco), disk_hits só os do disco e misses
+    as consultas que precisaram ser calculadas.
+
+    Exemplo:
+        cache = ResultCache(directory='results/cache')
+        key = query_key(grid_fingerprint(grid), inicio, objetivo, 'A*', 'manhattan')
+        result = cache.get_or_compute(key, lambda: astar(grid, inicio, objetivo, manhattan))
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, directory: Optional[str] = None):
+        if max_entries < 1:
+            raise ValueError(f"max_entries deve ser pelo menos 1 (recebido {max_entries}).")
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: Hashable) -> str:
+        name = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name + '.pkl')
+
+    def _remember(self, key: Hashable, value: Any):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: Hashable) -> Tuple[bool, Any]:
+        """(encontrado, valor) da camada em disco; arquivo ilegível conta como ausente."""
+        if self.directory is None:
+            return False, None
+        try:
+            with open(self._path(key), 'rb') as f:
+                stored_key, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+            return False, None
+        return stored_key == key, value
+
+    def _store(self, key: Hashable, value: Any):
+        """Grava no disco em um arquivo temporário renomeado no fim (seguro entre processos)."""
+        if self.directory is None:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """(encontrado, valor); atualiza os contadores de acerto e falta."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key]
+        found, value = self._load(key)
+        if found:
+            self._remember(key, value)
+            self.hits += 1
+            self.disk_hits += 1
+            return True, value
+        self.misses += 1
+        return False, None
+
+    def put(self, key: Hashable, value: Any):
+        self._remember(key, value)
+        self._store(key, value)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Valor em cache para key, ou compute() (guardado em seguida)."""
+        found, value = self.lookup(key)
+        if not found:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Esvazia a memória (os arquivos em disco ficam) e zera os contadores."""
+        self._entries.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def summary(self) -> str:
+        """Linha com os contadores, para a saída dos experimentos e a GUI."""
+        total = self.hits + self.misses
+        rate = 100 * self.hits / total if total else 0.0
+        text = f"{self.hits} acertos, {self.misses} faltas ({rate:.0f}% de acerto)"
+        if self.directory is not None:
+            text += f"; {self.disk_hits} acertos vindos do disco"
+        return text
@@ -1,17 +1,98 @@
 # search.py
 # Utilitários compartilhados por todos os algoritmos de busca.
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List, Tuple, Set, Union, Optional
+import sys
+from array import array
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Set, Union, Optional
+
+from utils.grid import Grid, MazeLike, WALL
 
 Position = Tuple[int, int]
 Cell = Union[str, int]
 
+class PathView(Sequence):
+    """
+    Caminho guardado como array('i') de ids de células (4 bytes por passo).
+
+    Comporta-se como uma lista de posições (len, índice, fatias, iteração,
+    comparação com listas), mas só cria as tuplas (linha, coluna) quando
+    elas são acessadas.
+    """
+    __slots__ = ('ids', 'cols')
+
+    def __init__(self, ids: array, cols: int):
+        self.ids = ids
+        self.cols = cols
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[Position], cols: int) -> 'PathView':
+        return cls(array('i', [r * cols + c for r, c in positions]), cols)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PathView(self.ids[index], self.cols)
+        return divmod(self.ids[index], self.cols)
+
+    def __iter__(self) -> Iterator[Position]:
+        cols = self.cols
+        return (divmod(cell, cols) for cell in self.ids)
+
+    def __contains__(self, pos) -> bool:
+        try:
+            r, c = pos
+        except (TypeError, ValueError):
+            return False
+        return 0 <= c < self.cols and r * self.cols + c in self.ids
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PathView):
+            return self.cols == other.cols and self.ids == other.ids
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self) and all(a == tuple(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PathView({self.to_list()!r})"
+
+    def to_list(self) -> List[Position]:
+        """Materializa o caminho como lista de tuplas."""
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.ids) * self.ids.itemsize
+
+
+@dataclass
+class SearchStats:
+    """
+    Contadores do laço de busca, iguais para todos os algoritmos.
+
+    pushes/pops contam inserções e remoções na fronteira (heap, fila ou
+    pilha); stale_pops, as remoções descartadas por g desatualizado;
+    reopened, os nós já expandidos (fechados) cujo g melhorou e voltaram à
+    fronteira. Esses saem de graça do laço. neighbor_checks (vizinhos examinados nas
+    expansões) e os campos de heurística custam algo a cada nó, então só
+    são medidos com um observador (ver utils/instrument.py); sem ele, None.
+    """
+    pushes: int = 0
+    pops: int = 0
+    stale_pops: int = 0
+    reopened: int = 0
+    neighbor_checks: Optional[int] = None
+    heuristic_calls: Optional[int] = None
+    heuristic_time: Optional[float] = None  # Segundos dentro da função heurística
+
+
 @dataclass
 class SearchResult:
     """Resultado padronizado de um algoritmo de busca."""
     found: bool  # Solução encontrada?
-    path: List[Position]  # Caminho da origem ao objetivo
+    path: Sequence[Position]  # Caminho da origem ao objetivo (PathView ou lista)
     depth: int | None  # Profundidade (número de movimentos)
     nodes_visited: int  # Nós expandidos
     time: float  # Tempo de execução
@@ -19,16 +100,39 @@ class SearchResult:
     nodes_generated: Optional[int] = None  # Total de nós gerados
     max_frontier_size: Optional[int] = None  # Tamanho máximo da fronteira
     path_cost: Optional[float] = None # Custo total do caminho
+    memory_bytes: Optional[int] = None  # Memória aproximada das estruturas de busca
+    stop_reason: Optional[str] = None  # Limite que interrompeu a busca (ver utils.limits); None = terminou
+    stats: Optional[SearchStats] = None  # Contadores do laço (ver SearchStats)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Campos em tipos JSON; o caminho vira lista de [linha, coluna]."""
+        return {
+            'found': self.found,
+            'path': [[r, c] for r, c in self.path],
+            'depth': self.depth,
+            'nodes_visited': self.nodes_visited,
+            'time': self.time,
+            'nodes_generated': self.nodes_generated,
+            'max_frontier_size': self.max_frontier_size,
+            'path_cost': self.path_cost,
+            'memory_bytes': self.memory_bytes,
+            'stop_reason': self.stop_reason,
+            'stats': asdict(self.stats) if self.stats is not None else None,
+        }
 
 
-def get_neighbors(pos: Position, maze: List[List[Cell]]) -> List[Position]:
+def get_neighbors(pos: Position, maze: MazeLike) -> List[Position]:
     """
     Retorna os vizinhos (cima, baixo, esquerda, direita) que:
     - Estão dentro dos limites da matriz
     - Não são obstáculos (valor 1)
     """
-    rows = len(maze)
-    cols = len(maze[0])
+    if isinstance(maze, Grid):
+        rows, cols, cells = maze.rows, maze.cols, maze.cells
+    else:
+        rows = len(maze)
+        cols = len(maze[0])
+        cells = None
     r, c = pos
 
     # Possíveis vizinhos: cima, baixo, esquerda, direita
@@ -43,10 +147,10 @@ def get_neighbors(pos: Position, maze: List[List[Cell]]) -> List[Position]:
     for nr, nc in candidates:
         # Verifica limites e se não é parede (1)
         if 0 <= nr < rows and 0 <= nc < cols:
-            if maze[nr][nc] != 1: 
-                neighbors.append((nr, nc))
-        if 0 <= nr < rows and 0 <= nc < cols:
-            if maze[nr][nc] != 1: 
+            if cells is not None:
+                if cells[nr * cols + nc] != WALL:
+                    neighbors.append((nr, nc))
+            elif maze[nr][nc] != 1:
                 neighbors.append((nr, nc))
 
     return neighbors
@@ -68,3 +172,28 @@ def reconstruct_path(
     path.append(start)
     path.reverse()
     return path
+
+
+def path_from_parents(parent, start: int, goal: int, cols: int) -> PathView:
+    """Reconstrói o caminho a partir de um array (ou dicionário) de pais indexado por id de célula."""
+    cells = array('i', [goal])
+    current = goal
+    while current != start:
+        current = parent[current]
+        cells.append(current)
+    cells.reverse()
+    return PathView(cells, cols)
+
+
+def frontier_nbytes(size: int, entry) -> int:
+    """
+    Estimativa dos bytes de uma fronteira com `size` entradas parecidas com `entry`:
+    o ponteiro na lista, o objeto e, se for tupla, seus itens.
+    """
+    items = entry if isinstance(entry, tuple) else ()
+    return size * (8 + sys.getsizeof(entry) + sum(sys.getsizeof(item) for item in items))
+
+
+def structures_nbytes(*structures) -> int:
+    """Bytes ocupados pelos contêineres (dict, set, array, bytearray...), sem contar as chaves."""
+    return sum(sys.getsizeof(structure) for structure in structures)
@@ -0,0 +1,55 @@
+# shared_grids.py
+# Labirintos em memória compartilhada para pools de processos (sem pickle do grid por tarefa).
+from __future__ import annotations
+from multiprocessing import shared_memory
+from typing import Dict, Hashable, List, Mapping, Optional, Tuple
+
+from utils.grid import Grid, MazeLike, as_grid
+
+Position = Tuple[int, int]
+GridSpec = Tuple[str, int, int, Tuple[Optional[Position], Optional[Position]]]
+
+# Estado de cada processo do pool, preenchido por attach_grids().
+_WORKER_GRIDS: Dict[Hashable, Grid] = {}
+_WORKER_SHM: List[shared_memory.SharedMemory] = []
+
+
+def share_grids(mazes: Mapping[Hashable, MazeLike]) -> Tuple[List[shared_memory.SharedMemory], Dict[Hashable, GridSpec]]:
+    """
+    Copia cada labirinto para um bloco de memória compartilhada.
+
+    Returns:
+        (blocos, specs): os blocos devem ser liberados com release_grids() no
+        fim; specs vai para attach_grids() como initargs do pool
+    """
+    blocks, specs = [], {}
+    for key, maze in mazes.items():
+        grid = as_grid(maze)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, grid.rows * grid.cols))
+        shm.buf[:grid.rows * grid.cols] = grid.cells
+        blocks.append(shm)
+        # start/goal do Grid ou dos símbolos 'S'/'G' da lista (as_grid já os extraiu)
+        specs[key] = (shm.name, grid.rows, grid.cols, (grid.start, grid.goal))
+    return blocks, specs
+
+
+def attach_grids(specs: Mapping[Hashable, GridSpec]):
+    """Inicializador do pool: anexa os blocos compartilhados e monta os Grids."""
+    for key, (name, rows, cols, (start, goal)) in specs.items():
+        # Os workers usam o mesmo resource_tracker do processo principal, que
+        # remove o bloco no unlink; anexar aqui não cria um segundo registro.
+        shm = shared_memory.SharedMemory(name=name)
+        _WORKER_SHM.append(shm)
+        _WORKER_GRIDS[key] = Grid.from_buffer(shm.buf[:rows * cols], rows, cols, start, goal)
+
+
+def worker_grid(key: Hashable) -> Grid:
+    """Grid anexado por attach_grids() neste processo."""
+    return _WORKER_GRIDS[key]
+
+
+def release_grids(blocks: List[shared_memory.SharedMemory]):
+    """Fecha e remove os blocos criados por share_grids()."""
+    for shm in blocks:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,207 @@
+# trace.py
+# Rastro da exploração: eventos (tipo, célula) emitidos pelas buscas, sob demanda e sem guardar tudo.
+#
+# As buscas aceitam trace=callback; com trace=None (o padrão) nada é emitido.
+# Cada evento é o par (tipo, id da célula), com id = linha * cols + coluna:
+#   EXPAND   - nó retirado da fronteira e expandido
+#   GENERATE - nó inserido na fronteira (inclusive o início)
+from __future__ import annotations
+import queue
+import struct
+import sys
+import threading
+from array import array
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from utils.search import SearchResult
+
+EXPAND = 0
+GENERATE = 1
+EVENT_NAMES = ('expand', 'generate')
+
+TraceEvent = Tuple[int, int]
+TraceCallback = Callable[[int, int], None]
+
+# Arquivo de rastro: cabeçalho de 16 bytes e um uint32 por evento (id << 1 | tipo).
+TRACE_MAGIC = b'MTRC'
+TRACE_VERSION = 1
+_HEADER = struct.Struct('<4sBxxxII')
+
+
+class TraceCancelled(Exception):
+    """Levantada dentro da busca quando o consumidor do TraceStream desiste."""
+
+
+class TraceStream:
+    """
+    Eventos de uma busca consumidos como gerador, enquanto ela ainda roda.
+
+    A busca roda em uma thread à parte e entrega os eventos em blocos por
+    uma fila limitada: se o consumidor (ex.: a animação da GUI) for mais
+    lento, a busca espera, então a memória fica em O(maxsize * chunk) e não
+    em O(nós visitados). close() interrompe a busca, e abandonar a iteração
+    no meio (break, exceção) também a interrompe. O fluxo só pode ser
+    percorrido uma vez. Por isso result.time
+    inclui as esperas pelo consumidor; para medir, rode a busca sem trace.
+
+    Exemplo:
+        stream = TraceStream(lambda trace: astar(grid, s, g, manhattan, trace=trace))
+        for kind, cell in stream:
+            ...
+        result = stream.result
+    """
+
+    _DONE = object()
+
+    def __init__(self, run: Callable[[TraceCallback], SearchResult], maxsize: int = 16, chunk: int = 256):
+        self._run = run
+        self._queue: 'queue.Queue' = queue.Queue(maxsize)
+        self._chunk = chunk
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.result: Optional[SearchResult] = None
+        self.error: Optional[BaseException] = None
+
+    def _put(self, item):
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                continue
+        raise TraceCancelled()
+
+    def _produce(self):
+        buffer: List[TraceEvent] = []
+        chunk = self._chunk
+
+        def emit(kind: int, cell: int):
+            buffer.append((kind, cell))
+            if len(buffer) >= chunk:
+                self._put(buffer[:])
+                buffer.clear()
+
+        try:
+            self.result = self._run(emit)
+            if buffer:
+                self._put(buffer[:])
+        except TraceCancelled:
+            return
+        except BaseException as e:  # Repassada ao consumidor no fim da iteração
+            self.error = e
+        try:
+            self._put(self._DONE)
+        except TraceCancelled:
+            pass
+
+    def __iter__(self) -> Iterator[TraceEvent]:
+        if self._thread is not None:
+            raise RuntimeError("Um TraceStream só pode ser percorrido uma vez.")
+        if self._cancelled.is_set():  # close() antes da iteração: a busca nem começa
+            return
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+        finished = False
+        try:
+            while not self._cancelled.is_set():
+                try:
+                    item = self._queue.get(timeout=0.05)
+                except queue.Empty:
+                    continue  # Sem _DONE após close(): o laço sai pelo sinal de cancelamento
+                if item is self._DONE:
+                    break
+                yield from item
+            finished = True
+        finally:
+            if not finished:  # break, exceção no corpo do for ou gerador descartado
+                self.close()
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        """Interrompe a busca (se ainda roda) e descarta os eventos pendentes."""
+        self._cancelled.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class TraceWriter:
+    """
+    Grava eventos em arquivo à medida que chegam, 4 bytes por evento.
+
+    Pode ser passado direto como trace= de uma busca (é chamável) ou
+    alimentado com write_trace() a partir de um TraceStream.
+    """
+
+    def __init__(self, path: str, rows: int, cols: int, buffer_events: int = 65536):
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.count = 0
+        self._buffer_events = buffer_events
+        self._buffer = array('I')
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, rows, cols))
+
+    def __call__(self, kind: int, cell: int):
+        self._buffer.append(cell << 1 | kind)
+        if len(self._buffer) >= self._buffer_events:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            if sys.byteorder != 'little':
+                self._buffer.byteswap()
+            self._file.write(self._buffer.tobytes())
+            self.count += len(self._buffer)
+            self._buffer = array('I')
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_trace(events: Iterable[TraceEvent], path: str, rows: int, cols: int) -> int:
+    """Grava um fluxo de eventos (ex.: um TraceStream) em arquivo; devolve quantos foram gravados."""
+    with TraceWriter(path, rows, cols) as writer:
+        for kind, cell in events:
+            writer(kind, cell)
+    return writer.count
+
+
+class TraceReader:
+    """Lê um arquivo de rastro bloco a bloco: rows, cols e os eventos (tipo, id)."""
+
+    def __init__(self, path: str, chunk_events: int = 65536):
+        self.path = path
+        self._chunk_events = chunk_events
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Arquivo de rastro truncado (cabeçalho incompleto).")
+        magic, version, self.rows, self.cols = _HEADER.unpack(header)
+        if magic != TRACE_MAGIC:
+            raise ValueError("Arquivo não é um rastro de busca.")
+        if version != TRACE_VERSION:
+            raise ValueError(f"Versão {version} do rastro não suportada.")
+
+    def __iter__(self) -> Iterator[TraceEvent]:
+        with open(self.path, 'rb') as f:
+            f.seek(_HEADER.size)
+            while True:
+                data = f.read(self._chunk_events * 4)
+                if not data:
+                    break
+                values = array('I')
+                values.frombytes(data[:len(data) // 4 * 4])
+                if sys.byteorder != 'little':
+                    values.byteswap()
+                for value in values:
+                    yield value & 1, value >> 1
@@ -0,0 +1,85 @@
+# workspace.py
+# Buffers de rascunho reaproveitados entre buscas no mesmo labirinto.
+from __future__ import annotations
+import threading
+from array import array
+from typing import Optional
+
+from utils.grid import Grid
+
+_MAX_EPOCH = 2**32 - 1  # Limite do typecode 'I'
+
+
+class SearchWorkspace:
+    """
+    Arrays indexados por id de célula, alocados uma vez e reaproveitados.
+
+    Em vez de zerar os arrays a cada busca, cada busca recebe uma "época"
+    nova (begin()); uma célula conta como vista quando seen[id] == época.
+    parent e g só valem para células vistas na época atual; closed[id] ==
+    época marca as células já expandidas. g e closed são alocados no
+    primeiro uso, já que BFS e DFS não precisam deles.
+    """
+    __slots__ = ('size', 'seen', 'parent', 'epoch', '_g', '_closed')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.seen = array('I', [0]) * size
+        self.parent = array('i', [-1]) * size
+        self.epoch = 0
+        self._g: Optional[array] = None
+        self._closed: Optional[array] = None
+
+    @property
+    def g(self) -> array:
+        if self._g is None:
+            self._g = array('d', [0.0]) * self.size
+        return self._g
+
+    @property
+    def closed(self) -> array:
+        if self._closed is None:
+            self._closed = array('I', [0]) * self.size
+        return self._closed
+
+    @classmethod
+    def for_grid(cls, grid: Grid, workspace: Optional['SearchWorkspace'] = None) -> 'SearchWorkspace':
+        """
+        Valida o workspace recebido para o grid ou devolve o padrão do grid.
+
+        O padrão fica no cache do grid, um por thread, e é reaproveitado
+        pelas buscas seguintes sem realocar seen/parent. Uma busca aninhada
+        na mesma thread e no mesmo grid (dentro de um trace, por exemplo)
+        precisa passar seu próprio workspace.
+        """
+        size = grid.rows * grid.cols
+        if workspace is None:
+            per_thread = grid.cached(('workspace',), lambda g: threading.local())
+            workspace = getattr(per_thread, 'workspace', None)
+            if workspace is None:
+                workspace = per_thread.workspace = cls(size)
+            return workspace
+        if workspace.size != size:
+            raise ValueError(f"Workspace de {workspace.size} células não serve para grid {grid.rows}x{grid.cols}.")
+        return workspace
+
+    def begin(self) -> int:
+        """Inicia uma nova busca e devolve sua época."""
+        self.epoch += 1
+        if self.epoch > _MAX_EPOCH:
+            self.seen = array('I', [0]) * self.size
+            if self._closed is not None:
+                self._closed = array('I', [0]) * self.size
+            self.epoch = 1
+        return self.epoch
+
+    @property
+    def visit_nbytes(self) -> int:
+        """Memória de seen e parent, os arrays que toda busca usa."""
+        return len(self.seen) * self.seen.itemsize + len(self.parent) * self.parent.itemsize
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays do workspace."""
+        arrays = (self.seen, self.parent, self._g, self._closed)
+        return sum(len(a) * a.itemsize for a in arrays if a is not None)